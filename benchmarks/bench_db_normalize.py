@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the domain/keyword dictionary schema against the text-column one.
+
+Builds a schema v2 database (domain and keyword strings on every row, a
+comma-joined keyword blob per run) from daily runs over a fixed keyword
+set. It then copies the file and opens the copy with CompetitorDatabase,
+which migrates it in place. Both files are vacuumed before their sizes
+are compared. get_domain_history latency is measured against the v2 query
+and against the current method.
+
+Usage:
+    python benchmarks/bench_db_normalize.py --runs 100 --competitors 300
+"""
+import argparse
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.db import CompetitorDatabase
+
+LEGACY_HISTORY_SQL = '''
+    SELECT ar.created_at, ar.keywords, cr.count, cr.weighted_score, cr.rank_position
+    FROM competitor_results cr
+    JOIN analysis_runs ar ON cr.run_id = ar.id
+    WHERE cr.domain = ?
+    ORDER BY ar.created_at DESC
+    LIMIT ?
+'''
+
+
+def build_legacy_database(path: Path, n_runs: int, n_competitors: int, n_keywords: int, per_competitor: int):
+    """Schema v2 database of n_runs daily runs over the same keyword set."""
+    rng = random.Random(n_runs)
+    keywords = [f"long tail keyword number {k}" for k in range(n_keywords)]
+    domains = [f"www.competitor-site-{d}.com" for d in range(n_competitors * 2)]
+
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    CompetitorDatabase._migrate_to_v1(cursor)
+    CompetitorDatabase._migrate_to_v2(cursor)
+
+    competitor_id = 0
+    for run_id in range(1, n_runs + 1):
+        cursor.execute('''
+            INSERT INTO analysis_runs (id, keywords, engine, num_results, created_at, total_competitors)
+            VALUES (?, ?, 'google', 20, datetime('2026-01-01', ?), ?)
+        ''', (run_id, ','.join(keywords), f'+{run_id} days', n_competitors))
+
+        competitors, appearances = [], []
+        for rank, domain in enumerate(rng.sample(domains, n_competitors), 1):
+            competitor_id += 1
+            competitors.append((competitor_id, run_id, domain, per_competitor, float(n_competitors - rank), rank))
+            appearances.extend(
+                (competitor_id, keyword, rng.randint(1, 20)) for keyword in rng.sample(keywords, per_competitor)
+            )
+
+        cursor.executemany('''
+            INSERT INTO competitor_results (id, run_id, domain, count, weighted_score, rank_position)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', competitors)
+        cursor.executemany('''
+            INSERT INTO keyword_appearances (competitor_id, keyword, serp_rank) VALUES (?, ?, ?)
+        ''', appearances)
+
+    cursor.execute('PRAGMA user_version = 2')
+    conn.commit()
+    conn.close()
+    return domains
+
+
+def vacuumed_size_mb(path: Path) -> float:
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conn.execute('VACUUM')
+    conn.close()
+    return path.stat().st_size / (1024 * 1024)
+
+
+def mean_ms(func, domains) -> float:
+    start = time.perf_counter()
+    for domain in domains:
+        func(domain)
+    return (time.perf_counter() - start) * 1000 / len(domains)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=100, help="Daily analysis runs")
+    parser.add_argument("--competitors", type=int, default=300, help="Competitors stored per run")
+    parser.add_argument("--keywords", type=int, default=50, help="Keywords per run")
+    parser.add_argument("--per-competitor", type=int, default=10, help="Keyword appearances per competitor")
+    parser.add_argument("--queries", type=int, default=50, help="get_domain_history calls timed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "v2.db"
+        normalized_path = Path(tmp) / "v3.db"
+
+        domains = build_legacy_database(legacy_path, args.runs, args.competitors, args.keywords, args.per_competitor)
+        shutil.copy(legacy_path, normalized_path)
+
+        start = time.perf_counter()
+        CompetitorDatabase(str(normalized_path)).close()
+        migrate_s = time.perf_counter() - start
+
+        legacy_mb = vacuumed_size_mb(legacy_path)
+        normalized_mb = vacuumed_size_mb(normalized_path)
+
+        probe = random.Random(0).sample(domains, min(args.queries, len(domains)))
+
+        legacy = sqlite3.connect(legacy_path)
+        legacy_ms = mean_ms(lambda domain: legacy.execute(LEGACY_HISTORY_SQL, (domain, 10)).fetchall(), probe)
+        legacy.close()
+
+        with CompetitorDatabase(str(normalized_path)) as db:
+            normalized_ms = mean_ms(lambda domain: db.get_domain_history(domain, limit=10), probe)
+
+    print(f"{'schema':>12} {'size MB':>9} {'history ms':>11}")
+    print(f"{'v2 text':>12} {legacy_mb:>9.2f} {legacy_ms:>11.2f}")
+    print(f"{'dictionary':>12} {normalized_mb:>9.2f} {normalized_ms:>11.2f}")
+    print(f"size {legacy_mb / normalized_mb:.1f}x smaller, history {legacy_ms / normalized_ms:.1f}x faster, "
+          f"migration {migrate_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark get_competitors_by_run: GROUP_CONCAT string parsing vs JSON objects.
+
+The legacy path replays the previous query (one GROUP_CONCAT of
+"keyword:rank" per competitor, split on ',' and ':' in Python). The JSON
+path is get_competitors_by_run, which reads one json_group_object per
+competitor in id order. The streaming row reads iter_competitors_by_run
+and keeps nothing. Timings are taken untraced; peak memory comes from a
+second, tracemalloc-traced call.
+
+Usage:
+    python benchmarks/bench_db_read.py --competitors 10000,100000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.parser import CompetitorResult
+from src.db import CompetitorDatabase
+
+
+def legacy_get_competitors(db: CompetitorDatabase, run_id: int):
+    """The previous GROUP_CONCAT query and split loop."""
+    with db._connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT cr.id, d.name, cr.count, cr.weighted_score, cr.rank_position,
+                   GROUP_CONCAT(k.text || ':' || ka.serp_rank) as keyword_ranks
+            FROM competitor_results cr
+            JOIN domains d ON d.id = cr.domain_id
+            LEFT JOIN keyword_appearances ka ON cr.id = ka.competitor_id
+            LEFT JOIN keywords k ON k.id = ka.keyword_id
+            WHERE cr.run_id = ?
+            GROUP BY cr.id, d.name, cr.count, cr.weighted_score, cr.rank_position
+            ORDER BY cr.rank_position
+        ''', (run_id,))
+
+        competitors = []
+        for row in cursor.fetchall():
+            competitor = {'id': row[0], 'domain': row[1], 'count': row[2], 'weighted_score': row[3],
+                          'rank_position': row[4], 'keyword_appearances': {}}
+            if row[5]:
+                for kw_rank in row[5].split(','):
+                    if ':' in kw_rank:
+                        keyword, rank = kw_rank.split(':', 1)
+                        competitor['keyword_appearances'][keyword] = int(rank)
+            competitors.append(competitor)
+        return competitors
+
+
+def json_get_competitors(db: CompetitorDatabase, run_id: int):
+    return db.get_competitors_by_run(run_id)
+
+
+def stream_competitors(db: CompetitorDatabase, run_id: int):
+    count = 0
+    for _ in db.iter_competitors_by_run(run_id):
+        count += 1
+    return count
+
+
+def measured(func, *args):
+    """(seconds, peak traced MB, result) of one call."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--competitors", default="10000,100000", help="Comma-separated competitor counts")
+    parser.add_argument("--per-competitor", type=int, default=10, help="Keyword appearances per competitor")
+    parser.add_argument("--keywords", type=int, default=500, help="Keywords in the run")
+    args = parser.parse_args()
+
+    print(f"{'competitors':>12} {'path':>13} {'seconds':>8} {'peak MB':>8}")
+
+    for n_competitors in [int(s) for s in args.competitors.split(",")]:
+        rng = random.Random(n_competitors)
+        keywords = [f"keyword {k}" for k in range(args.keywords)]
+        competitors = []
+        for i in range(n_competitors):
+            competitor = CompetitorResult(f"site{i}.com", args.per_competitor, float(n_competitors - i))
+            for keyword in rng.sample(keywords, args.per_competitor):
+                competitor.add_keyword_appearance(keyword, rng.randint(1, 20))
+            competitors.append(competitor)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with CompetitorDatabase(str(Path(tmp) / "bench.db")) as db:
+                run_id = db.save_analysis_run(keywords, competitors)
+                stream_competitors(db, run_id)  # warm the page cache
+
+                legacy_s, legacy_mb, expected = measured(legacy_get_competitors, db, run_id)
+                json_s, json_mb, actual = measured(json_get_competitors, db, run_id)
+                stream_s, stream_mb, streamed = measured(stream_competitors, db, run_id)
+
+                assert actual == expected, "results differ"
+                assert streamed == len(expected)
+
+        for label, seconds, peak in (("group_concat", legacy_s, legacy_mb),
+                                     ("json object", json_s, json_mb),
+                                     ("streaming", stream_s, stream_mb)):
+            print(f"{n_competitors:>12} {label:>13} {seconds:>8.3f} {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark CompetitorDatabase.save_analysis_run: row-by-row vs bulk inserts.
+
+The legacy path replays the previous save loop (one INSERT per competitor,
+a lastrowid read, then one INSERT per keyword appearance). The bulk path is
+save_analysis_run, which pre-assigns competitor ids and feeds batched
+executemany calls inside one transaction. Each run uses a fresh database.
+
+Usage:
+    python benchmarks/bench_db_save.py --appearances 10000,100000,1000000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.parser import CompetitorResult
+from src.db import CompetitorDatabase
+
+
+def build_competitors(n_appearances: int, per_competitor: int, n_keywords: int):
+    """Competitors with per_competitor keyword appearances each."""
+    rng = random.Random(n_appearances)
+    keywords = [f"keyword {k}" for k in range(n_keywords)]
+    competitors = []
+
+    for i in range(max(1, n_appearances // per_competitor)):
+        competitor = CompetitorResult(f"site{i}.com", per_competitor, float(per_competitor * 10))
+        for keyword in rng.sample(keywords, per_competitor):
+            competitor.add_keyword_appearance(keyword, rng.randint(1, 20))
+        competitors.append(competitor)
+
+    return keywords, competitors
+
+
+def legacy_save(db: CompetitorDatabase, keywords, competitors) -> int:
+    """The previous save_analysis_run insert loop, one statement per row."""
+    with db._connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO analysis_runs (engine, num_results, total_competitors, top_competitor)
+            VALUES (?, ?, ?, ?)
+        ''', ("google", 20, len(competitors), competitors[0].domain))
+        run_id = cursor.lastrowid
+
+        for position, keyword in enumerate(keywords):
+            cursor.execute('INSERT OR IGNORE INTO keywords (text) VALUES (?)', (keyword,))
+            cursor.execute('''
+                INSERT INTO run_keywords (run_id, position, keyword_id)
+                SELECT ?, ?, id FROM keywords WHERE text = ?
+            ''', (run_id, position, keyword))
+
+        for rank, competitor in enumerate(competitors, 1):
+            cursor.execute('INSERT OR IGNORE INTO domains (name) VALUES (?)', (competitor.domain,))
+            cursor.execute('''
+                INSERT INTO competitor_results (run_id, domain_id, count, weighted_score, rank_position)
+                SELECT ?, id, ?, ?, ? FROM domains WHERE name = ?
+            ''', (run_id, competitor.count, competitor.weighted_score, rank, competitor.domain))
+            competitor_id = cursor.lastrowid
+
+            for keyword, serp_rank in competitor.keyword_appearances.items():
+                cursor.execute('''
+                    INSERT INTO keyword_appearances (competitor_id, keyword_id, serp_rank)
+                    SELECT ?, id, ? FROM keywords WHERE text = ?
+                ''', (competitor_id, serp_rank, keyword))
+
+        conn.commit()
+        return run_id
+
+
+def bulk_save(db: CompetitorDatabase, keywords, competitors) -> int:
+    return db.save_analysis_run(keywords, competitors)
+
+
+def timed_save(save, keywords, competitors) -> float:
+    """Seconds for one save into a fresh database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CompetitorDatabase(str(Path(tmp) / "bench.db"))
+        try:
+            start = time.perf_counter()
+            run_id = save(db, keywords, competitors)
+            elapsed = time.perf_counter() - start
+
+            stored = db.get_competitors_by_run(run_id)
+            assert len(stored) == len(competitors)
+            assert sum(len(c['keyword_appearances']) for c in stored) == \
+                   sum(len(c.keyword_appearances) for c in competitors)
+        finally:
+            db.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--appearances", default="10000,100000,1000000", help="Comma-separated appearance counts")
+    parser.add_argument("--per-competitor", type=int, default=10, help="Keyword appearances per competitor")
+    parser.add_argument("--keywords", type=int, default=500, help="Keywords in the run")
+    args = parser.parse_args()
+
+    print(f"{'appearances':>12} {'competitors':>12} {'legacy rows/s':>14} {'bulk rows/s':>12} {'speedup':>8}")
+
+    for n_appearances in [int(s) for s in args.appearances.split(",")]:
+        keywords, competitors = build_competitors(n_appearances, args.per_competitor, args.keywords)
+        rows = len(competitors) + sum(len(c.keyword_appearances) for c in competitors)
+
+        legacy_s = timed_save(legacy_save, keywords, competitors)
+        bulk_s = timed_save(bulk_save, keywords, competitors)
+
+        print(f"{n_appearances:>12} {len(competitors):>12} {rows / legacy_s:>14,.0f} "
+              f"{rows / bulk_s:>12,.0f} {legacy_s / bulk_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark competitor exclusion checks as the exclusion list grows.
+
+Compares the legacy checks (exact-match set plus a re.match loop over
+uncompiled patterns) with the compiled ExclusionRules trie and
+label-indexed patterns. One rule in every --regex-every is a pattern, the
+rest are domains.
+
+Usage:
+    python benchmarks/bench_exclusions.py --sizes 100,1000,10000,100000
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.exclusions import ExclusionRules
+
+
+def build_rules(size: int, regex_every: int):
+    """Generate excluded domains and patterns totalling size rules."""
+    n_patterns = max(1, size // regex_every)
+    domains = [f"marketplace{i}.com" for i in range(size - n_patterns)]
+    patterns = [rf'.*\.aggregator{i}\..*' for i in range(n_patterns)]
+    return domains, patterns
+
+
+def build_sample(count: int, size: int) -> list:
+    """Mix of excluded and valid domains, mostly valid as in real SERPs."""
+    rng = random.Random(size)
+    sample = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.1:
+            sample.append(f"marketplace{rng.randrange(size)}.com")
+        elif roll < 0.15:
+            sample.append(f"www.aggregator{rng.randrange(size)}.net")
+        else:
+            sample.append(f"brand{rng.randrange(100000)}.com")
+    return sample
+
+
+def legacy_is_excluded(domain: str, domains: set, patterns: list) -> bool:
+    """The original DomainParser.is_valid_competitor exclusion checks."""
+    if domain in domains:
+        return True
+    for pattern in patterns:
+        if re.match(pattern, domain):
+            return True
+    return False
+
+
+def time_per_check(check, sample) -> float:
+    """Microseconds per domain check."""
+    start = time.perf_counter()
+    for domain in sample:
+        check(domain)
+    return (time.perf_counter() - start) / len(sample) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="Comma-separated rule counts")
+    parser.add_argument("--regex-every", type=int, default=100, help="One pattern per this many rules")
+    parser.add_argument("--checks", type=int, default=20000, help="Domains checked per size")
+    parser.add_argument("--legacy-checks", type=int, default=500, help="Domains checked by the legacy loop")
+    args = parser.parse_args()
+
+    print(f"{'rules':>8} {'patterns':>9} {'compile ms':>11} {'trie us/url':>12} {'rules us/url':>13} {'legacy us/url':>14}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        domains, patterns = build_rules(size, args.regex_every)
+        sample = build_sample(args.checks, size)
+
+        start = time.perf_counter()
+        rules = ExclusionRules(domains, patterns)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        trie_us = time_per_check(rules.matches_domain, sample)
+        rules_us = time_per_check(rules.is_excluded, sample)
+
+        domain_set = set(domains)
+        legacy_us = time_per_check(
+            lambda d: legacy_is_excluded(d, domain_set, patterns), sample[:args.legacy_checks]
+        )
+
+        mismatches = sum(
+            rules.is_excluded(d) != legacy_is_excluded(d, domain_set, patterns)
+            for d in sample[:args.legacy_checks]
+        )
+        assert mismatches == 0, f"{mismatches} results differ from the legacy checks"
+
+        print(f"{size:>8} {len(patterns):>9} {compile_ms:>11.1f} {trie_us:>12.2f} {rules_us:>13.2f} {legacy_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs concurrent keyword fetching against a local stub server.
+
+Usage:
+    python benchmarks/bench_fetch.py --keywords 60 --latency 0.3
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from serpapi import GoogleSearch
+
+from src.serp import SerpFetcher, AsyncSerpFetcher
+from stub_serp_server import start_stub_server
+
+
+def run_fetch(base_url: str, keywords, concurrency: int, rate_limit: float, use_api: bool,
+              parse_workers: int = 0) -> float:
+    """Fetch all keywords once and return elapsed wall-clock seconds."""
+    fetcher = SerpFetcher(
+        api_key="stub-key" if use_api else None,
+        requests_per_second=rate_limit,
+        parse_workers=parse_workers
+    )
+    fetcher.google_search_url = f"{base_url}/search"
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = fetcher.fetch_multiple_keywords(keywords, 20, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == len(keywords)
+    assert all(results[k] for k in keywords), "stub server returned empty results"
+    return elapsed
+
+
+def run_async_fetch(base_url: str, keywords, max_in_flight: int, rate_limit: float, use_api: bool,
+                    parse_workers: int = 0) -> float:
+    """Fetch all keywords on one event loop and return elapsed wall-clock seconds."""
+    fetcher = AsyncSerpFetcher(
+        api_key="stub-key" if use_api else None,
+        requests_per_second=rate_limit,
+        parse_workers=parse_workers,
+        max_in_flight=max_in_flight
+    )
+    fetcher.google_search_url = f"{base_url}/search"
+    fetcher.serpapi_search_url = f"{base_url}/search"
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = asyncio.run(fetcher.fetch_multiple_keywords_async(keywords, 20))
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == len(keywords)
+    assert all(results[k] for k in keywords), "stub server returned empty results"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keywords", type=int, default=60, help="Number of keywords")
+    parser.add_argument("--latency", type=float, default=0.3, help="Simulated SERP latency (s)")
+    parser.add_argument("--rate-limit", type=float, default=50.0, help="Requests/sec budget")
+    parser.add_argument("--workers", default="1,4,8,16", help="Comma-separated worker counts")
+    parser.add_argument("--scrape", action="store_true", help="Benchmark the HTML scraping path")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Benchmark AsyncSerpFetcher (workers = max in-flight)")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="Parser processes for scraped HTML (0 = parse inline)")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    GoogleSearch.BACKEND = base_url
+
+    keywords = [f"running shoes {i}" for i in range(args.keywords)]
+
+    print(f"{args.keywords} keywords, {args.latency:.2f}s latency, "
+          f"{args.rate_limit:.0f} req/s budget, {'scrape' if args.scrape else 'api'} path"
+          f"{' (async)' if args.use_async else ''}"
+          f"{f', {args.parse_workers} parse workers' if args.parse_workers else ''}")
+    print(f"{'workers':>8} {'seconds':>9} {'kw/sec':>8}")
+
+    try:
+        for workers in [int(w) for w in args.workers.split(",")]:
+            fetch = run_async_fetch if args.use_async else run_fetch
+            elapsed = fetch(base_url, keywords, workers, args.rate_limit, not args.scrape,
+                            args.parse_workers)
+            print(f"{workers:>8} {elapsed:>9.2f} {len(keywords) / elapsed:>8.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark Google results page parsing per HTML parser backend.
+
+Each backend runs in its own subprocess so peak RSS is measured in
+isolation. Output of every backend is checked against html.parser.
+
+Usage:
+    python benchmarks/bench_html_parsers.py --pages 50
+    python benchmarks/bench_html_parsers.py --fixtures recorded.jsonl.gz
+"""
+import argparse
+import gzip
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.html_parsers import available_backends, parse_google_html
+from src.fixtures import FixtureArchive, REPLAY_MODE
+from stub_serp_server import build_organic_results
+
+
+def synthetic_page(query: str, target_bytes: int) -> str:
+    """Build a Google-like results page padded with realistic noise markup."""
+    rng = random.Random(query)
+    blocks = []
+    for result in build_organic_results(query, 20):
+        blocks.append(
+            f'<div class="g tF2Cxc" data-hveid="{rng.randrange(10**6)}">'
+            f'<div class="yuRUbf"><a href="/url?q={result["link"]}&amp;sa=U&amp;ved=x" data-ved="y">'
+            f'<h3 class="LC20lb DKV0Md">{result["title"]} <span>&amp; more</span></h3></a></div>'
+            f'<div class="VwiC3b"><span>{query} snippet text {rng.random()}</span></div></div>'
+        )
+
+    noise = []
+    size = sum(len(b) for b in blocks)
+    while size < target_bytes:
+        chunk = (
+            f'<div class="n{rng.randrange(999)}" jsname="a{rng.randrange(999)}">'
+            f'<span style="color:#{rng.randrange(0xffffff):06x}">{"x" * rng.randrange(20, 200)}</span>'
+            f'<script nonce="n">var d{rng.randrange(10**6)}={json.dumps({"k": rng.random()})};</script></div>'
+        )
+        noise.append(chunk)
+        size += len(chunk)
+
+    half = len(noise) // 2
+    return (
+        '<!doctype html><html><head><title>' + query + '</title>'
+        '<style>.g{margin:0}</style></head><body><div id="main">'
+        + ''.join(noise[:half]) + '<div id="search">' + ''.join(blocks) + '</div>'
+        + ''.join(noise[half:]) + '</div></body></html>'
+    )
+
+
+def peak_rss_kb() -> int:
+    """Peak RSS of this process in KB (VmHWM on Linux, ru_maxrss elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # ru_maxrss is KB on Linux but bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS counter where supported (Linux >= 4.0)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def run_worker(backend: str, pages_path: str, repeat: int):
+    """Child process: parse every page and print timing + peak RSS as JSON."""
+    reset_peak_rss()
+    baseline_kb = peak_rss_kb()
+    elapsed = 0.0
+    parsed = 0
+
+    # Stream one page at a time so RSS reflects parsing, not the page set
+    for _ in range(repeat):
+        with gzip.open(pages_path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                page = json.loads(line)
+                start = time.perf_counter()
+                parse_google_html(page, backend)
+                elapsed += time.perf_counter() - start
+                parsed += 1
+
+    peak_kb = peak_rss_kb()
+
+    print(json.dumps({
+        "pages_per_sec": parsed / elapsed,
+        "peak_rss_mb": peak_kb / 1024,
+        "parse_rss_mb": (peak_kb - baseline_kb) / 1024
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=30, help="Number of synthetic pages")
+    parser.add_argument("--page-kb", type=int, default=1024, help="Synthetic page size in KB")
+    parser.add_argument("--fixtures", help="Use recorded HTML pages from a fixture archive")
+    parser.add_argument("--repeat", type=int, default=1, help="Parse every page this many times")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--pages-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.pages_file, args.repeat)
+        return
+
+    if args.fixtures:
+        pages = list(FixtureArchive(args.fixtures, REPLAY_MODE).payloads("html"))
+    else:
+        pages = [synthetic_page(f"running shoes {i}", args.page_kb * 1024) for i in range(args.pages)]
+
+    if not pages:
+        sys.exit("No HTML pages to benchmark")
+
+    # Prove every backend matches the reference parser before timing it
+    expected = [parse_google_html(page, "html.parser") for page in pages]
+    mismatches = {
+        backend: sum(parse_google_html(page, backend) != ref for page, ref in zip(pages, expected))
+        for backend in available_backends()
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages_path = Path(tmp) / "pages.jsonl.gz"
+        with gzip.open(pages_path, 'wt', encoding='utf-8') as f:
+            for page in pages:
+                f.write(json.dumps(page) + '\n')
+
+        avg_kb = sum(len(p) for p in pages) / len(pages) / 1024
+        print(f"{len(pages)} pages, {avg_kb:.0f} KB average")
+        print(f"{'backend':<12} {'pages/sec':>10} {'peak RSS MB':>12} {'parse RSS MB':>13} {'mismatches':>11}")
+
+        for backend in available_backends():
+            output = subprocess.run(
+                [sys.executable, __file__, "--worker", backend,
+                 "--pages-file", str(pages_path), "--repeat", str(args.repeat)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            print(f"{backend:<12} {stats['pages_per_sec']:>10.1f} {stats['peak_rss_mb']:>12.1f} "
+                  f"{stats['parse_rss_mb']:>13.1f} {mismatches[backend]:>11}")
+
+
+if __name__ == "__main__":
+    main()
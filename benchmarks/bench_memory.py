@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Measure memory held by SERP results and competitor results with tracemalloc.
+
+Compares dict-backed classes (the previous SerpResult/CompetitorResult
+layout) with the __slots__ classes and the columnar SerpResultBatch, and
+records peak memory while parse_serp_results consumes each layout. The
+streaming row folds each keyword into CompetitorAggregator as it is
+built, so no layout is ever held in full.
+
+Usage:
+    python benchmarks/bench_memory.py --keywords 20000 --results 20
+"""
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.serp import SerpResult, SerpResultBatch
+from src.parser import CompetitorResult, DomainParser
+from src.aggregator import CompetitorAggregator
+
+
+class DictSerpResult:
+    """SerpResult without __slots__, as before."""
+
+    def __init__(self, title, url, rank):
+        self.title = title
+        self.url = url
+        self.rank = rank
+
+
+class DictCompetitorResult:
+    """CompetitorResult without __slots__, as before."""
+
+    def __init__(self, domain, count, weighted_score):
+        self.domain = domain
+        self.count = count
+        self.weighted_score = weighted_score
+        self.keyword_appearances = {}
+
+
+def raw_rows(n_keywords: int, n_results: int, n_domains: int):
+    """Yield (keyword, [(title, url, rank), ...]) with fresh strings per row."""
+    rng = random.Random(n_keywords)
+    for k in range(n_keywords):
+        keyword = f"keyword {k}"
+        rows = []
+        for position in range(1, n_results + 1):
+            domain = f"site{rng.randrange(n_domains)}.com"
+            rows.append((f"{keyword} - {domain}", f"https://www.{domain}/{k}/{position}", position))
+        yield keyword, rows
+
+
+def build(layout: str, n_keywords: int, n_results: int, n_domains: int) -> dict:
+    """Materialize serp_data in one layout."""
+    serp_data = {}
+    for keyword, rows in raw_rows(n_keywords, n_results, n_domains):
+        if layout == "dict objects":
+            serp_data[keyword] = [DictSerpResult(*row) for row in rows]
+        elif layout == "slots objects":
+            serp_data[keyword] = [SerpResult(*row) for row in rows]
+        else:
+            batch = SerpResultBatch()
+            for row in rows:
+                batch.append(*row)
+            serp_data[keyword] = batch
+    return serp_data
+
+
+def stream(domain_parser, n_keywords: int, n_results: int, n_domains: int):
+    """Fold each keyword's batch as it arrives, then rank."""
+    aggregator = CompetitorAggregator(domain_parser, max_rank=n_results)
+    for keyword, rows in raw_rows(n_keywords, n_results, n_domains):
+        batch = SerpResultBatch()
+        for row in rows:
+            batch.append(*row)
+        aggregator.add(keyword, batch)
+    return aggregator.results()
+
+
+def traced(func, *args):
+    """Return (result, retained bytes, peak bytes) for one call."""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def string_bytes(n_keywords: int, n_results: int, n_domains: int) -> int:
+    """Bytes held by the title/url strings alone, common to every layout."""
+    total = 0
+    for _, rows in raw_rows(n_keywords, n_results, n_domains):
+        for title, url, _ in rows:
+            total += sys.getsizeof(title) + sys.getsizeof(url)
+    return total
+
+
+def competitor_bytes(cls, competitors) -> int:
+    """Bytes held by competitor objects rebuilt in the given class."""
+    def _copy():
+        copies = []
+        for c in competitors:
+            copy = cls(c.domain, c.count, c.weighted_score)
+            copy.keyword_appearances = dict(c.keyword_appearances)
+            copies.append(copy)
+        return copies
+
+    _, current, _ = traced(_copy)
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keywords", type=int, default=20000, help="Number of keywords")
+    parser.add_argument("--results", type=int, default=20, help="Results per keyword")
+    parser.add_argument("--domains", type=int, default=20000, help="Domain pool size")
+    args = parser.parse_args()
+
+    rows = args.keywords * args.results
+    strings = string_bytes(args.keywords, args.results, args.domains)
+    domain_parser = DomainParser(suffix_list="bundled", domain_cache_size=args.domains * 2)
+
+    print(f"{args.keywords} keywords x {args.results} results = {rows} rows "
+          f"({strings / 2**20:.1f} MiB of title/url strings in every layout)")
+    print(f"{'layout':<16} {'serp_data MiB':>14} {'overhead B/row':>15} {'parse peak MiB':>15}")
+
+    competitors = None
+    for layout in ("dict objects", "slots objects", "columnar batch"):
+        serp_data, held, _ = traced(build, layout, args.keywords, args.results, args.domains)
+        overhead = (held - strings) / rows
+
+        competitors, _, parse_peak = traced(domain_parser.parse_serp_results, serp_data, args.results)
+
+        print(f"{layout:<16} {held / 2**20:>14.1f} {overhead:>15.1f} {parse_peak / 2**20:>15.1f}")
+        del serp_data
+        gc.collect()
+
+    _, _, stream_peak = traced(stream, domain_parser, args.keywords, args.results, args.domains)
+    print(f"{'streaming':<16} {'-':>14} {'-':>15} {stream_peak / 2**20:>15.1f}")
+
+    print()
+    print(f"{len(competitors)} competitors")
+    print(f"{'class':<16} {'MiB':>8}")
+    for label, cls in (("dict objects", DictCompetitorResult), ("slots objects", CompetitorResult)):
+        print(f"{label:<16} {competitor_bytes(cls, competitors) / 2**20:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
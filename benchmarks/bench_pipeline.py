@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the full analyze pipeline offline from a replayed fixture archive.
+
+Stages: fetch (replay) -> DomainParser.parse_serp_results ->
+CompetitorDatabase.save_analysis_run -> CSV export.
+
+Usage:
+    python benchmarks/bench_pipeline.py --keywords 10000 --concurrency 16
+    python benchmarks/bench_pipeline.py --fixtures recorded.jsonl.gz --keywords-file keywords.txt
+"""
+import argparse
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.serp import SerpFetcher
+from src.fixtures import FixtureArchive, RECORD_MODE, REPLAY_MODE
+from src.parser import create_domain_parser
+from src.db import create_database
+from src.export import create_export_manager
+
+
+def synthetic_organic_results(keyword: str, num: int, n_domains: int) -> list:
+    """Long-tail organic results: a few head domains plus many rare ones."""
+    rng = random.Random(keyword)
+    results = []
+    for position in range(1, num + 1):
+        if rng.random() < 0.4:
+            domain = f"brand{rng.randrange(50)}.com"
+        else:
+            domain = f"site{rng.randrange(n_domains)}.com"
+        results.append({
+            "position": position,
+            "title": f"{keyword} - {domain}",
+            "link": f"https://www.{domain}/{keyword.replace(' ', '-')}"
+        })
+    return results
+
+
+def write_synthetic_fixtures(path: Path, keywords, num: int, n_domains: int):
+    """Record synthetic SerpApi responses for every keyword."""
+    fetcher = SerpFetcher(requests_per_second=0)
+    archive = FixtureArchive(path, RECORD_MODE)
+    for keyword in keywords:
+        payload = {"organic_results": synthetic_organic_results(keyword, num, n_domains)}
+        archive.record("api", fetcher._request_key(keyword, num), payload)
+    archive.close()
+
+
+def timed(label: str, timings: list, func, *args, **kwargs):
+    """Run a stage, record its elapsed time and return its result."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    timings.append((label, time.perf_counter() - start))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", type=int, default=10000, help="Number of synthetic keywords")
+    parser.add_argument("--keywords-file", help="Replay these keywords (one per line) instead")
+    parser.add_argument("--fixtures", help="Existing fixture archive (default: generate synthetic)")
+    parser.add_argument("--depth", type=int, default=20, help="Results per keyword")
+    parser.add_argument("--domains", type=int, default=20000, help="Long-tail domain pool size")
+    parser.add_argument("--concurrency", type=int, default=16, help="Replay workers")
+    parser.add_argument("--latency", type=float, default=0.0, help="Synthetic latency per response")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        if args.keywords_file:
+            keywords = [line.strip() for line in open(args.keywords_file, encoding="utf-8") if line.strip()]
+        else:
+            keywords = [f"keyword {i}" for i in range(args.keywords)]
+
+        fixture_path = Path(args.fixtures) if args.fixtures else tmp / "fixtures.jsonl.gz"
+        if not args.fixtures:
+            write_synthetic_fixtures(fixture_path, keywords, args.depth, args.domains)
+
+        timings = []
+        archive = timed("load fixtures", timings, FixtureArchive, fixture_path, REPLAY_MODE, args.latency)
+        fetcher = SerpFetcher(requests_per_second=0, fixtures=archive)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            serp_data = timed("fetch (replay)", timings, fetcher.fetch_multiple_keywords,
+                              keywords, args.depth, concurrency=args.concurrency)
+
+        domain_parser = create_domain_parser()
+        competitors, rank_matrix = timed("parse + rank", timings, domain_parser.parse_serp_results,
+                                         serp_data, args.depth, return_matrix=True)
+        competitors = domain_parser.filter_competitors(competitors, max_results=len(competitors))
+
+        db = create_database(str(tmp / "bench.db"))
+        timed("save to db", timings, db.save_analysis_run, keywords, competitors, "google", args.depth,
+              rank_matrix=rank_matrix)
+
+        export_manager = create_export_manager()
+        timed("export csv", timings, export_manager.export_to_csv,
+              competitors[:50], keywords, str(tmp / "results.csv"), rank_matrix=rank_matrix)
+
+    total_results = sum(len(results) for results in serp_data.values())
+    print(f"{len(keywords)} keywords, {total_results} results, {len(competitors)} competitors")
+    print(f"{'stage':<16} {'seconds':>9}")
+    for label, elapsed in timings:
+        print(f"{label:<16} {elapsed:>9.3f}")
+    print(f"{'total':<16} {sum(t for _, t in timings):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
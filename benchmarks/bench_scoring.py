@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark DomainParser.parse_serp_results engines: pure Python vs NumPy.
+
+Both engines run on the same synthetic long-tail SERPs and their
+CompetitorResult lists are checked for equality. End-to-end times include
+per-URL domain extraction, which both engines share; aggregation times
+replace it with a precomputed URL -> domain lookup to isolate scoring.
+
+Usage:
+    python benchmarks/bench_scoring.py --sizes 1000,10000,100000 --results 20
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.serp import SerpResult
+from src.parser import DomainParser
+
+
+def build_serp_data(n_keywords: int, n_results: int, n_domains: int) -> dict:
+    """Long-tail SERPs: a few head domains plus many rare ones."""
+    rng = random.Random(n_keywords)
+    serp_data = {}
+    for k in range(n_keywords):
+        keyword = f"keyword {k}"
+        results = []
+        for position in range(1, n_results + 1):
+            if rng.random() < 0.4:
+                domain = f"brand{rng.randrange(50)}.com"
+            else:
+                domain = f"site{rng.randrange(n_domains)}.com"
+            results.append(SerpResult(keyword, f"https://www.{domain}/{k}", position))
+        serp_data[keyword] = results
+    return serp_data
+
+
+class PrecomputedDomainParser(DomainParser):
+    """DomainParser whose extract_domain is a plain dict lookup."""
+
+    def __init__(self, serp_data: dict, source: DomainParser):
+        super().__init__(suffix_list="bundled")
+        self.url_domains = {
+            result.url: source.extract_domain(result.url)
+            for results in serp_data.values() for result in results
+        }
+        self.extract_domain = self.url_domains.__getitem__
+
+
+def time_backend(parser: DomainParser, serp_data: dict, max_rank: int, backend: str):
+    """Return (seconds, competitors) for one engine run."""
+    start = time.perf_counter()
+    competitors = parser.parse_serp_results(serp_data, max_rank, backend=backend)
+    return time.perf_counter() - start, competitors
+
+
+def rows(competitors):
+    return [(c.domain, c.count, c.weighted_score, list(c.keyword_appearances.items())) for c in competitors]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated keyword counts")
+    parser.add_argument("--results", type=int, default=20, help="Results per keyword")
+    parser.add_argument("--domains", type=int, default=20000, help="Long-tail domain pool size")
+    args = parser.parse_args()
+
+    print(f"{'':>19} {'end-to-end':^28} {'aggregation only':^28}")
+    print(f"{'keywords':>9} {'results':>9} "
+          f"{'python s':>9} {'numpy s':>9} {'speedup':>8} {'python s':>9} {'numpy s':>9} {'speedup':>8}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        serp_data = build_serp_data(size, args.results, args.domains)
+
+        # Warm each engine's host cache so both measure aggregation, not first lookups
+        domain_parser = DomainParser(suffix_list="bundled", domain_cache_size=args.domains * 2)
+        domain_parser.parse_serp_results(serp_data, args.results)
+
+        python_s, expected = time_backend(domain_parser, serp_data, args.results, "python")
+        numpy_s, actual = time_backend(domain_parser, serp_data, args.results, "numpy")
+        assert rows(actual) == rows(expected), "engines disagree"
+
+        precomputed = PrecomputedDomainParser(serp_data, domain_parser)
+        python_agg_s, expected = time_backend(precomputed, serp_data, args.results, "python")
+        numpy_agg_s, actual = time_backend(precomputed, serp_data, args.results, "numpy")
+        assert rows(actual) == rows(expected), "engines disagree"
+
+        print(f"{size:>9} {size * args.results:>9} "
+              f"{python_s:>9.2f} {numpy_s:>9.2f} {python_s / numpy_s:>7.1f}x "
+              f"{python_agg_s:>9.2f} {numpy_agg_s:>9.2f} {python_agg_s / numpy_agg_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark competitor selection: full sort + filter + slice vs heap top-K.
+
+The baseline is the previous path (parse_serp_results sorting every
+domain, then filter_competitors building a filtered list to slice). The
+top-K path passes top_k/min_appearances to parse_serp_results so only the
+winners are built. Domain extraction is precomputed to isolate ranking.
+
+Usage:
+    python benchmarks/bench_topk.py --domains 10000,100000,300000 --top-k 50
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.serp import SerpResult
+from src.parser import DomainParser
+
+
+class PrecomputedDomainParser(DomainParser):
+    """DomainParser whose extract_domain returns the URL's host directly."""
+
+    def extract_domain(self, url: str) -> str:
+        return url[12:url.index("/", 12)]
+
+
+def build_serp_data(n_domains: int, n_results: int) -> dict:
+    """Long-tail SERPs touching roughly n_domains distinct domains."""
+    rng = random.Random(n_domains)
+    serp_data = {}
+    for k in range(max(1, n_domains // n_results)):
+        serp_data[f"keyword {k}"] = [
+            SerpResult("t", f"https://www.site{rng.randrange(n_domains)}.com/{k}", position)
+            for position in range(1, n_results + 1)
+        ]
+    return serp_data
+
+
+def full_sort_then_filter(parser, serp_data, top_k, min_appearances, backend):
+    competitors = parser.parse_serp_results(serp_data, backend=backend)
+    filtered = [c for c in competitors if c.count >= min_appearances]
+    return filtered[:top_k]
+
+
+def heap_top_k(parser, serp_data, top_k, min_appearances, backend):
+    return parser.parse_serp_results(serp_data, backend=backend, top_k=top_k, min_appearances=min_appearances)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--domains", default="10000,100000,300000", help="Comma-separated domain counts")
+    parser.add_argument("--results", type=int, default=20, help="Results per keyword")
+    parser.add_argument("--top-k", type=int, default=50, help="Competitors kept (--max-results)")
+    parser.add_argument("--min-appearances", type=int, default=1, help="Minimum keyword appearances")
+    args = parser.parse_args()
+
+    domain_parser = PrecomputedDomainParser(suffix_list="bundled")
+
+    print(f"{'domains':>8} {'backend':>8} {'full sort s':>12} {'top-k s':>9} {'speedup':>8}")
+
+    for n_domains in [int(s) for s in args.domains.split(",")]:
+        serp_data = build_serp_data(n_domains, args.results)
+
+        for backend in ("python", "numpy"):
+            selection = (domain_parser, serp_data, args.top_k, args.min_appearances, backend)
+            full_s, expected = timed(full_sort_then_filter, *selection)
+            heap_s, actual = timed(heap_top_k, *selection)
+
+            assert [(c.domain, c.count, c.weighted_score) for c in actual] == \
+                   [(c.domain, c.count, c.weighted_score) for c in expected], "selections differ"
+
+            print(f"{n_domains:>8} {backend:>8} {full_s:>12.3f} {heap_s:>9.3f} {full_s / heap_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark domain trend queries: joining every run vs the domain_daily rollup.
+
+Saves --runs-per-day runs a day for --days days over the same keyword
+set, then backdates the runs and rebuilds the rollup. The join path groups
+the domain's competitor_results rows by run day (what a trend chart needed
+before the rollup). The rollup path is get_domain_trend per period.
+
+Usage:
+    python benchmarks/bench_trend.py --days 1095 --competitors 500
+    python benchmarks/bench_trend.py --days 365 --runs-per-day 4
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from src.parser import CompetitorResult
+from src.db import CompetitorDatabase
+
+JOIN_TREND_SQL = '''
+    SELECT date(ar.created_at) AS day, COUNT(*), AVG(cr.weighted_score), MIN(cr.rank_position), SUM(cr.count)
+    FROM competitor_results cr
+    JOIN analysis_runs ar ON ar.id = cr.run_id
+    WHERE cr.domain_id = (SELECT id FROM domains WHERE name = ?)
+    GROUP BY day
+    ORDER BY day DESC
+    LIMIT ?
+'''
+
+
+def build_database(db: CompetitorDatabase, n_days: int, runs_per_day: int, n_competitors: int, n_keywords: int):
+    """Backdated runs spread over n_days, rollup rebuilt afterwards."""
+    rng = random.Random(n_days)
+    keywords = [f"keyword {k}" for k in range(n_keywords)]
+    domains = [f"site{d}.com" for d in range(n_competitors * 2)]
+
+    for _ in range(n_days * runs_per_day):
+        competitors = []
+        for rank, domain in enumerate(rng.sample(domains, n_competitors), 1):
+            competitor = CompetitorResult(domain, 3, float(n_competitors - rank))
+            for keyword in rng.sample(keywords, 3):
+                competitor.add_keyword_appearance(keyword, rng.randint(1, 20))
+            competitors.append(competitor)
+        db.save_analysis_run(keywords, competitors)
+
+    with db._connection() as conn:
+        conn.execute('''
+            UPDATE analysis_runs
+            SET created_at = datetime('2023-01-01', '+' || ((id - 1) / ?) || ' days', '+' || ((id - 1) % ?) || ' hours')
+        ''', (runs_per_day, runs_per_day))
+    db.recompute_database_stats()
+    return domains
+
+
+def mean_ms(func, domains) -> float:
+    start = time.perf_counter()
+    for domain in domains:
+        func(domain)
+    return (time.perf_counter() - start) * 1000 / len(domains)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=1095, help="Days of stored runs")
+    parser.add_argument("--runs-per-day", type=int, default=1, help="Runs saved each day")
+    parser.add_argument("--competitors", type=int, default=500, help="Competitors stored per run")
+    parser.add_argument("--keywords", type=int, default=50, help="Keywords per run")
+    parser.add_argument("--queries", type=int, default=50, help="Trend lookups timed per path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with CompetitorDatabase(str(Path(tmp) / "trend.db")) as db:
+            start = time.perf_counter()
+            domains = build_database(db, args.days, args.runs_per_day, args.competitors, args.keywords)
+            print(f"built {args.days * args.runs_per_day} runs x {args.competitors} competitors "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+            probe = random.Random(0).sample(domains, min(args.queries, len(domains)))
+            conn = db._connection()
+
+            print(f"{'path':>14} {'ms/query':>9}")
+            join_ms = mean_ms(lambda domain: conn.execute(JOIN_TREND_SQL, (domain, args.days)).fetchall(), probe)
+            print(f"{'join by day':>14} {join_ms:>9.2f}")
+
+            for period in ("day", "week", "month"):
+                rollup_ms = mean_ms(lambda domain: db.get_domain_trend(domain, period, limit=args.days), probe)
+                print(f"{'rollup ' + period:>14} {rollup_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
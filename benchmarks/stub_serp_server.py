@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Local stub HTTP server that imitates SerpApi and Google SERP latency.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+DOMAINS = [
+    "nike.com", "adidas.com", "newbalance.com", "brooksrunning.com", "puma.com",
+    "reebok.com", "asics.com", "hoka.com", "footlocker.com", "zappos.com",
+    "runnersworld.com", "rei.com", "dickssportinggoods.com", "finishline.com",
+    "underarmour.com", "saucony.com", "on-running.com", "mizuno.com",
+    "allbirds.com", "skechers.com", "amazon.com", "youtube.com", "reddit.com",
+]
+
+
+def build_organic_results(query: str, num: int) -> list:
+    """Build deterministic organic results for a query."""
+    rng = random.Random(query)
+    domains = rng.sample(DOMAINS, min(num, len(DOMAINS)))
+    return [
+        {
+            "position": i,
+            "title": f"{query.title()} - {domain}",
+            "link": f"https://www.{domain}/{query.replace(' ', '-')}",
+        }
+        for i, domain in enumerate(domains, 1)
+    ]
+
+
+def build_google_html(query: str, num: int) -> str:
+    """Render organic results as a minimal Google-style results page."""
+    blocks = [
+        f'<div class="g"><a href="/url?q={r["link"]}&sa=U"><h3>{r["title"]}</h3></a></div>'
+        for r in build_organic_results(query, num)
+    ]
+    return f"<html><body><div id=\"search\">{''.join(blocks)}</div></body></html>"
+
+
+class StubSerpHandler(BaseHTTPRequestHandler):
+    """Serve SerpApi-style JSON or Google-style HTML after a simulated delay."""
+
+    latency = 0.3
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        query = params.get("q", [""])[0]
+        num = int(params.get("num", ["20"])[0])
+
+        time.sleep(self.latency)
+
+        if "api_key" in params:
+            body = json.dumps({"organic_results": build_organic_results(query, num)})
+            content_type = "application/json"
+        else:
+            body = build_google_html(query, num)
+            content_type = "text/html; charset=utf-8"
+
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency: float = 0.3) -> ThreadingHTTPServer:
+    """
+    Start the stub server on a free localhost port in a daemon thread.
+
+    Args:
+        latency: Seconds to sleep before answering each request
+
+    Returns:
+        Running server (call ``shutdown()`` when done)
+    """
+    handler = type("ConfiguredStubSerpHandler", (StubSerpHandler,), {"latency": latency})
+    server_class = type("StubSerpServer", (ThreadingHTTPServer,), {"request_queue_size": 1024})
+    server = server_class(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server
@@ -5,12 +5,17 @@ Main CLI interface for analyzing competitors based on keyword search results.
 """
 import os
 import sys
+import time
+import asyncio
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 import typer
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from rich.live import Live
 from dotenv import load_dotenv
 
 # Add src to path for imports
@@ -22,9 +27,13 @@ from src.utils.error_handling import handle_error_and_exit
 from src.utils.console import print_success, print_error
 
 from src.input import get_keywords_input
-from src.serp import create_serp_fetcher
-from src.parser import create_domain_parser
-from src.db import create_database
+from src.serp import create_serp_fetcher, create_async_serp_fetcher
+from src.cache import create_serp_cache
+from src.fixtures import create_fixture_archive
+from src.parser import create_domain_parser, refresh_suffix_list_snapshot, SCORING_BACKENDS
+from src.aggregator import create_competitor_aggregator
+from src.scoring import create_scoring_model, rescore_stored_competitors
+from src.db import create_database, keyword_set_fingerprint
 from src.export import create_export_manager
 
 # Load environment variables
@@ -80,6 +89,70 @@ def analyze(
         True, "--save-db/--no-save-db", 
         help="Save results to database"
     ),
+    save_serps: bool = typer.Option(
+        True, "--save-serps/--no-save-serps",
+        help="Store raw SERP rows with the run so it can be re-scored offline"
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c",
+        help="Number of keywords fetched in parallel"
+    ),
+    parse_workers: int = typer.Option(
+        0, "--parse-workers",
+        help="Processes parsing scraped HTML independently of the fetch workers (0 = parse inline)"
+    ),
+    rate_limit: float = typer.Option(
+        1.0, "--rate-limit",
+        help="Maximum SERP requests per second per engine, shared by all workers"
+    ),
+    burst: int = typer.Option(
+        1, "--burst",
+        help="SERP requests allowed back-to-back before rate limiting starts"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache",
+        help="Reuse recently fetched SERP results from the on-disk cache"
+    ),
+    max_cache_age: float = typer.Option(
+        24.0, "--max-cache-age",
+        help="Maximum age in hours of cached SERP results"
+    ),
+    record_fixtures: Optional[str] = typer.Option(
+        None, "--record-fixtures",
+        help="Record raw SERP responses to a compressed fixture archive"
+    ),
+    replay_fixtures: Optional[str] = typer.Option(
+        None, "--replay-fixtures",
+        help="Replay SERP responses from a fixture archive instead of fetching"
+    ),
+    replay_latency: float = typer.Option(
+        0.0, "--replay-latency",
+        help="Synthetic delay in seconds per replayed response"
+    ),
+    exclusions_file: Optional[str] = typer.Option(
+        None, "--exclusions-file",
+        help="File of extra domains (and regex:<pattern> lines) to exclude from competitors"
+    ),
+    scoring_backend: str = typer.Option(
+        "python", "--scoring-backend",
+        help="Competitor aggregation engine: python or numpy (vectorized, same results)"
+    ),
+    scoring_model: str = typer.Option(
+        "linear", "--scoring-model",
+        help="Rank weighting: linear, ctr (per-engine click-through curve) or decay (exponential)"
+    ),
+    serp_features: Optional[str] = typer.Option(
+        None, "--serp-features",
+        help="Comma-separated SERP features that lower organic CTR (ads, featured_snippet, people_also_ask, local_pack, shopping)"
+    ),
+    live: bool = typer.Option(
+        False, "--live",
+        help="Render a live top-competitor table while keywords are fetched"
+    ),
+    use_async: bool = typer.Option(
+        False, "--async",
+        help="Fetch on an asyncio event loop (--concurrency bounds in-flight requests)"
+    ),
     verbose: bool = typer.Option(
         False, "--verbose", "-v", 
         help="Enable verbose output"
@@ -112,15 +185,82 @@ def analyze(
                 console.print(f"  {i}. {kw}")
         
         # Initialize components
-        serp_fetcher = create_serp_fetcher()
-        domain_parser = create_domain_parser()
+        model = create_scoring_model(scoring_model, engine, _split_option(serp_features))
+        domain_parser = create_domain_parser(exclusions_file, scoring_model=model)
+        if verbose:
+            console.print(f"Scoring model: {model.describe()}")
+        fixtures = create_fixture_archive(record_fixtures, replay_fixtures, replay_latency)
+        
+        # Fixture runs must see every upstream response, so skip the cache
+        serp_cache = None
+        if use_cache and fixtures is None:
+            serp_cache = create_serp_cache(ttl_seconds=max_cache_age * 3600)
+        
+        if scoring_backend not in SCORING_BACKENDS:
+            raise ValueError(f"Unknown scoring backend: {scoring_backend}")
+        
+        # The numpy backend scores the full batch at once; live tables need streaming
+        if live and scoring_backend != "python":
+            console.print("[yellow]--live streams results into the python scoring backend[/yellow]")
+            scoring_backend = "python"
+        streaming = scoring_backend == "python"
+        
+        aggregator = create_competitor_aggregator(domain_parser, depth, keywords)
+        serp_results = {}
+        
+        # Raw rows are staged on disk as they arrive, so streaming memory
+        # still follows the number of domains rather than results
+        db = create_database() if save_to_db else None
+        stage_serps = save_to_db and save_serps
+        
+        def _fold(keyword, results):
+            if streaming:
+                aggregator.add(keyword, results)
+            else:
+                serp_results[keyword] = results
+            if stage_serps:
+                db.stage_serp_rows(keyword, results)
         
         # Fetch SERP results
         console.print(f"[blue]Fetching SERP results using {engine.upper()}...[/blue]")
-        serp_results = serp_fetcher.fetch_multiple_keywords(keywords, depth)
+        try:
+            with _live_view(aggregator, len(keywords), live) as redraw_after:
+                on_result = redraw_after(_fold)
+                
+                if use_async:
+                    serp_fetcher = create_async_serp_fetcher(
+                        requests_per_second=rate_limit,
+                        burst=burst,
+                        cache=serp_cache,
+                        fixtures=fixtures,
+                        parse_workers=parse_workers,
+                        columnar_results=True,
+                        max_in_flight=max(concurrency, 1)
+                    )
+                    asyncio.run(_consume_async(serp_fetcher.iter_keyword_results_async(keywords, depth), on_result))
+                else:
+                    serp_fetcher = create_serp_fetcher(
+                        requests_per_second=rate_limit,
+                        burst=burst,
+                        cache=serp_cache,
+                        fixtures=fixtures,
+                        parse_workers=parse_workers,
+                        columnar_results=True
+                    )
+                    stream = serp_fetcher.iter_keyword_results(
+                        keywords, depth, concurrency=concurrency, show_progress=not live
+                    )
+                    for keyword, results in stream:
+                        on_result(keyword, results)
+        finally:
+            if fixtures is not None:
+                fixtures.close()
         
         # Check if we got results
-        total_results = sum(len(results) for results in serp_results.values())
+        if streaming:
+            total_results = aggregator.results_seen
+        else:
+            total_results = sum(len(results) for results in serp_results.values())
         if total_results == 0:
             console.print("[red]Error: No SERP results found. Check your keywords and try again.[/red]")
             raise typer.Exit(1)
@@ -129,14 +269,22 @@ def analyze(
         
         # Parse and rank competitors
         console.print("[blue]Analyzing competitors...[/blue]")
-        competitors = domain_parser.parse_serp_results(serp_results, depth)
+        # Only the top max_results competitors passing the filters are built
+        selection = dict(top_k=max_results, min_appearances=min_appearances)
+        if streaming:
+            competitors, rank_matrix = aggregator.results(return_matrix=True, **selection)
+        else:
+            serp_results = {keyword: serp_results[keyword] for keyword in keywords}
+            competitors, rank_matrix = domain_parser.parse_serp_results(
+                serp_results, depth, backend=scoring_backend, return_matrix=True, **selection
+            )
         
-        # Filter results
-        competitors = domain_parser.filter_competitors(
-            competitors, 
-            min_appearances=min_appearances,
-            max_results=max_results
-        )
+        if verbose:
+            domain_stats = domain_parser.domain_cache_stats()
+            console.print(
+                f"Domain lookups: {domain_stats['hits']} cached, {domain_stats['misses']} resolved "
+                f"({domain_stats['hit_rate']:.0%} hit rate)"
+            )
         
         if not competitors:
             console.print("[red]No competitors found matching your criteria.[/red]")
@@ -151,8 +299,10 @@ def analyze(
         # Save to database
         if save_to_db:
             console.print("[blue]Saving to database...[/blue]")
-            db = create_database()
-            run_id = db.save_analysis_run(keywords, competitors, engine, depth)
+            run_id = db.save_analysis_run(
+                keywords, competitors, engine, depth, rank_matrix=rank_matrix, staged_serp_rows=stage_serps,
+                scoring_model=model.name, serp_features=model.serp_features
+            )
             print_success(f"Saved analysis run #{run_id}")
         
         # Export results
@@ -160,19 +310,21 @@ def analyze(
         
         if output_csv:
             console.print(f"[blue]Exporting to CSV: {output_csv}[/blue]")
-            csv_path = export_manager.export_to_csv(competitors, keywords, output_csv)
+            csv_path = export_manager.export_to_csv(competitors, keywords, output_csv, rank_matrix=rank_matrix)
             print_success(f"CSV exported: {csv_path}")
         
         if output_excel:
             console.print(f"[blue]Exporting to Excel: {output_excel}[/blue]")
-            excel_path = export_manager.create_excel_export(competitors, keywords, summary, output_excel)
+            excel_path = export_manager.create_excel_export(
+                competitors, keywords, summary, output_excel, rank_matrix=rank_matrix
+            )
             print_success(f"Excel exported: {excel_path}")
         
         if google_sheet_id:
             console.print("[blue]Exporting to Google Sheets...[/blue]")
             try:
                 sheet_url = export_manager.export_to_google_sheets(
-                    competitors, keywords, google_sheet_id
+                    competitors, keywords, google_sheet_id, rank_matrix=rank_matrix
                 )
                 print_success(f"Google Sheet updated: {sheet_url}")
             except Exception as e:
@@ -208,17 +360,19 @@ def history(
         table.add_column("Date", style="green")
         table.add_column("Keywords", style="blue")
         table.add_column("Engine", style="magenta")
+        table.add_column("Scoring Model", style="magenta")
         table.add_column("Competitors", style="yellow")
         table.add_column("Top Competitor", style="red")
         
         for run in runs:
-            keywords_display = truncate_string(run['keywords'], 50)
+            keywords_display = truncate_string(', '.join(run['keywords']), 50)
             
             table.add_row(
                 str(run['id']),
                 run['created_at'][:16],  # Remove seconds
                 keywords_display,
                 run['engine'].upper(),
+                _run_model(run),
                 str(run['total_competitors']),
                 run['top_competitor'] or "N/A"
             )
@@ -230,17 +384,117 @@ def history(
 
 
 @app.command()
-def show(run_id: int):
+def trend(
+    domain: str,
+    period: str = typer.Option(
+        "day", "--period", "-p",
+        help="Bucket size: day, week or month"
+    ),
+    keyword_set: Optional[str] = typer.Option(
+        None, "--keyword-set",
+        help="Only runs of this keyword-set fingerprint (shown in the output)"
+    ),
+    keywords_string: Optional[str] = typer.Option(
+        None, "--keywords", "-s",
+        help="Only runs of exactly this keyword set (comma-separated, as passed to analyze)"
+    ),
+    keywords_file: Optional[str] = typer.Option(
+        None, "--keywords-file", "-k",
+        help="Only runs of exactly the keyword set in this file"
+    ),
+    scoring_model: Optional[str] = typer.Option(
+        None, "--scoring-model",
+        help="Only runs ranked with this model (linear, ctr or decay); models are never averaged together"
+    ),
+    serp_features: Optional[str] = typer.Option(
+        None, "--serp-features",
+        help="Only runs ranked with exactly these comma-separated SERP features"
+    ),
+    limit: int = typer.Option(30, "--limit", "-l", help="Number of most recent periods to show")
+):
+    """
+    Show a domain's weighted score over time from the daily rollup.
+    
+    Example usage:
+    python main.py trend nike.com --period week --keywords "running shoes,trail shoes"
+    """
+    try:
+        db = create_database()
+        
+        if keywords_string or keywords_file:
+            keyword_set = keyword_set_fingerprint(get_keywords_input(keywords_file, keywords_string))
+        
+        points = db.get_domain_trend(
+            domain, period=period, keyword_set=keyword_set, limit=limit, scoring_model=scoring_model,
+            serp_features=_split_option(serp_features) if serp_features is not None else None
+        )
+        
+        if not points:
+            console.print(f"[yellow]No trend data found for {domain}[/yellow]")
+            return
+        
+        table = Table(title=f"{domain} by {period}")
+        table.add_column("Period", style="cyan")
+        table.add_column("Keyword Set", style="blue")
+        table.add_column("Scoring Model", style="magenta")
+        table.add_column("Runs", style="green")
+        table.add_column("Avg Score", style="magenta")
+        table.add_column("Best Rank", style="red")
+        table.add_column("Appearances", style="yellow")
+        
+        for point in points:
+            table.add_row(
+                point['period'],
+                f"{point['keyword_set']} ({point['keyword_count']} kw)",
+                _run_model(point),
+                str(point['runs']),
+                f"{point['avg_score']:.1f}",
+                str(point['best_rank']),
+                str(point['appearances'])
+            )
+        
+        console.print(table)
+        
+    except Exception as e:
+        handle_error_and_exit(e)
+
+
+@app.command()
+def show(
+    run_id: int,
+    scoring_model: Optional[str] = typer.Option(
+        None, "--scoring-model",
+        help="Re-score the stored keyword appearances under another model (linear, ctr or decay)"
+    ),
+    serp_features: Optional[str] = typer.Option(
+        None, "--serp-features",
+        help="Comma-separated SERP features applied when re-scoring"
+    )
+):
     """Show detailed results for a specific analysis run."""
     try:
         db = create_database()
-        competitors = db.get_competitors_by_run(run_id)
+        
+        # Re-scoring needs every competitor; otherwise read only the rows shown
+        if scoring_model:
+            competitors = db.get_competitors_by_run(run_id)
+        else:
+            competitors = list(islice(db.iter_competitors_by_run(run_id), 20))
         
         if not competitors:
             console.print(f"[red]No results found for run ID {run_id}[/red]")
             raise typer.Exit(1)
         
-        table = Table(title=f"Analysis Run #{run_id} Results")
+        run = db.get_analysis_run(run_id)
+        title = f"Analysis Run #{run_id} Results"
+        if scoring_model:
+            model = create_scoring_model(scoring_model, run['engine'], _split_option(serp_features))
+            competitors = rescore_stored_competitors(competitors, model, run['num_results'])
+            title += f" (re-scored from {_run_model(run)} to {model.describe()})"
+        else:
+            title += f" (scoring model: {_run_model(run)})"
+        
+        table = Table(title=title)
         table.add_column("Rank", style="cyan")
         table.add_column("Domain", style="green")
         table.add_column("Appearances", style="yellow")
@@ -267,16 +521,131 @@ def show(run_id: int):
 
 
 @app.command()
-def stats():
+def rescore(
+    run_id: int,
+    scoring_model: str = typer.Option(
+        "linear", "--scoring-model",
+        help="Rank weighting: linear, ctr or decay"
+    ),
+    serp_features: Optional[str] = typer.Option(
+        None, "--serp-features",
+        help="Comma-separated SERP features that lower organic CTR"
+    ),
+    exclusions_file: Optional[str] = typer.Option(
+        None, "--exclusions-file",
+        help="File of extra domains (and regex:<pattern> lines) to exclude from competitors"
+    ),
+    min_appearances: int = typer.Option(
+        1, "--min-appearances",
+        help="Minimum keyword appearances to include competitor"
+    ),
+    max_results: int = typer.Option(
+        50, "--max-results",
+        help="Maximum number of competitors to return"
+    ),
+    output_csv: Optional[str] = typer.Option(
+        None, "--output-csv", "-o",
+        help="Output CSV file path"
+    ),
+    save_to_db: bool = typer.Option(
+        False, "--save-db/--no-save-db",
+        help="Save the re-scored results as a new run"
+    )
+):
+    """
+    Re-run competitor analysis on a stored run's raw SERP rows, offline.
+    
+    Example usage:
+    python main.py rescore 3 --scoring-model ctr --min-appearances 2
+    """
+    try:
+        db = create_database()
+        run = db.get_analysis_run(run_id)
+        
+        if run is None:
+            console.print(f"[red]No analysis run with ID {run_id}[/red]")
+            raise typer.Exit(1)
+        
+        engine = run['engine']
+        depth = run['num_results']
+        model = create_scoring_model(scoring_model, engine, _split_option(serp_features))
+        domain_parser = create_domain_parser(exclusions_file, scoring_model=model)
+        
+        # Stored rows stream straight into the aggregator in the run's keyword order
+        aggregator = create_competitor_aggregator(domain_parser, depth)
+        for keyword, results in db.iter_raw_serp_results(run_id):
+            aggregator.add(keyword, results)
+        
+        if aggregator.results_seen == 0:
+            console.print(f"[red]Run #{run_id} has no stored SERP rows to re-score[/red]")
+            raise typer.Exit(1)
+        
+        competitors, rank_matrix = aggregator.results(
+            return_matrix=True, top_k=max_results, min_appearances=min_appearances
+        )
+        
+        if not competitors:
+            console.print("[red]No competitors found matching your criteria.[/red]")
+            raise typer.Exit(1)
+        
+        keywords = run['keywords']
+        summary = domain_parser.get_domain_summary(competitors)
+        
+        console.print(
+            f"[blue]Re-scored run #{run_id}: {aggregator.results_seen} stored results, "
+            f"scoring model {model.describe()}[/blue]"
+        )
+        _display_results(competitors[:20], keywords, summary)
+        
+        if save_to_db:
+            new_run_id = db.save_analysis_run(
+                keywords, competitors, engine, depth,
+                notes=f"Re-scored from run #{run_id} ({model.describe()})",
+                rank_matrix=rank_matrix,
+                serp_rows_from_run=run_id,
+                scoring_model=model.name,
+                serp_features=model.serp_features
+            )
+            print_success(f"Saved analysis run #{new_run_id}")
+        
+        if output_csv:
+            csv_path = create_export_manager().export_to_csv(
+                competitors, keywords, output_csv, rank_matrix=rank_matrix
+            )
+            print_success(f"CSV exported: {csv_path}")
+        
+    except typer.Exit:
+        raise
+    except Exception as e:
+        handle_error_and_exit(e)
+
+
+@app.command()
+def stats(
+    recompute: bool = typer.Option(
+        False, "--recompute",
+        help="Recount every table and repair the stored counters (full scan)"
+    )
+):
     """Show database statistics."""
     try:
         db = create_database()
+        
+        if recompute:
+            drift = db.recompute_database_stats()
+            if drift:
+                for name, (stored, actual) in drift.items():
+                    console.print(f"[yellow]Corrected {name}: stored {stored}, actual {actual}[/yellow]")
+            else:
+                print_success("Stored statistics match a full recount")
+        
         stats = db.get_database_stats()
         
         panel_content = f"""
 [cyan]Total Analysis Runs:[/cyan] {stats['total_runs']}
 [green]Total Competitors Tracked:[/green] {stats['total_competitors']}
 [yellow]Unique Domains:[/yellow] {stats['unique_domains']}
+[cyan]Stored SERP Rows:[/cyan] {stats['raw_serp_rows']}
 [blue]Latest Analysis:[/blue] {stats['latest_run'] or 'Never'}
 [magenta]Database Size:[/magenta] {stats['db_size_mb']} MB
         """
@@ -287,6 +656,84 @@ def stats():
         handle_error_and_exit(e)
 
 
+@app.command()
+def refresh_suffix_list(
+    source: str = typer.Argument(..., help="Path to a downloaded public_suffix_list.dat")
+):
+    """Pin a new public suffix list snapshot for offline domain extraction."""
+    try:
+        rule_count = refresh_suffix_list_snapshot(source)
+        print_success(f"Pinned public suffix list with {rule_count} rules")
+        
+    except Exception as e:
+        handle_error_and_exit(e)
+
+
+def _run_model(run: dict) -> str:
+    """A stored run's scoring model, formatted like ScoringModel.describe()."""
+    if run['serp_features']:
+        return f"{run['scoring_model']} ({', '.join(run['serp_features'])})"
+    return run['scoring_model']
+
+
+def _split_option(value: Optional[str]) -> list:
+    """Split a comma-separated option into trimmed, non-empty items."""
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+async def _consume_async(stream, on_result):
+    """Feed an async (keyword, results) stream to a callback."""
+    async for keyword, results in stream:
+        on_result(keyword, results)
+
+
+@contextmanager
+def _live_view(aggregator, total_keywords, enabled=True, top_k=10, min_interval=0.25):
+    """
+    Live top-competitor table fed by the streaming aggregator.
+    
+    Yields a wrapper that adds a redraw, at most every min_interval
+    seconds, after each folded keyword.
+    """
+    if not enabled:
+        yield lambda fold: fold
+        return
+    
+    def _render():
+        return _live_table(aggregator.snapshot(top_k), aggregator.keywords_seen, total_keywords)
+    
+    with Live(_render(), console=console, refresh_per_second=4) as view:
+        last_draw = time.monotonic()
+        
+        def _redraw_after(fold):
+            def _fold_and_draw(keyword, results):
+                nonlocal last_draw
+                fold(keyword, results)
+                
+                now = time.monotonic()
+                if now - last_draw >= min_interval or aggregator.keywords_seen >= total_keywords:
+                    view.update(_render())
+                    last_draw = now
+            return _fold_and_draw
+        
+        yield _redraw_after
+        view.update(_render())
+
+
+def _live_table(competitors, keywords_done, total_keywords):
+    """Top competitors so far, for the live view."""
+    table = Table(title=f"Top Competitors ({keywords_done}/{total_keywords} keywords)")
+    table.add_column("Rank", style="cyan", width=6)
+    table.add_column("Domain", style="green", width=25)
+    table.add_column("Appearances", style="yellow", width=12)
+    table.add_column("Weighted Score", style="magenta", width=15)
+    
+    for i, competitor in enumerate(competitors, 1):
+        table.add_row(str(i), competitor.domain, str(competitor.count), f"{competitor.weighted_score:.1f}")
+    
+    return table
+
+
 def _display_results(competitors, keywords, summary, verbose=False):
     """Display analysis results in a formatted table."""
     
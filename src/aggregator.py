@@ -0,0 +1,173 @@
+"""
+Incremental competitor aggregation for streamed SERP results.
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional
+
+from .parser import CompetitorResult, DomainParser, _url_rank_pairs
+from .rank_matrix import RankMatrix
+from .serp import SerpResults
+
+# Per-domain tally slots
+_COUNT, _SCORE, _APPEARANCES, _FIRST_SEEN = range(4)
+
+
+class CompetitorAggregator:
+    """
+    Folds keyword results into per-domain tallies as they arrive.
+
+    Each ``add`` call consumes one keyword's results and keeps only the
+    domain tallies and the keyword -> rank appearances, so the raw rows
+    can be released as soon as a fetch completes. Results are identical
+    to ``DomainParser.parse_serp_results`` over the same keywords, in
+    whatever order the keywords are added (fractional weights may differ
+    in the last bit, since scores are summed in arrival order).
+    """
+
+    def __init__(
+        self,
+        domain_parser: DomainParser,
+        max_rank: int = 20,
+        keywords: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize aggregator.
+
+        Args:
+            domain_parser: Parser used for domain extraction, exclusions and weights
+            max_rank: Maximum rank to consider for weighting
+            keywords: Expected keyword order; ties and appearances follow it as
+                parse_serp_results would. Unlisted keywords rank after it in
+                arrival order.
+        """
+        self.domain_parser = domain_parser
+        self.max_rank = max_rank
+
+        self._positions: Dict[str, int] = {}
+        for keyword in keywords or ():
+            self._positions.setdefault(keyword, len(self._positions))
+
+        self._tallies: Dict[str, list] = {}
+        self.keywords_seen = 0
+        self.results_seen = 0
+
+    def add(self, keyword: str, results: SerpResults):
+        """
+        Fold one keyword's results into the tallies.
+
+        Each keyword should be added once.
+
+        Args:
+            keyword: Keyword the results belong to
+            results: SERP results (list or SerpResultBatch)
+        """
+        position = self._positions.setdefault(keyword, len(self._positions))
+        parser = self.domain_parser
+        tallies = self._tallies
+        max_rank = self.max_rank
+        weights = parser.weight_table(max_rank)
+
+        for index, (url, rank) in enumerate(_url_rank_pairs(results)):
+            domain = parser.extract_domain(url)
+
+            if not parser.is_valid_competitor(domain):
+                continue
+
+            tally = tallies.get(domain)
+            if tally is None:
+                tally = tallies[domain] = [0, 0.0, {}, (position, index)]
+            elif (position, index) < tally[_FIRST_SEEN]:
+                tally[_FIRST_SEEN] = (position, index)
+
+            tally[_COUNT] += 1
+            tally[_SCORE] += weights[rank] if 0 < rank <= max_rank else 0.0
+            tally[_APPEARANCES][keyword] = rank
+
+        self.keywords_seen += 1
+        self.results_seen += len(results)
+
+    def __len__(self) -> int:
+        return len(self._tallies)
+
+    def _competitor(self, domain: str, tally: list) -> CompetitorResult:
+        """Materialize one tally with appearances in keyword order."""
+        competitor = CompetitorResult(domain, tally[_COUNT], tally[_SCORE])
+        positions = self._positions
+
+        for keyword, rank in sorted(tally[_APPEARANCES].items(), key=lambda item: positions[item[0]]):
+            competitor.add_keyword_appearance(keyword, rank)
+
+        return competitor
+
+    @staticmethod
+    def _order(item):
+        tally = item[1]
+        return -tally[_SCORE], -tally[_COUNT], tally[_FIRST_SEEN]
+
+    def snapshot(self, top_k: int = 10) -> List[CompetitorResult]:
+        """
+        Current leaders, without sorting every domain.
+
+        Args:
+            top_k: Number of competitors to return
+
+        Returns:
+            The top_k CompetitorResult objects in final ranking order
+        """
+        leaders = heapq.nsmallest(top_k, self._tallies.items(), key=self._order)
+        return [self._competitor(domain, tally) for domain, tally in leaders]
+
+    def results(
+        self,
+        return_matrix: bool = False,
+        top_k: Optional[int] = None,
+        min_appearances: int = 1,
+        min_weighted_score: float = 0.0
+    ):
+        """
+        Final ranking, as parse_serp_results returns it.
+
+        Args:
+            return_matrix: Also return the keyword x domain RankMatrix
+            top_k: Keep only this many competitors, picked with a heap (None = all)
+            min_appearances: Minimum number of keyword appearances
+            min_weighted_score: Minimum weighted score
+
+        Returns:
+            List of CompetitorResult objects sorted by weighted score, or a
+            (competitors, RankMatrix) tuple if return_matrix is set
+        """
+        eligible = (
+            (domain, tally) for domain, tally in self._tallies.items()
+            if tally[_COUNT] >= min_appearances and tally[_SCORE] >= min_weighted_score
+        )
+
+        if top_k is None:
+            ordered = sorted(eligible, key=self._order)
+        else:
+            ordered = heapq.nsmallest(top_k, eligible, key=self._order)
+
+        competitors = [self._competitor(domain, tally) for domain, tally in ordered]
+
+        if return_matrix:
+            return competitors, RankMatrix.from_competitors(competitors, list(self._positions))
+        return competitors
+
+
+def create_competitor_aggregator(
+    domain_parser: DomainParser,
+    max_rank: int = 20,
+    keywords: Optional[Iterable[str]] = None
+) -> CompetitorAggregator:
+    """
+    Create CompetitorAggregator for one analysis run.
+
+    Args:
+        domain_parser: Parser used for domain extraction and weighting
+        max_rank: Maximum rank to consider for weighting
+        keywords: Expected keyword order
+
+    Returns:
+        Configured CompetitorAggregator instance
+    """
+    return CompetitorAggregator(domain_parser, max_rank=max_rank, keywords=keywords)
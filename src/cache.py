@@ -0,0 +1,221 @@
+"""
+Persistent on-disk cache for SERP responses.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class SerpCache:
+    """
+    Content-addressed SQLite cache of parsed SERP results.
+
+    Entries are keyed by a SHA-256 digest of (engine, keyword, num, locale),
+    expire after a TTL and are evicted least-recently-used first once the
+    stored payloads exceed the size budget.
+    """
+
+    # Re-check the total payload size after this many writes
+    EVICTION_CHECK_INTERVAL = 64
+
+    # Only rewrite last_accessed on a hit once it is this many seconds stale
+    ACCESS_TOUCH_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        cache_path: str = None,
+        ttl_seconds: float = 24 * 3600,
+        max_size_mb: float = 100.0
+    ):
+        """
+        Initialize SERP cache.
+
+        Args:
+            cache_path: Path to SQLite cache file
+            ttl_seconds: Maximum age of a usable entry (<= 0 never expires)
+            max_size_mb: Payload size budget before LRU eviction kicks in
+        """
+        if cache_path is None:
+            cache_path = os.getenv('SERP_CACHE_PATH', './data/serp_cache.db')
+
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._init_cache()
+
+    def _init_cache(self):
+        """Initialize cache schema."""
+        with self._lock:
+            # WAL without a per-commit fsync: a crash can lose the last few
+            # writes, which for a cache only means refetching them
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('PRAGMA synchronous = NORMAL')
+
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS serp_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            ''')
+
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_serp_cache_last_accessed
+                ON serp_cache (last_accessed)
+            ''')
+
+    @staticmethod
+    def make_key(engine: str, keyword: str, num_results: int, locale: str) -> str:
+        """
+        Build the content address for a SERP request.
+
+        Args:
+            engine: Search engine
+            keyword: Search keyword
+            num_results: Number of results requested
+            locale: Result locale (e.g. "en-US")
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        raw = json.dumps([engine.lower(), keyword, int(num_results), locale])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Tuple[str, str, int]]]:
+        """
+        Look up cached results.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            List of (title, url, rank) tuples, or None on miss/expiry
+        """
+        now = time.time()
+
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT payload, created_at, last_accessed FROM serp_cache WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            payload, created_at, last_accessed = row
+
+            if self.ttl_seconds > 0 and now - created_at > self.ttl_seconds:
+                self._conn.execute('DELETE FROM serp_cache WHERE key = ?', (key,))
+                self.misses += 1
+                return None
+
+            if now - last_accessed >= self.ACCESS_TOUCH_INTERVAL:
+                self._conn.execute(
+                    'UPDATE serp_cache SET last_accessed = ? WHERE key = ?', (now, key)
+                )
+            self.hits += 1
+
+        return [tuple(item) for item in json.loads(payload)]
+
+    def set(self, key: str, results: List[Tuple[str, str, int]]):
+        """
+        Store results for a key, evicting old entries if over budget.
+
+        Args:
+            key: Cache key from make_key
+            results: List of (title, url, rank) tuples
+        """
+        payload = json.dumps(results, separators=(',', ':'))
+        now = time.time()
+
+        with self._lock, self._conn:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO serp_cache (key, payload, size, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (key, payload, len(payload), now, now))
+
+            self._writes_since_check += 1
+            if self._writes_since_check >= self.EVICTION_CHECK_INTERVAL:
+                self._writes_since_check = 0
+                self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries until under the size budget."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM serp_cache').fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        excess = total - self.max_size_bytes
+        cursor = self._conn.execute(
+            'SELECT key, size FROM serp_cache ORDER BY last_accessed'
+        )
+
+        evicted = []
+        for key, size in cursor:
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self._conn.executemany('DELETE FROM serp_cache WHERE key = ?', evicted)
+        self.evictions += len(evicted)
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM serp_cache')
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters for this process.
+
+        Returns:
+            Dictionary with hits, misses, evictions, hit_rate and entries
+        """
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM serp_cache').fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries
+        }
+
+    def close(self):
+        """Close the cache database."""
+        self._conn.close()
+
+
+def create_serp_cache(ttl_seconds: float = 24 * 3600, cache_path: str = None) -> SerpCache:
+    """
+    Create SerpCache with size budget from environment.
+
+    Args:
+        ttl_seconds: Maximum age of a usable entry
+        cache_path: Optional path to cache file
+
+    Returns:
+        Configured SerpCache instance
+    """
+    max_size_mb = float(os.getenv('SERP_CACHE_MAX_MB', '100'))
+    return SerpCache(cache_path, ttl_seconds=ttl_seconds, max_size_mb=max_size_mb)
@@ -1,23 +1,134 @@
 """
 SQLite database operations for storing competitor analysis results.
 """
+import hashlib
+import json
 import sqlite3
 import os
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
-from .parser import CompetitorResult
+from .parser import CompetitorResult, _url_rank_pairs
+from .rank_matrix import RankMatrix
+from .serp import SerpResultBatch, SerpResults
+
+# Rows buffered per executemany call on bulk inserts and fetchmany on reads
+BULK_BATCH_SIZE = 5000
+
+# Highest _migrate_to_v<N> step; stored in PRAGMA user_version once applied
+SCHEMA_VERSION = 6
+
+# Bound parameters per IN (...) lookup, under SQLite's historical limit of 999
+LOOKUP_BATCH_SIZE = 500
+
+
+def _executemany_batched(
+    cursor: sqlite3.Cursor,
+    sql: str,
+    rows: Iterable[tuple],
+    batch_size: int = BULK_BATCH_SIZE
+):
+    """Run one prepared INSERT over rows, buffering batch_size tuples at a time."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        cursor.executemany(sql, batch)
+
+
+def _rebuild_table(
+    cursor: sqlite3.Cursor,
+    table: str,
+    columns_sql: str,
+    select_sql: str,
+    without_rowid: bool = False
+):
+    """
+    Replace a table with a new definition, copying rows from select_sql.
+
+    Keeps the table's AUTOINCREMENT counter so ids of deleted rows are not
+    reused. Indexes are dropped with the old table. Foreign key enforcement
+    must be off.
+
+    Args:
+        cursor: Cursor inside the migration transaction
+        table: Table to rebuild
+        columns_sql: Column and constraint definitions of the new table
+        select_sql: SELECT over the old table producing rows in column order
+        without_rowid: Create the new table WITHOUT ROWID
+    """
+    cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,))
+    sequence = cursor.fetchone()
+
+    cursor.execute(f'''
+        CREATE TABLE {table}_rebuilt ({columns_sql}){' WITHOUT ROWID' if without_rowid else ''}
+    ''')
+    cursor.execute(f'INSERT INTO {table}_rebuilt {select_sql}')
+    cursor.execute(f'DROP TABLE {table}')
+    cursor.execute(f'ALTER TABLE {table}_rebuilt RENAME TO {table}')
+
+    if sequence is not None:
+        cursor.execute('DELETE FROM sqlite_sequence WHERE name = ?', (table,))
+        cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (table, sequence[0]))
+
+
+def _serp_row_values(results: SerpResults) -> Iterator[Tuple[int, str, str]]:
+    """Yield (rank, url, title) per result of a list or SerpResultBatch."""
+    if isinstance(results, SerpResultBatch):
+        titles = results.titles
+    else:
+        titles = [result.title for result in results]
+
+    for (url, rank), title in zip(_url_rank_pairs(results), titles):
+        yield rank, url, title
+
+
+def keyword_set_fingerprint(keywords: Iterable[str]) -> str:
+    """
+    Stable id of a keyword set, independent of keyword order and repeats.
+    
+    Args:
+        keywords: Keywords of a run
+        
+    Returns:
+        16 hex characters
+    """
+    joined = '\n'.join(sorted(set(keywords)))
+    return hashlib.sha1(joined.encode('utf-8')).hexdigest()[:16]
+
+
+# Bucket of a domain_daily day per trend period; weeks start on Monday
+TREND_PERIODS = {
+    'day': "day",
+    'week': "date(day, 'weekday 0', '-6 days')",
+    'month': "strftime('%Y-%m', day)",
+}
 
 
 class CompetitorDatabase:
     """SQLite database manager for competitor analysis results."""
     
-    def __init__(self, db_path: str = None):
+    def __init__(
+        self,
+        db_path: str = None,
+        cache_size_mb: float = 64.0,
+        mmap_size_mb: float = 256.0,
+        busy_timeout: float = 30.0
+    ):
         """
         Initialize database connection.
         
+        Connections are long-lived and per thread, so one instance can be
+        shared by worker threads. Call close() to release them early.
+        
         Args:
             db_path: Path to SQLite database file
+            cache_size_mb: Page cache per connection
+            mmap_size_mb: Bytes of the file read through memory mapping (0 disables)
+            busy_timeout: Seconds a writer waits for another writer's lock
         """
         if db_path is None:
             db_path = os.getenv('DATABASE_PATH', './data/competitors.db')
@@ -25,70 +136,480 @@ class CompetitorDatabase:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        self.cache_size_mb = cache_size_mb
+        self.mmap_size_mb = mmap_size_mb
+        self.busy_timeout = busy_timeout
+        
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        
         self._init_database()
     
-    def _init_database(self):
-        """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Analysis runs table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS analysis_runs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    keywords TEXT NOT NULL,
-                    engine TEXT NOT NULL,
-                    num_results INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    total_competitors INTEGER DEFAULT 0,
-                    top_competitor TEXT,
-                    notes TEXT
-                )
-            ''')
-            
-            # Competitor results table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS competitor_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    run_id INTEGER NOT NULL,
-                    domain TEXT NOT NULL,
-                    count INTEGER NOT NULL,
-                    weighted_score REAL NOT NULL,
-                    rank_position INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (run_id) REFERENCES analysis_runs (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Keyword appearances table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS keyword_appearances (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    competitor_id INTEGER NOT NULL,
-                    keyword TEXT NOT NULL,
-                    serp_rank INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (competitor_id) REFERENCES competitor_results (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Create indexes for better performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_competitor_results_run_id 
-                ON competitor_results (run_id)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_keyword_appearances_competitor_id 
-                ON keyword_appearances (competitor_id)
-            ''')
+    def _connection(self) -> sqlite3.Connection:
+        """
+        This thread's long-lived connection, opened and tuned on first use.
+        
+        Returns:
+            sqlite3.Connection; use it as a context manager for a transaction
+        """
+        conn = getattr(self._local, 'conn', None)
+        
+        if conn is None:
+            # Only this thread uses it; close() may run on another thread
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+            # WAL lets readers run alongside a writer; NORMAL sync is durable
+            # across application crashes and only fsyncs at checkpoints
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = NORMAL')
+            conn.execute(f'PRAGMA cache_size = -{int(self.cache_size_mb * 1024)}')
+            conn.execute(f'PRAGMA mmap_size = {int(self.mmap_size_mb * 1024 * 1024)}')
+            conn.execute('PRAGMA foreign_keys = ON')
             
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_analysis_runs_created_at 
-                ON analysis_runs (created_at)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        
+        return conn
+    
+    def close(self):
+        """Close every connection opened by this instance."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._local = threading.local()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _init_database(self):
+        """Create or upgrade the schema, skipped once user_version is current."""
+        conn = self._connection()
+        
+        if conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            return
+        
+        # Table rebuilds drop and rename referenced tables; enforcement has to
+        # be off for that and can only be switched outside a transaction
+        conn.execute('PRAGMA foreign_keys = OFF')
+        try:
+            with conn:
+                # Serialize concurrent initializers, then re-check under the write lock
+                conn.execute('BEGIN IMMEDIATE')
+                version = conn.execute('PRAGMA user_version').fetchone()[0]
+                cursor = conn.cursor()
+                
+                for target in range(version + 1, SCHEMA_VERSION + 1):
+                    getattr(self, f'_migrate_to_v{target}')(cursor)
+                
+                if cursor.execute('PRAGMA foreign_key_check').fetchone() is not None:
+                    raise sqlite3.IntegrityError("Schema migration left dangling foreign keys")
+                
+                conn.execute(f'PRAGMA user_version = {max(version, SCHEMA_VERSION)}')
+        finally:
+            conn.execute('PRAGMA foreign_keys = ON')
+    
+    @staticmethod
+    def _migrate_to_v1(cursor: sqlite3.Cursor):
+        """Runs, competitor results and keyword appearances."""
+        # Analysis runs table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                keywords TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                num_results INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                total_competitors INTEGER DEFAULT 0,
+                top_competitor TEXT,
+                notes TEXT
+            )
+        ''')
+        
+        # Competitor results table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS competitor_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL,
+                domain TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                weighted_score REAL NOT NULL,
+                rank_position INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (run_id) REFERENCES analysis_runs (id) ON DELETE CASCADE
+            )
+        ''')
+        
+        # Keyword appearances table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_appearances (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                competitor_id INTEGER NOT NULL,
+                keyword TEXT NOT NULL,
+                serp_rank INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (competitor_id) REFERENCES competitor_results (id) ON DELETE CASCADE
+            )
+        ''')
+        
+        # Create indexes for better performance
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_competitor_results_run_id 
+            ON competitor_results (run_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_keyword_appearances_competitor_id 
+            ON keyword_appearances (competitor_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_analysis_runs_created_at 
+            ON analysis_runs (created_at)
+        ''')
+    
+    @staticmethod
+    def _migrate_to_v2(cursor: sqlite3.Cursor):
+        """Raw SERP rows for offline re-scoring."""
+        # Raw SERP rows per run, clustered by (run, keyword, position) for
+        # sequential re-scoring reads without a separate index
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS serp_results (
+                run_id INTEGER NOT NULL,
+                keyword_index INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                keyword TEXT NOT NULL,
+                serp_rank INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                PRIMARY KEY (run_id, keyword_index, position),
+                FOREIGN KEY (run_id) REFERENCES analysis_runs (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        ''')
+    
+    @staticmethod
+    def _migrate_to_v3(cursor: sqlite3.Cursor):
+        """Domain and keyword dictionaries; rows reference them by integer id."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS domains (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keywords (
+                id INTEGER PRIMARY KEY,
+                text TEXT NOT NULL UNIQUE
+            )
+        ''')
+        
+        # Ordered keyword list of each run, replacing the comma-joined blob
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS run_keywords (
+                run_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                keyword_id INTEGER NOT NULL,
+                PRIMARY KEY (run_id, position),
+                FOREIGN KEY (run_id) REFERENCES analysis_runs (id) ON DELETE CASCADE,
+                FOREIGN KEY (keyword_id) REFERENCES keywords (id)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Unversioned databases deleted runs with foreign keys off, which left
+        # their competitor, appearance and SERP rows behind; drop those first
+        cursor.execute('DELETE FROM competitor_results WHERE run_id NOT IN (SELECT id FROM analysis_runs)')
+        cursor.execute('DELETE FROM keyword_appearances WHERE competitor_id NOT IN (SELECT id FROM competitor_results)')
+        cursor.execute('DELETE FROM serp_results WHERE run_id NOT IN (SELECT id FROM analysis_runs)')
+        
+        cursor.execute('SELECT id, keywords FROM analysis_runs')
+        run_keywords = [
+            (run_id, position, keyword)
+            for run_id, blob in cursor.fetchall() if blob
+            for position, keyword in enumerate(blob.split(','))
+        ]
+        
+        cursor.executemany('INSERT OR IGNORE INTO keywords (text) VALUES (?)',
+                           ((keyword,) for _, _, keyword in run_keywords))
+        cursor.execute('INSERT OR IGNORE INTO keywords (text) SELECT DISTINCT keyword FROM keyword_appearances')
+        cursor.execute('INSERT OR IGNORE INTO keywords (text) SELECT DISTINCT keyword FROM serp_results')
+        cursor.execute('INSERT OR IGNORE INTO domains (name) SELECT DISTINCT domain FROM competitor_results')
+        
+        cursor.executemany('''
+            INSERT INTO run_keywords (run_id, position, keyword_id)
+            SELECT ?, ?, id FROM keywords WHERE text = ?
+        ''', run_keywords)
+        
+        _rebuild_table(cursor, 'analysis_runs', '''
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            engine TEXT NOT NULL,
+            num_results INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            total_competitors INTEGER DEFAULT 0,
+            top_competitor TEXT,
+            notes TEXT
+        ''', '''
+            SELECT id, engine, num_results, created_at, total_competitors, top_competitor, notes
+            FROM analysis_runs
+        ''')
+        
+        _rebuild_table(cursor, 'competitor_results', '''
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL,
+            domain_id INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            weighted_score REAL NOT NULL,
+            rank_position INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (run_id) REFERENCES analysis_runs (id) ON DELETE CASCADE,
+            FOREIGN KEY (domain_id) REFERENCES domains (id)
+        ''', '''
+            SELECT cr.id, cr.run_id, d.id, cr.count, cr.weighted_score, cr.rank_position, cr.created_at
+            FROM competitor_results cr
+            JOIN domains d ON d.name = cr.domain
+        ''')
+        
+        _rebuild_table(cursor, 'keyword_appearances', '''
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            competitor_id INTEGER NOT NULL,
+            keyword_id INTEGER NOT NULL,
+            serp_rank INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (competitor_id) REFERENCES competitor_results (id) ON DELETE CASCADE,
+            FOREIGN KEY (keyword_id) REFERENCES keywords (id)
+        ''', '''
+            SELECT ka.id, ka.competitor_id, k.id, ka.serp_rank, ka.created_at
+            FROM keyword_appearances ka
+            JOIN keywords k ON k.text = ka.keyword
+        ''')
+        
+        _rebuild_table(cursor, 'serp_results', '''
+            run_id INTEGER NOT NULL,
+            keyword_index INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            keyword_id INTEGER NOT NULL,
+            serp_rank INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            title TEXT NOT NULL,
+            PRIMARY KEY (run_id, keyword_index, position),
+            FOREIGN KEY (run_id) REFERENCES analysis_runs (id) ON DELETE CASCADE,
+            FOREIGN KEY (keyword_id) REFERENCES keywords (id)
+        ''', '''
+            SELECT sr.run_id, sr.keyword_index, sr.position, k.id, sr.serp_rank, sr.url, sr.title
+            FROM serp_results sr
+            JOIN keywords k ON k.text = sr.keyword
+        ''', without_rowid=True)
+        
+        # Dropping the old tables dropped their indexes
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_competitor_results_run_id
+            ON competitor_results (run_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_keyword_appearances_competitor_id
+            ON keyword_appearances (competitor_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_analysis_runs_created_at
+            ON analysis_runs (created_at)
+        ''')
+    
+    @staticmethod
+    def _migrate_to_v4(cursor: sqlite3.Cursor):
+        """Domain-centric covering index."""
+        # Domain history reads (domain_id = ?, newest run first) straight from
+        # the index without touching competitor_results rows or sorting
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_competitor_results_domain_run
+            ON competitor_results (domain_id, run_id, count, weighted_score, rank_position)
+        ''')
+    
+    @staticmethod
+    def _migrate_to_v5(cursor: sqlite3.Cursor):
+        """Trigger-maintained counters for get_database_stats."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS db_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        
+        # Stored competitor rows per domain; unique_domains counts the non-zero ones
+        cursor.execute('ALTER TABLE domains ADD COLUMN result_count INTEGER NOT NULL DEFAULT 0')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS analysis_runs_count_insert
+            AFTER INSERT ON analysis_runs
+            BEGIN
+                UPDATE db_stats SET value = value + 1 WHERE name = 'total_runs';
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS analysis_runs_count_delete
+            AFTER DELETE ON analysis_runs
+            BEGIN
+                UPDATE db_stats SET value = value - 1 WHERE name = 'total_runs';
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS competitor_results_count_insert
+            AFTER INSERT ON competitor_results
+            BEGIN
+                UPDATE domains SET result_count = result_count + 1 WHERE id = NEW.domain_id;
+                UPDATE db_stats SET value = value + 1 WHERE name = 'total_competitors';
+                UPDATE db_stats SET value = value + 1 WHERE name = 'unique_domains'
+                    AND (SELECT result_count FROM domains WHERE id = NEW.domain_id) = 1;
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS competitor_results_count_delete
+            AFTER DELETE ON competitor_results
+            BEGIN
+                UPDATE domains SET result_count = result_count - 1 WHERE id = OLD.domain_id;
+                UPDATE db_stats SET value = value - 1 WHERE name = 'total_competitors';
+                UPDATE db_stats SET value = value - 1 WHERE name = 'unique_domains'
+                    AND (SELECT result_count FROM domains WHERE id = OLD.domain_id) = 0;
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS serp_results_count_insert
+            AFTER INSERT ON serp_results
+            BEGIN
+                UPDATE db_stats SET value = value + 1 WHERE name = 'raw_serp_rows';
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS serp_results_count_delete
+            AFTER DELETE ON serp_results
+            BEGIN
+                UPDATE db_stats SET value = value - 1 WHERE name = 'raw_serp_rows';
+            END
+        ''')
+        
+        CompetitorDatabase._recount_stats(cursor)
+    
+    @staticmethod
+    def _recount_stats(cursor: sqlite3.Cursor):
+        """Rebuild db_stats and domain result counts from the base tables."""
+        cursor.execute('''
+            UPDATE domains
+            SET result_count = (SELECT COUNT(*) FROM competitor_results cr WHERE cr.domain_id = domains.id)
+        ''')
+        
+        counts = {
+            'total_runs': 'SELECT COUNT(*) FROM analysis_runs',
+            'total_competitors': 'SELECT COUNT(*) FROM competitor_results',
+            'unique_domains': 'SELECT COUNT(*) FROM domains WHERE result_count > 0',
+            'raw_serp_rows': 'SELECT COUNT(*) FROM serp_results',
+        }
+        
+        for name, sql in counts.items():
+            value = cursor.execute(sql).fetchone()[0]
+            cursor.execute('INSERT OR REPLACE INTO db_stats (name, value) VALUES (?, ?)', (name, value))
+    
+    @staticmethod
+    def _migrate_to_v6(cursor: sqlite3.Cursor):
+        """Run metadata and the per-day domain trend rollup built on it."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_sets (
+                id INTEGER PRIMARY KEY,
+                fingerprint TEXT NOT NULL UNIQUE,
+                keyword_count INTEGER NOT NULL
+            )
+        ''')
+        
+        cursor.execute('ALTER TABLE analysis_runs ADD COLUMN keyword_set_id INTEGER REFERENCES keyword_sets (id)')
+        # Earlier runs did not record their model; linear was the default
+        cursor.execute("ALTER TABLE analysis_runs ADD COLUMN scoring_model TEXT NOT NULL DEFAULT 'linear'")
+        cursor.execute("ALTER TABLE analysis_runs ADD COLUMN serp_features TEXT NOT NULL DEFAULT ''")
+        
+        cursor.execute('''
+            SELECT rk.run_id, k.text
+            FROM run_keywords rk
+            JOIN keywords k ON k.id = rk.keyword_id
+            ORDER BY rk.run_id, rk.position
+        ''')
+        run_keywords: Dict[int, List[str]] = {}
+        for run_id, keyword in cursor.fetchall():
+            run_keywords.setdefault(run_id, []).append(keyword)
+        
+        cursor.execute('SELECT id FROM analysis_runs')
+        for (run_id,) in cursor.fetchall():
+            keyword_set_id = CompetitorDatabase._keyword_set_id(cursor, run_keywords.get(run_id, []))
+            cursor.execute('UPDATE analysis_runs SET keyword_set_id = ? WHERE id = ?', (keyword_set_id, run_id))
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_analysis_runs_keyword_set
+            ON analysis_runs (keyword_set_id, created_at)
+        ''')
+        
+        # One row per domain, keyword set, scoring model and UTC day; sums keep
+        # averages exact when days are merged into weeks and months
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS domain_daily (
+                domain_id INTEGER NOT NULL,
+                keyword_set_id INTEGER NOT NULL,
+                scoring_model TEXT NOT NULL,
+                serp_features TEXT NOT NULL,
+                day TEXT NOT NULL,
+                runs INTEGER NOT NULL,
+                score_sum REAL NOT NULL,
+                best_rank INTEGER NOT NULL,
+                appearances INTEGER NOT NULL,
+                PRIMARY KEY (domain_id, keyword_set_id, scoring_model, serp_features, day),
+                FOREIGN KEY (domain_id) REFERENCES domains (id),
+                FOREIGN KEY (keyword_set_id) REFERENCES keyword_sets (id)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Downsampled series for charting tools; get_domain_trend groups the
+        # table itself so its domain filter stays a primary key search
+        for view, period in (('domain_weekly', 'week'), ('domain_monthly', 'month')):
+            cursor.execute(f'''
+                CREATE VIEW IF NOT EXISTS {view} AS
+                SELECT domain_id, keyword_set_id, scoring_model, serp_features, {TREND_PERIODS[period]} AS period,
+                       SUM(runs) AS runs, SUM(score_sum) / SUM(runs) AS avg_score,
+                       MIN(best_rank) AS best_rank, SUM(appearances) AS appearances
+                FROM domain_daily
+                GROUP BY domain_id, keyword_set_id, scoring_model, serp_features, period
             ''')
-            
-            conn.commit()
+        
+        CompetitorDatabase._rebuild_domain_daily(cursor)
+    
+    @staticmethod
+    def _keyword_set_id(cursor: sqlite3.Cursor, keywords: List[str]) -> int:
+        """Id of a run's keyword set, inserting it on first use."""
+        fingerprint = keyword_set_fingerprint(keywords)
+        cursor.execute('''
+            INSERT OR IGNORE INTO keyword_sets (fingerprint, keyword_count) VALUES (?, ?)
+        ''', (fingerprint, len(set(keywords))))
+        cursor.execute('SELECT id FROM keyword_sets WHERE fingerprint = ?', (fingerprint,))
+        return cursor.fetchone()[0]
+    
+    @staticmethod
+    def _rebuild_domain_daily(cursor: sqlite3.Cursor):
+        """Recompute the whole domain_daily rollup from stored runs."""
+        cursor.execute('DELETE FROM domain_daily')
+        cursor.execute('''
+            INSERT INTO domain_daily
+            (domain_id, keyword_set_id, scoring_model, serp_features, day, runs, score_sum, best_rank, appearances)
+            SELECT cr.domain_id, ar.keyword_set_id, ar.scoring_model, ar.serp_features, date(ar.created_at),
+                   COUNT(*), SUM(cr.weighted_score), MIN(cr.rank_position), SUM(cr.count)
+            FROM analysis_runs ar
+            JOIN competitor_results cr ON cr.run_id = ar.id
+            GROUP BY cr.domain_id, ar.keyword_set_id, ar.scoring_model, ar.serp_features, date(ar.created_at)
+        ''')
     
     def save_analysis_run(
         self,
@@ -96,66 +617,337 @@ class CompetitorDatabase:
         competitors: List[CompetitorResult],
         engine: str = "google",
         num_results: int = 20,
-        notes: str = None
+        notes: str = None,
+        rank_matrix: Optional[RankMatrix] = None,
+        serp_rows: Optional[Iterable[Tuple[str, SerpResults]]] = None,
+        staged_serp_rows: bool = False,
+        serp_rows_from_run: Optional[int] = None,
+        scoring_model: str = "linear",
+        serp_features: Iterable[str] = ()
     ) -> int:
         """
         Save complete analysis run to database.
         
+        Raw SERP rows are stored under the position of their keyword in
+        keywords, whichever of the three sources they come from.
+        
         Args:
             keywords: List of keywords analyzed
             competitors: List of competitor results
             engine: Search engine used
             num_results: Number of results fetched per keyword
             notes: Optional notes about the run
+            rank_matrix: Optional RankMatrix to stream keyword appearances from
+            serp_rows: Optional (keyword, results) pairs to store raw for re-scoring,
+                consumed lazily
+            staged_serp_rows: Move the rows written by stage_serp_rows on this
+                thread into the run
+            serp_rows_from_run: Copy the raw rows of another run with the same keywords
+            scoring_model: Name of the scoring model competitors were ranked with
+            serp_features: SERP features that model assumed
             
         Returns:
             Analysis run ID
+            
+        Raises:
+            ValueError: If raw rows are given for a keyword not in keywords
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
+            # Take the write lock up front so pre-assigned ids cannot collide
+            conn.execute('BEGIN IMMEDIATE')
             cursor = conn.cursor()
             
             # Insert analysis run
             cursor.execute('''
                 INSERT INTO analysis_runs 
-                (keywords, engine, num_results, total_competitors, top_competitor, notes)
-                VALUES (?, ?, ?, ?, ?, ?)
+                (keyword_set_id, engine, num_results, total_competitors, top_competitor, notes,
+                 scoring_model, serp_features)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
-                ','.join(keywords),
+                self._keyword_set_id(cursor, list(keywords)),
                 engine,
                 num_results,
                 len(competitors),
                 competitors[0].domain if competitors else None,
-                notes
+                notes,
+                scoring_model,
+                ','.join(serp_features)
             ))
             
             run_id = cursor.lastrowid
             
-            # Insert competitor results
-            for rank, competitor in enumerate(competitors, 1):
-                cursor.execute('''
-                    INSERT INTO competitor_results 
-                    (run_id, domain, count, weighted_score, rank_position)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
+            # Intern every string the run references, then store integer ids
+            keyword_texts = list(keywords)
+            for competitor in competitors:
+                keyword_texts.extend(competitor.keyword_appearances)
+            if rank_matrix is not None:
+                keyword_texts.extend(rank_matrix.keywords)
+            
+            keyword_ids = self._intern(cursor, 'keywords', 'text', keyword_texts)
+            domain_ids = self._intern(cursor, 'domains', 'name', (c.domain for c in competitors))
+            
+            _executemany_batched(cursor, '''
+                INSERT INTO run_keywords (run_id, position, keyword_id)
+                VALUES (?, ?, ?)
+            ''', (
+                (run_id, position, keyword_ids[keyword])
+                for position, keyword in enumerate(keywords)
+            ))
+            
+            # Competitor ids continue the AUTOINCREMENT sequence, so appearances
+            # can reference them without a lastrowid round trip per competitor
+            first_id = self._next_id(cursor, 'competitor_results')
+            
+            _executemany_batched(cursor, '''
+                INSERT INTO competitor_results 
+                (id, run_id, domain_id, count, weighted_score, rank_position)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                (
+                    first_id + offset,
                     run_id,
-                    competitor.domain,
+                    domain_ids[competitor.domain],
                     competitor.count,
                     competitor.weighted_score,
-                    rank
-                ))
+                    offset + 1
+                )
+                for offset, competitor in enumerate(competitors)
+            ))
+            
+            _executemany_batched(cursor, '''
+                INSERT INTO keyword_appearances 
+                (competitor_id, keyword_id, serp_rank)
+                VALUES (?, ?, ?)
+            ''', (
+                (competitor_id, keyword_ids[keyword], serp_rank)
+                for competitor_id, keyword, serp_rank in self._appearance_rows(competitors, first_id, rank_matrix)
+            ))
+            
+            # Fold the run into its domains' trend rows for the day
+            cursor.execute('''
+                INSERT INTO domain_daily
+                (domain_id, keyword_set_id, scoring_model, serp_features, day, runs, score_sum, best_rank, appearances)
+                SELECT cr.domain_id, ar.keyword_set_id, ar.scoring_model, ar.serp_features, date(ar.created_at),
+                       1, cr.weighted_score, cr.rank_position, cr.count
+                FROM analysis_runs ar
+                JOIN competitor_results cr ON cr.run_id = ar.id
+                WHERE ar.id = ?
+                ON CONFLICT (domain_id, keyword_set_id, scoring_model, serp_features, day) DO UPDATE SET
+                    runs = runs + 1,
+                    score_sum = score_sum + excluded.score_sum,
+                    best_rank = MIN(best_rank, excluded.best_rank),
+                    appearances = appearances + excluded.appearances
+            ''', (run_id,))
+            
+            if serp_rows is not None:
+                self._insert_serp_rows(cursor, run_id, serp_rows, keywords, keyword_ids)
+            if staged_serp_rows:
+                self._move_staged_serp_rows(cursor, run_id)
+            if serp_rows_from_run is not None:
+                cursor.execute('''
+                    INSERT INTO serp_results
+                    (run_id, keyword_index, position, keyword_id, serp_rank, url, title)
+                    SELECT ?, keyword_index, position, keyword_id, serp_rank, url, title
+                    FROM serp_results
+                    WHERE run_id = ?
+                ''', (run_id, serp_rows_from_run))
+            
+            return run_id
+    
+    @staticmethod
+    def _intern(cursor: sqlite3.Cursor, table: str, column: str, values: Iterable[str]) -> Dict[str, int]:
+        """
+        Look up dictionary ids, inserting values not stored yet.
+        
+        Args:
+            cursor: Cursor inside a write transaction
+            table: Dictionary table ('domains' or 'keywords')
+            column: Its unique text column
+            values: Strings to intern, duplicates allowed
+            
+        Returns:
+            Dictionary mapping each distinct value to its id
+        """
+        values = list(dict.fromkeys(values))
+        
+        _executemany_batched(cursor, f'INSERT OR IGNORE INTO {table} ({column}) VALUES (?)',
+                             ((value,) for value in values))
+        
+        ids = {}
+        for start in range(0, len(values), LOOKUP_BATCH_SIZE):
+            chunk = values[start:start + LOOKUP_BATCH_SIZE]
+            cursor.execute(
+                f'SELECT {column}, id FROM {table} WHERE {column} IN ({", ".join("?" * len(chunk))})',
+                chunk
+            )
+            ids.update(cursor.fetchall())
+        
+        return ids
+    
+    @staticmethod
+    def _next_id(cursor: sqlite3.Cursor, table: str) -> int:
+        """Next AUTOINCREMENT id of a table; call inside a write transaction."""
+        cursor.execute('''
+            SELECT MAX(
+                COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0),
+                COALESCE((SELECT MAX(id) FROM {table}), 0)
+            )
+        '''.format(table=table), (table,))
+        return cursor.fetchone()[0] + 1
+    
+    @staticmethod
+    def _appearance_rows(
+        competitors: List[CompetitorResult],
+        first_id: int,
+        rank_matrix: Optional[RankMatrix]
+    ) -> Iterator[Tuple[int, str, int]]:
+        """Yield (competitor_id, keyword, serp_rank) for every competitor."""
+        for offset, competitor in enumerate(competitors):
+            if rank_matrix is not None and competitor.domain in rank_matrix.domain_index:
+                appearances = rank_matrix.row_items(competitor.domain)
+            else:
+                appearances = competitor.keyword_appearances.items()
+            
+            competitor_id = first_id + offset
+            for keyword, serp_rank in appearances:
+                yield competitor_id, keyword, serp_rank
+    
+    @staticmethod
+    def _insert_serp_rows(
+        cursor: sqlite3.Cursor,
+        run_id: int,
+        serp_rows: Iterable[Tuple[str, SerpResults]],
+        keywords: List[str],
+        keyword_ids: Dict[str, int]
+    ):
+        """Insert raw SERP rows in batched executemany calls, keyed by keyword position."""
+        # A keyword listed twice keeps its first position, like run_keywords lookups
+        positions = {}
+        for position, keyword in enumerate(keywords):
+            positions.setdefault(keyword, position)
+        
+        def _rows():
+            for keyword, results in serp_rows:
+                if keyword not in positions:
+                    raise ValueError(f"SERP rows for keyword not in the run: {keyword!r}")
                 
-                competitor_id = cursor.lastrowid
+                keyword_index = positions[keyword]
+                keyword_id = keyword_ids[keyword]
+                for position, (rank, url, title) in enumerate(_serp_row_values(results)):
+                    yield run_id, keyword_index, position, keyword_id, rank, url, title
+        
+        _executemany_batched(cursor, '''
+            INSERT INTO serp_results 
+            (run_id, keyword_index, position, keyword_id, serp_rank, url, title)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', _rows())
+    
+    def stage_serp_rows(self, keyword: str, results: SerpResults):
+        """
+        Write one keyword's raw SERP rows ahead of save_analysis_run.
+        
+        Rows go to a TEMP table on this thread's connection, so a caller can
+        spill each keyword to disk as soon as it is fetched instead of
+        holding every result until the run is saved. The next save on this
+        thread with staged_serp_rows=True moves them into its run.
+        
+        Args:
+            keyword: Keyword the results were fetched for
+            results: Its SERP results
+        """
+        with self._connection() as conn:
+            conn.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS staged_serp_results (
+                    keyword TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    serp_rank INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    PRIMARY KEY (keyword, position)
+                ) WITHOUT ROWID
+            ''')
+            
+            conn.executemany('''
+                INSERT INTO temp.staged_serp_results (keyword, position, serp_rank, url, title)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                (keyword, position, rank, url, title)
+                for position, (rank, url, title) in enumerate(_serp_row_values(results))
+            ))
+    
+    @staticmethod
+    def _move_staged_serp_rows(cursor: sqlite3.Cursor, run_id: int):
+        """Move this connection's staged rows into a run whose keywords are stored."""
+        cursor.execute("SELECT 1 FROM sqlite_temp_master WHERE name = 'staged_serp_results'")
+        if cursor.fetchone() is None:
+            return
+        
+        cursor.execute('SELECT COUNT(*) FROM temp.staged_serp_results')
+        staged = cursor.fetchone()[0]
+        
+        cursor.execute('''
+            INSERT INTO serp_results
+            (run_id, keyword_index, position, keyword_id, serp_rank, url, title)
+            SELECT ?, rk.position, s.position, k.id, s.serp_rank, s.url, s.title
+            FROM temp.staged_serp_results s
+            JOIN keywords k ON k.text = s.keyword
+            JOIN (
+                SELECT keyword_id, MIN(position) AS position
+                FROM run_keywords
+                WHERE run_id = ?
+                GROUP BY keyword_id
+            ) rk ON rk.keyword_id = k.id
+        ''', (run_id, run_id))
+        
+        if cursor.rowcount != staged:
+            raise ValueError("Staged SERP rows include keywords not in the run")
+        
+        cursor.execute('DELETE FROM temp.staged_serp_results')
+    
+    def iter_raw_serp_results(
+        self,
+        run_id: int,
+        fetch_size: int = BULK_BATCH_SIZE
+    ) -> Iterator[Tuple[str, SerpResultBatch]]:
+        """
+        Stream a run's stored SERP rows, one keyword at a time.
+        
+        Args:
+            run_id: Analysis run ID
+            fetch_size: Rows read from SQLite per fetchmany call
+            
+        Yields:
+            (keyword, SerpResultBatch) tuples in the run's keyword order
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT sr.keyword_index, k.text, sr.serp_rank, sr.url, sr.title
+                FROM serp_results sr
+                JOIN keywords k ON k.id = sr.keyword_id
+                WHERE sr.run_id = ?
+                ORDER BY sr.keyword_index, sr.position
+            ''', (run_id,))
+            
+            current_index = None
+            keyword = None
+            batch = None
+            
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
                 
-                # Insert keyword appearances
-                for keyword, serp_rank in competitor.keyword_appearances.items():
-                    cursor.execute('''
-                        INSERT INTO keyword_appearances 
-                        (competitor_id, keyword, serp_rank)
-                        VALUES (?, ?, ?)
-                    ''', (competitor_id, keyword, serp_rank))
-            
-            conn.commit()
-            return run_id
+                for keyword_index, row_keyword, rank, url, title in rows:
+                    if keyword_index != current_index:
+                        if batch is not None:
+                            yield keyword, batch
+                        current_index, keyword, batch = keyword_index, row_keyword, SerpResultBatch()
+                    batch.append(title, url, rank)
+            
+            if batch is not None:
+                yield keyword, batch
     
     def get_analysis_runs(self, limit: int = 10) -> List[Dict]:
         """
@@ -167,19 +959,83 @@ class CompetitorDatabase:
         Returns:
             List of analysis run dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT id, keywords, engine, num_results, created_at, 
-                       total_competitors, top_competitor, notes
+                SELECT id, engine, num_results, created_at, 
+                       total_competitors, top_competitor, notes,
+                       scoring_model, serp_features
                 FROM analysis_runs 
                 ORDER BY created_at DESC 
                 LIMIT ?
             ''', (limit,))
             
             columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            runs = [self._run_dict(columns, row) for row in cursor.fetchall()]
+            
+            keywords = self._run_keywords(cursor, [run['id'] for run in runs])
+            for run in runs:
+                run['keywords'] = keywords.get(run['id'], [])
+            
+            return runs
+    
+    @staticmethod
+    def _run_dict(columns: List[str], row: tuple) -> Dict:
+        """Analysis run row as a dictionary, with serp_features split into a list."""
+        run = dict(zip(columns, row))
+        run['serp_features'] = run['serp_features'].split(',') if run['serp_features'] else []
+        return run
+    
+    @staticmethod
+    def _run_keywords(cursor: sqlite3.Cursor, run_ids: List[int]) -> Dict[int, List[str]]:
+        """Ordered keyword lists of the given runs, keyed by run id."""
+        keywords: Dict[int, List[str]] = {}
+        
+        for start in range(0, len(run_ids), LOOKUP_BATCH_SIZE):
+            chunk = run_ids[start:start + LOOKUP_BATCH_SIZE]
+            cursor.execute(f'''
+                SELECT rk.run_id, k.text
+                FROM run_keywords rk
+                JOIN keywords k ON k.id = rk.keyword_id
+                WHERE rk.run_id IN ({", ".join("?" * len(chunk))})
+                ORDER BY rk.run_id, rk.position
+            ''', chunk)
+            
+            for run_id, keyword in cursor.fetchall():
+                keywords.setdefault(run_id, []).append(keyword)
+        
+        return keywords
+    
+    def get_analysis_run(self, run_id: int) -> Optional[Dict]:
+        """
+        Get one analysis run.
+        
+        Args:
+            run_id: Analysis run ID
+            
+        Returns:
+            Analysis run dictionary, or None if it doesn't exist
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, engine, num_results, created_at,
+                       total_competitors, top_competitor, notes,
+                       scoring_model, serp_features
+                FROM analysis_runs
+                WHERE id = ?
+            ''', (run_id,))
+            
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            
+            columns = [desc[0] for desc in cursor.description]
+            run = self._run_dict(columns, row)
+            run['keywords'] = self._run_keywords(cursor, [run_id]).get(run_id, [])
+            return run
     
     def get_competitors_by_run(self, run_id: int) -> List[Dict]:
         """
@@ -191,40 +1047,57 @@ class CompetitorDatabase:
         Returns:
             List of competitor result dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        return list(self.iter_competitors_by_run(run_id))
+    
+    def iter_competitors_by_run(self, run_id: int, fetch_size: int = BULK_BATCH_SIZE) -> Iterator[Dict]:
+        """
+        Stream competitor results for a specific run in rank order.
+        
+        Each competitor's appearances are aggregated into one JSON object,
+        so keywords come back exactly as stored, whatever characters they
+        contain. Stop early (e.g. with islice) to page through large runs.
+        
+        Args:
+            run_id: Analysis run ID
+            fetch_size: Rows read from SQLite per fetchmany call
+            
+        Yields:
+            Competitor result dictionaries
+        """
+        with self._connection() as conn:
             cursor = conn.cursor()
             
+            # Competitor ids are assigned in rank order on save, so grouping
+            # and ordering by id follow the run_id index without a sort
             cursor.execute('''
-                SELECT cr.id, cr.domain, cr.count, cr.weighted_score, cr.rank_position,
-                       GROUP_CONCAT(ka.keyword || ':' || ka.serp_rank) as keyword_ranks
+                SELECT cr.id, d.name, cr.count, cr.weighted_score, cr.rank_position,
+                       json_group_object(k.text, ka.serp_rank) FILTER (WHERE ka.id IS NOT NULL)
                 FROM competitor_results cr
-                LEFT JOIN keyword_appearances ka ON cr.id = ka.competitor_id
+                JOIN domains d ON d.id = cr.domain_id
+                LEFT JOIN keyword_appearances ka ON ka.competitor_id = cr.id
+                LEFT JOIN keywords k ON k.id = ka.keyword_id
                 WHERE cr.run_id = ?
-                GROUP BY cr.id, cr.domain, cr.count, cr.weighted_score, cr.rank_position
-                ORDER BY cr.rank_position
+                GROUP BY cr.id
+                ORDER BY cr.id
             ''', (run_id,))
             
-            competitors = []
-            for row in cursor.fetchall():
-                competitor = {
-                    'id': row[0],
-                    'domain': row[1],
-                    'count': row[2],
-                    'weighted_score': row[3],
-                    'rank_position': row[4],
-                    'keyword_appearances': {}
-                }
-                
-                # Parse keyword appearances
-                if row[5]:
-                    for kw_rank in row[5].split(','):
-                        if ':' in kw_rank:
-                            keyword, rank = kw_rank.split(':', 1)
-                            competitor['keyword_appearances'][keyword] = int(rank)
-                
-                competitors.append(competitor)
-            
-            return competitors
+            try:
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    
+                    for competitor_id, domain, count, weighted_score, rank_position, appearances in rows:
+                        yield {
+                            'id': competitor_id,
+                            'domain': domain,
+                            'count': count,
+                            'weighted_score': weighted_score,
+                            'rank_position': rank_position,
+                            'keyword_appearances': json.loads(appearances) if appearances else {}
+                        }
+            finally:
+                cursor.close()
     
     def get_domain_history(self, domain: str, limit: int = 10) -> List[Dict]:
         """
@@ -235,22 +1108,89 @@ class CompetitorDatabase:
             limit: Maximum number of records to return
             
         Returns:
-            List of historical performance records
+            List of historical performance records, newest run first
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT ar.created_at, ar.keywords, cr.count, cr.weighted_score, cr.rank_position
+                SELECT ar.id, ar.created_at, cr.count, cr.weighted_score, cr.rank_position
                 FROM competitor_results cr
                 JOIN analysis_runs ar ON cr.run_id = ar.id
-                WHERE cr.domain = ?
-                ORDER BY ar.created_at DESC
+                WHERE cr.domain_id = (SELECT id FROM domains WHERE name = ?)
+                ORDER BY cr.run_id DESC
                 LIMIT ?
             ''', (domain, limit))
             
-            columns = ['created_at', 'keywords', 'count', 'weighted_score', 'rank_position']
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            columns = ['run_id', 'created_at', 'count', 'weighted_score', 'rank_position']
+            history = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+            keywords = self._run_keywords(cursor, [record['run_id'] for record in history])
+            for record in history:
+                record['keywords'] = keywords.get(record['run_id'], [])
+            
+            return history
+    
+    def get_domain_trend(
+        self,
+        domain: str,
+        period: str = "day",
+        keyword_set: Optional[str] = None,
+        limit: int = 30,
+        scoring_model: Optional[str] = None,
+        serp_features: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """
+        Get a domain's score trend from the per-day rollup.
+        
+        Runs scored with different models or SERP features are never
+        averaged together; each combination is its own series.
+        
+        Args:
+            domain: Domain to chart
+            period: 'day', 'week' (starting Monday) or 'month'
+            keyword_set: Only this keyword-set fingerprint (None = every set)
+            limit: Maximum number of rows, most recent periods kept
+            scoring_model: Only runs ranked with this model (None = every model)
+            serp_features: Only runs with exactly these SERP features (None = any)
+            
+        Returns:
+            List of trend points in chronological order, one per period,
+            keyword set and scoring model
+            
+        Raises:
+            ValueError: If period is unknown
+        """
+        if period not in TREND_PERIODS:
+            raise ValueError(f"Unknown period: {period} (choose from {', '.join(TREND_PERIODS)})")
+        
+        features = ','.join(serp_features) if serp_features is not None else None
+        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f'''
+                SELECT {TREND_PERIODS[period]} AS period, ks.fingerprint, ks.keyword_count,
+                       dd.scoring_model, dd.serp_features,
+                       SUM(dd.runs), SUM(dd.score_sum) / SUM(dd.runs), MIN(dd.best_rank), SUM(dd.appearances)
+                FROM domain_daily dd
+                JOIN keyword_sets ks ON ks.id = dd.keyword_set_id
+                WHERE dd.domain_id = (SELECT id FROM domains WHERE name = ?)
+                  AND (? IS NULL OR ks.fingerprint = ?)
+                  AND (? IS NULL OR dd.scoring_model = ?)
+                  AND (? IS NULL OR dd.serp_features = ?)
+                GROUP BY ks.id, dd.scoring_model, dd.serp_features, period
+                ORDER BY period DESC, ks.fingerprint, dd.scoring_model, dd.serp_features
+                LIMIT ?
+            ''', (domain, keyword_set, keyword_set, scoring_model, scoring_model, features, features, limit))
+            
+            columns = ['period', 'keyword_set', 'keyword_count', 'scoring_model', 'serp_features',
+                       'runs', 'avg_score', 'best_rank', 'appearances']
+            points = [dict(zip(columns, row)) for row in reversed(cursor.fetchall())]
+            
+            for point in points:
+                point['serp_features'] = point['serp_features'].split(',') if point['serp_features'] else []
+            return points
     
     def delete_analysis_run(self, run_id: int) -> bool:
         """
@@ -262,43 +1202,97 @@ class CompetitorDatabase:
         Returns:
             True if deletion successful
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
             cursor = conn.cursor()
             
+            cursor.execute('''
+                SELECT keyword_set_id, scoring_model, serp_features, date(created_at)
+                FROM analysis_runs WHERE id = ?
+            ''', (run_id,))
+            run = cursor.fetchone()
+            if run is None:
+                return False
+            keyword_set_id, scoring_model, serp_features, day = run
+            
+            cursor.execute('SELECT domain_id FROM competitor_results WHERE run_id = ?', (run_id,))
+            domain_ids = [row[0] for row in cursor.fetchall()]
+            
+            # Competitor results, appearances and raw SERP rows cascade
             cursor.execute('DELETE FROM analysis_runs WHERE id = ?', (run_id,))
             
-            return cursor.rowcount > 0
+            # Recompute the day's trend rows from the runs that remain
+            _executemany_batched(cursor, '''
+                DELETE FROM domain_daily
+                WHERE domain_id = ? AND keyword_set_id = ? AND scoring_model = ? AND serp_features = ? AND day = ?
+            ''', ((domain_id, keyword_set_id, scoring_model, serp_features, day) for domain_id in domain_ids))
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO domain_daily
+                (domain_id, keyword_set_id, scoring_model, serp_features, day,
+                 runs, score_sum, best_rank, appearances)
+                SELECT cr.domain_id, ar.keyword_set_id, ar.scoring_model, ar.serp_features, date(ar.created_at),
+                       COUNT(*), SUM(cr.weighted_score), MIN(cr.rank_position), SUM(cr.count)
+                FROM analysis_runs ar
+                JOIN competitor_results cr ON cr.run_id = ar.id
+                WHERE ar.keyword_set_id = ? AND ar.scoring_model = ? AND ar.serp_features = ?
+                  AND ar.created_at >= ? AND ar.created_at < date(?, '+1 day')
+                GROUP BY cr.domain_id
+            ''', (keyword_set_id, scoring_model, serp_features, day, day))
+            
+            return True
+    
+    def recompute_database_stats(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Recount the stored statistics from the base tables.
+        
+        Also rebuilds the domain_daily trend rollup. Scans every table, so
+        it is only for verification or repair after rows were changed
+        outside this class.
+        
+        Returns:
+            Dictionary mapping each counter that had drifted to
+            (stored value, recomputed value); empty if all matched
+        """
+        with self._connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+            
+            stored = dict(cursor.execute('SELECT name, value FROM db_stats').fetchall())
+            self._recount_stats(cursor)
+            self._rebuild_domain_daily(cursor)
+            recomputed = dict(cursor.execute('SELECT name, value FROM db_stats').fetchall())
+            
+            return {
+                name: (stored.get(name), value)
+                for name, value in recomputed.items() if stored.get(name) != value
+            }
     
     def get_database_stats(self) -> Dict:
         """
         Get database statistics.
         
+        Counts are read from the trigger-maintained db_stats table, so this
+        does not scan any table; see recompute_database_stats.
+        
         Returns:
             Dictionary with database statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             
-            stats = {}
-            
-            # Count analysis runs
-            cursor.execute('SELECT COUNT(*) FROM analysis_runs')
-            stats['total_runs'] = cursor.fetchone()[0]
-            
-            # Count competitor results
-            cursor.execute('SELECT COUNT(*) FROM competitor_results')
-            stats['total_competitors'] = cursor.fetchone()[0]
-            
-            # Count unique domains
-            cursor.execute('SELECT COUNT(DISTINCT domain) FROM competitor_results')
-            stats['unique_domains'] = cursor.fetchone()[0]
+            # Counters kept current by triggers on every insert and delete
+            cursor.execute('SELECT name, value FROM db_stats')
+            stats = dict(cursor.fetchall())
             
             # Latest run
             cursor.execute('SELECT MAX(created_at) FROM analysis_runs')
             stats['latest_run'] = cursor.fetchone()[0]
             
-            # Database file size
-            stats['db_size_mb'] = round(os.path.getsize(self.db_path) / (1024 * 1024), 2)
+            # Database file size, including write-ahead log not yet checkpointed
+            wal_path = Path(f"{self.db_path}-wal")
+            size = os.path.getsize(self.db_path) + (wal_path.stat().st_size if wal_path.exists() else 0)
+            stats['db_size_mb'] = round(size / (1024 * 1024), 2)
             
             return stats
 
@@ -313,4 +1307,8 @@ def create_database(db_path: str = None) -> CompetitorDatabase:
     Returns:
         Configured CompetitorDatabase instance
     """
-    return CompetitorDatabase(db_path)
\ No newline at end of file
+    return CompetitorDatabase(
+        db_path,
+        cache_size_mb=float(os.getenv('DATABASE_CACHE_MB', '64')),
+        mmap_size_mb=float(os.getenv('DATABASE_MMAP_MB', '256'))
+    )
@@ -0,0 +1,258 @@
+"""
+Compiled competitor exclusion rules.
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+REGEX_PREFIX = "regex:"
+
+_LITERAL = sre_parse.LITERAL
+_AT = sre_parse.AT
+_STRING_START = (sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING)
+_STRING_END = (sre_parse.AT_END, sre_parse.AT_END_STRING)
+
+# Inline flags that must open a pattern, e.g. "(?i)"
+_GLOBAL_FLAGS = re.compile(r'\(\?([aiLmsux]+)\)')
+
+# Marks a trie node where an excluded domain ends (never a label)
+_TERMINAL = None
+
+
+class ExclusionRules:
+    """
+    Excluded domains and regex patterns compiled for constant per-URL cost.
+
+    Domains live in a trie keyed by reversed labels (``shop.nike.com`` is
+    stored as com -> nike -> shop), so a lookup walks at most as many nodes
+    as the checked domain has labels, however many rules are loaded. An
+    excluded domain also excludes its subdomains.
+
+    Patterns are matched from the start of the domain, like ``re.match``.
+    A pattern that spells out a whole label literally (``.*\\.aggregator\\..*``
+    needs the label ``aggregator``) is indexed under that label and only
+    run against domains that contain it. The remaining patterns are joined
+    into one compiled regex, so only those still cost time per pattern.
+    """
+
+    def __init__(self, domains: Iterable[str] = (), patterns: Iterable[str] = ()):
+        """
+        Initialize exclusion rules.
+
+        Args:
+            domains: Domains to exclude, with their subdomains
+            patterns: Regular expressions; a domain matching any is excluded
+        """
+        self._trie: Dict[Optional[str], Dict] = {}
+        self.domain_count = 0
+        self.patterns: List[str] = []
+        self._regex: Optional[re.Pattern] = None
+        self._unindexed: List[str] = []
+        self._labelled: Dict[str, List[str]] = {}
+        self._label_regex: Dict[str, re.Pattern] = {}
+
+        self.add(domains, patterns)
+
+    def add(self, domains: Iterable[str] = (), patterns: Iterable[str] = ()):
+        """
+        Add domains and patterns, recompiling each affected regex once.
+
+        Args:
+            domains: Domains to exclude, with their subdomains
+            patterns: Regular expressions to exclude
+        """
+        for domain in domains:
+            self._add_domain(domain)
+
+        new_patterns = list(patterns)
+        if not new_patterns:
+            return
+
+        self.patterns.extend(new_patterns)
+        changed_labels = set()
+        for pattern in new_patterns:
+            label = _required_label(pattern)
+            if label is None:
+                self._unindexed.append(pattern)
+            else:
+                self._labelled.setdefault(label, []).append(pattern)
+                changed_labels.add(label)
+
+        if self._unindexed:
+            self._regex = _combine(self._unindexed)
+        for label in changed_labels:
+            self._label_regex[label] = _combine(self._labelled[label])
+
+    def _add_domain(self, domain: str):
+        """Insert one domain into the reversed-label trie."""
+        labels = domain.strip().lower().strip('.').split('.')
+        if not labels[-1]:
+            return
+
+        node = self._trie
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+
+        if _TERMINAL not in node:
+            node[_TERMINAL] = {}
+            self.domain_count += 1
+
+    def matches_domain(self, domain: str) -> bool:
+        """Check whether a domain or one of its parent domains is excluded."""
+        node = self._trie
+
+        for label in reversed(domain.split('.')):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _TERMINAL in node:
+                return True
+
+        return False
+
+    def is_excluded(self, domain: str) -> bool:
+        """
+        Check a lowercase domain against every rule.
+
+        Args:
+            domain: Domain to check
+
+        Returns:
+            True if a domain rule or pattern excludes it
+        """
+        if self.matches_domain(domain):
+            return True
+
+        if self._label_regex:
+            for label in domain.split('.'):
+                regex = self._label_regex.get(label)
+                if regex is not None and regex.match(domain) is not None:
+                    return True
+
+        return self._regex is not None and self._regex.match(domain) is not None
+
+    def __len__(self) -> int:
+        return self.domain_count + len(self.patterns)
+
+    @classmethod
+    def from_file(cls, file_path: Union[str, Path]) -> "ExclusionRules":
+        """
+        Load rules from a text file.
+
+        One rule per line: a domain, or ``regex:<pattern>``. Blank lines and
+        lines starting with ``#`` are ignored.
+
+        Args:
+            file_path: Path to the exclusions file
+
+        Returns:
+            Compiled ExclusionRules
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If a pattern is not a valid regular expression
+        """
+        rules = cls()
+        rules.load(file_path)
+        return rules
+
+    def load(self, file_path: Union[str, Path]):
+        """
+        Add the rules from a text file (see from_file for the format).
+
+        Args:
+            file_path: Path to the exclusions file
+        """
+        file_path = Path(file_path)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Exclusions file not found: {file_path}")
+
+        domains = []
+        patterns = []
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                if line.startswith(REGEX_PREFIX):
+                    pattern = line[len(REGEX_PREFIX):].strip()
+                    try:
+                        re.compile(pattern)
+                    except re.error as e:
+                        raise ValueError(f"Invalid exclusion pattern '{pattern}': {e}")
+                    patterns.append(pattern)
+                else:
+                    domains.append(line)
+
+        self.add(domains, patterns)
+
+
+def _combine(patterns: List[str]) -> re.Pattern:
+    """Compile patterns into one alternation that matches if any of them does."""
+    return re.compile('|'.join(_scoped(pattern) for pattern in patterns))
+
+
+def _scoped(pattern: str) -> str:
+    """Wrap a pattern in a group, turning leading ``(?i)``-style flags into group flags."""
+    flags = _GLOBAL_FLAGS.match(pattern)
+    if flags:
+        return f'(?{flags.group(1)}:{pattern[flags.end():]})'
+    return f'(?:{pattern})'
+
+
+def _required_label(pattern: str) -> Optional[str]:
+    """
+    Find a domain label a pattern can only match by containing verbatim.
+
+    Looks for a run of top-level literal characters that contains a whole
+    label: one with a dot (or the start or end of the domain) on both
+    sides. ``.*\\.aggregator\\..*`` and ``^ads\\.`` qualify; ``^shop\\d+\\.`` and
+    anything with a top-level ``|`` or case-insensitive flag do not.
+
+    Args:
+        pattern: Regular expression matched from the start of the domain
+
+    Returns:
+        The longest such label, or None if the pattern has none
+    """
+    parsed = sre_parse.parse(pattern)
+    if parsed.state.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+
+    items = list(parsed)
+    best = None
+    run: List[str] = []
+    run_at_start = True
+
+    for index in range(len(items) + 1):
+        op, arg = items[index] if index < len(items) else (None, None)
+
+        if op is _LITERAL:
+            run.append(chr(arg))
+            continue
+        if op is _AT and arg in _STRING_START and index == 0:
+            continue
+
+        at_end = op is _AT and arg in _STRING_END
+        labels = ''.join(run).split('.')
+        # The first and last pieces are only whole labels at a dot or string edge
+        if not run_at_start:
+            labels[0] = ''
+        if not at_end:
+            labels[-1] = ''
+        for label in labels:
+            if label and (best is None or len(label) > len(best)):
+                best = label
+
+        run = []
+        run_at_start = False
+
+    return best
@@ -5,11 +5,12 @@ import csv
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 import pandas as pd
 import typer
 
 from .parser import CompetitorResult
+from .rank_matrix import RankMatrix
 
 try:
     from googleapiclient.discovery import build
@@ -31,12 +32,38 @@ class ExportManager:
         self.credentials_file = os.getenv('GOOGLE_SHEETS_CREDENTIALS_FILE')
         self.token_file = os.getenv('GOOGLE_SHEETS_TOKEN_FILE')
     
+    def _keyword_rank_columns(
+        self,
+        competitors: List[CompetitorResult],
+        keywords: List[str],
+        rank_matrix: Optional[RankMatrix] = None
+    ) -> Iterator[list]:
+        """
+        Yield each competitor's per-keyword ranks, '' where it doesn't rank.
+        
+        With a rank matrix only actual appearances are visited; otherwise
+        every keyword is probed in the competitor's appearance dict.
+        """
+        rows = rank_matrix.column_mapper(keywords) if rank_matrix is not None else None
+        
+        for competitor in competitors:
+            if rows is not None and competitor.domain in rank_matrix.domain_index:
+                yield rows.row(competitor.domain)
+                continue
+            
+            ranks = []
+            for keyword in keywords:
+                serp_rank = competitor.keyword_appearances.get(keyword, 0)
+                ranks.append(serp_rank if serp_rank > 0 else '')
+            yield ranks
+    
     def export_to_csv(
         self,
         competitors: List[CompetitorResult],
         keywords: List[str],
         output_path: str = None,
-        include_keyword_details: bool = True
+        include_keyword_details: bool = True,
+        rank_matrix: Optional[RankMatrix] = None
     ) -> str:
         """
         Export competitor results to CSV file.
@@ -46,6 +73,7 @@ class ExportManager:
             keywords: List of keywords analyzed
             output_path: Output file path (optional)
             include_keyword_details: Include per-keyword appearance data
+            rank_matrix: Optional RankMatrix to stream keyword ranks from
             
         Returns:
             Path to created CSV file
@@ -57,33 +85,35 @@ class ExportManager:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Prepare data
-        rows = []
+        keyword_columns = [f'kw_{keyword.replace(" ", "_")}' for keyword in keywords] \
+            if include_keyword_details else []
         
-        for rank, competitor in enumerate(competitors, 1):
-            row = {
-                'rank': rank,
-                'domain': competitor.domain,
-                'appearances': competitor.count,
-                'weighted_score': round(competitor.weighted_score, 2)
-            }
-            
-            # Add per-keyword data if requested
-            if include_keyword_details:
-                for keyword in keywords:
-                    serp_rank = competitor.keyword_appearances.get(keyword, 0)
-                    row[f'kw_{keyword.replace(" ", "_")}'] = serp_rank if serp_rank > 0 else ''
+        def _rows():
+            keyword_ranks = self._keyword_rank_columns(competitors, keywords, rank_matrix) \
+                if include_keyword_details else None
             
-            rows.append(row)
+            for rank, competitor in enumerate(competitors, 1):
+                row = {
+                    'rank': rank,
+                    'domain': competitor.domain,
+                    'appearances': competitor.count,
+                    'weighted_score': round(competitor.weighted_score, 2)
+                }
+                
+                # Add per-keyword data if requested
+                if keyword_ranks is not None:
+                    row.update(zip(keyword_columns, next(keyword_ranks)))
+                
+                yield row
         
-        # Write CSV
-        if rows:
-            fieldnames = list(rows[0].keys())
+        # Stream rows straight to the CSV file
+        if competitors:
+            fieldnames = list(dict.fromkeys(['rank', 'domain', 'appearances', 'weighted_score'] + keyword_columns))
             
             with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                 writer.writeheader()
-                writer.writerows(rows)
+                writer.writerows(_rows())
         
         return str(output_path)
     
@@ -166,7 +196,8 @@ class ExportManager:
         competitors: List[CompetitorResult],
         keywords: List[str],
         spreadsheet_id: str,
-        sheet_name: str = None
+        sheet_name: str = None,
+        rank_matrix: Optional[RankMatrix] = None
     ) -> str:
         """
         Export competitor results to Google Sheets.
@@ -176,6 +207,7 @@ class ExportManager:
             keywords: List of keywords analyzed
             spreadsheet_id: Google Sheets spreadsheet ID
             sheet_name: Sheet name (optional, auto-generated if not provided)
+            rank_matrix: Optional RankMatrix to read keyword ranks from
             
         Returns:
             URL to the Google Sheet
@@ -193,6 +225,7 @@ class ExportManager:
                  [f'KW: {kw}' for kw in keywords]
         
         data = [headers]
+        keyword_ranks = self._keyword_rank_columns(competitors, keywords, rank_matrix)
         
         for rank, competitor in enumerate(competitors, 1):
             row = [
@@ -203,9 +236,7 @@ class ExportManager:
             ]
             
             # Add per-keyword ranks
-            for keyword in keywords:
-                serp_rank = competitor.keyword_appearances.get(keyword, '')
-                row.append(serp_rank if serp_rank > 0 else '')
+            row.extend(next(keyword_ranks))
             
             data.append(row)
         
@@ -280,7 +311,8 @@ class ExportManager:
         competitors: List[CompetitorResult],
         keywords: List[str],
         analysis_summary: Dict,
-        output_path: str = None
+        output_path: str = None,
+        rank_matrix: Optional[RankMatrix] = None
     ) -> str:
         """
         Create Excel file with multiple sheets for comprehensive analysis.
@@ -290,6 +322,7 @@ class ExportManager:
             keywords: List of keywords analyzed
             analysis_summary: Summary statistics
             output_path: Output file path (optional)
+            rank_matrix: Optional RankMatrix to read keyword ranks from
             
         Returns:
             Path to created Excel file
@@ -304,6 +337,9 @@ class ExportManager:
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             # Main results sheet
             main_data = []
+            keyword_columns = [f'KW: {keyword}' for keyword in keywords]
+            keyword_ranks = self._keyword_rank_columns(competitors, keywords, rank_matrix)
+            
             for rank, competitor in enumerate(competitors, 1):
                 row = {
                     'Rank': rank,
@@ -313,9 +349,7 @@ class ExportManager:
                 }
                 
                 # Add per-keyword data
-                for keyword in keywords:
-                    serp_rank = competitor.keyword_appearances.get(keyword, 0)
-                    row[f'KW: {keyword}'] = serp_rank if serp_rank > 0 else ''
+                row.update(zip(keyword_columns, next(keyword_ranks)))
                 
                 main_data.append(row)
             
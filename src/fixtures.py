@@ -0,0 +1,145 @@
+"""
+Record/replay fixture archives of raw SERP responses.
+"""
+import gzip
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+RECORD_MODE = "record"
+REPLAY_MODE = "replay"
+
+
+class FixtureArchive:
+    """
+    Gzip-compressed JSON Lines archive of raw SerpApi JSON and Google HTML.
+
+    In record mode every upstream response is appended as one line; in
+    replay mode the archive is loaded into memory and served back, keyed by
+    response kind ("api" or "html") and the normalized request identity.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY_MODE, latency: float = 0.0):
+        """
+        Initialize fixture archive.
+
+        Args:
+            path: Path to the .jsonl.gz archive
+            mode: "record" to append responses, "replay" to serve them
+            latency: Synthetic delay in seconds added to each replayed response
+        """
+        if mode not in (RECORD_MODE, REPLAY_MODE):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Any] = {}
+        self._writer = None
+
+        if mode == RECORD_MODE:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = gzip.open(self.path, 'at', encoding='utf-8')
+        else:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY_MODE
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD_MODE
+
+    def _load(self):
+        """Load every recorded response; later duplicates win."""
+        if not self.path.exists():
+            raise FileNotFoundError(f"Fixture archive not found: {self.path}")
+
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[(entry['kind'], *entry['key'])] = entry['payload']
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, kind: str, key: Tuple, payload: Any):
+        """
+        Append one raw response to the archive.
+
+        Args:
+            kind: "api" for SerpApi JSON, "html" for Google HTML
+            key: Request identity (engine, query, num, locale)
+            payload: Raw response dict or HTML string
+        """
+        if not self.recording:
+            return
+
+        line = json.dumps({'kind': kind, 'key': list(key), 'payload': payload}, separators=(',', ':'))
+
+        with self._lock:
+            self._writer.write(line + '\n')
+
+    def lookup(self, kind: str, key: Tuple) -> Optional[Any]:
+        """
+        Find a recorded response.
+
+        Args:
+            kind: "api" or "html"
+            key: Request identity (engine, query, num, locale)
+
+        Returns:
+            Raw payload, or None if nothing was recorded for the request
+        """
+        return self._entries.get((kind, *key))
+
+    def payloads(self, kind: str) -> Iterator[Any]:
+        """
+        Iterate over replayed payloads of one kind.
+
+        Args:
+            kind: "api" or "html"
+
+        Yields:
+            Raw payloads in archive order
+        """
+        for (entry_kind, *_), payload in self._entries.items():
+            if entry_kind == kind:
+                yield payload
+
+    def close(self):
+        """Flush and close the archive."""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+def create_fixture_archive(
+    record_path: str = None,
+    replay_path: str = None,
+    latency: float = 0.0
+) -> Optional[FixtureArchive]:
+    """
+    Create FixtureArchive from record/replay CLI options.
+
+    Args:
+        record_path: Archive to record responses into
+        replay_path: Archive to replay responses from
+        latency: Synthetic delay per replayed response
+
+    Returns:
+        Configured FixtureArchive, or None if neither path is given
+    """
+    if record_path and replay_path:
+        raise ValueError("Please provide either a record OR a replay fixture path, not both.")
+
+    if record_path:
+        return FixtureArchive(record_path, RECORD_MODE)
+    if replay_path:
+        return FixtureArchive(replay_path, REPLAY_MODE, latency=latency)
+    return None
@@ -0,0 +1,242 @@
+"""
+Pluggable HTML parser backends for Google results pages.
+
+Every backend extracts the same (title, url, rank) tuples as the original
+BeautifulSoup implementation; faster backends are picked automatically
+when their optional packages are installed.
+"""
+import os
+import asyncio
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+RawResult = Tuple[str, str, int]
+
+# Fastest first; "auto" picks the first installed backend
+PREFERRED_BACKENDS = ("selectolax", "lxml", "html.parser")
+
+# Matches class="g" as one of possibly several classes, like BeautifulSoup's class_
+_LXML_RESULT_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' g ')]"
+
+
+def _clean_result(title: str, link: str, rank: int) -> Optional[RawResult]:
+    """Unwrap Google redirect URLs and drop incomplete or in-page results."""
+    # Clean up Google redirect URLs
+    if link.startswith('/url?q='):
+        link = link.split('/url?q=')[1].split('&')[0]
+
+    if title and link and not link.startswith('#'):
+        return (title, link, rank)
+    return None
+
+
+def _parse_with_html_parser(html: str) -> List[RawResult]:
+    """Reference implementation on BeautifulSoup's html.parser."""
+    soup = BeautifulSoup(html, 'html.parser')
+    serp_results = []
+
+    # Find search result containers
+    result_containers = soup.find_all('div', class_='g')
+
+    for i, container in enumerate(result_containers, 1):
+        # Find title and link
+        title_elem = container.find('h3')
+        link_elem = container.find('a')
+
+        if title_elem and link_elem:
+            result = _clean_result(title_elem.get_text(strip=True), link_elem.get('href', ''), i)
+            if result:
+                serp_results.append(result)
+
+    return serp_results
+
+
+def _parse_with_lxml(html: str) -> List[RawResult]:
+    """Parse with libxml2 via lxml.html."""
+    if not html.strip():
+        return []
+
+    document = lxml.html.document_fromstring(html)
+    serp_results = []
+
+    for i, container in enumerate(document.xpath(_LXML_RESULT_XPATH), 1):
+        title_elem = next(container.iter('h3'), None)
+        link_elem = next(container.iter('a'), None)
+
+        if title_elem is not None and link_elem is not None:
+            title = ''.join(text.strip() for text in title_elem.itertext())
+            result = _clean_result(title, link_elem.get('href', ''), i)
+            if result:
+                serp_results.append(result)
+
+    return serp_results
+
+
+def _parse_with_selectolax(html: str) -> List[RawResult]:
+    """Parse with the lexbor engine via selectolax."""
+    tree = LexborHTMLParser(html)
+    serp_results = []
+
+    # Quirks-mode pages match class selectors case-insensitively; re-check exactly
+    containers = [
+        node for node in tree.css('div.g')
+        if 'g' in (node.attributes.get('class') or '').split()
+    ]
+
+    for i, container in enumerate(containers, 1):
+        title_elem = container.css_first('h3')
+        link_elem = container.css_first('a')
+
+        if title_elem is not None and link_elem is not None:
+            title = title_elem.text(deep=True, separator='', strip=True)
+            result = _clean_result(title, link_elem.attributes.get('href') or '', i)
+            if result:
+                serp_results.append(result)
+
+    return serp_results
+
+
+PARSER_BACKENDS: Dict[str, Callable[[str], List[RawResult]]] = {
+    "html.parser": _parse_with_html_parser
+}
+if LXML_AVAILABLE:
+    PARSER_BACKENDS["lxml"] = _parse_with_lxml
+if SELECTOLAX_AVAILABLE:
+    PARSER_BACKENDS["selectolax"] = _parse_with_selectolax
+
+
+def available_backends() -> List[str]:
+    """
+    List installed parser backends, fastest first.
+
+    Returns:
+        Backend names usable with parse_google_html
+    """
+    return [name for name in PREFERRED_BACKENDS if name in PARSER_BACKENDS]
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Resolve a backend name, honoring SERP_HTML_PARSER and "auto".
+
+    Args:
+        name: Backend name, "auto" or None
+
+    Returns:
+        Installed backend name
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    name = name or os.getenv('SERP_HTML_PARSER', 'auto')
+
+    if name == 'auto':
+        return available_backends()[0]
+
+    if name not in PARSER_BACKENDS:
+        raise ValueError(
+            f"HTML parser backend '{name}' is not available. "
+            f"Installed backends: {', '.join(available_backends())}"
+        )
+
+    return name
+
+
+def parse_google_html(html: str, backend: str = "html.parser") -> List[RawResult]:
+    """
+    Extract organic results from a Google results page.
+
+    Args:
+        html: Raw results page HTML
+        backend: Installed backend name (see resolve_backend)
+
+    Returns:
+        List of (title, url, rank) tuples
+    """
+    if backend == "html.parser":
+        return _parse_with_html_parser(html)
+
+    try:
+        return PARSER_BACKENDS[backend](html)
+    except Exception:
+        # Fall back to the reference parser on input a fast backend rejects
+        return _parse_with_html_parser(html)
+
+
+class HtmlParsePool:
+    """
+    Process-pool stage that parses raw results pages off the fetching threads.
+
+    Fetchers hand pages over with ``parse``/``submit``; at most
+    ``max_pending`` pages wait in the pool at once, and further fetchers
+    block until a slot frees up so raw HTML cannot pile up in memory.
+    """
+
+    def __init__(self, workers: int, backend: str = "html.parser", max_pending: int = None):
+        """
+        Initialize parse pool.
+
+        Args:
+            workers: Number of parser processes
+            backend: Installed backend name used in the workers
+            max_pending: Pages allowed in the pool at once (default 2 per worker)
+        """
+        self.workers = workers
+        self.backend = backend
+        self.max_pending = max_pending or workers * 2
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+
+        # Start the workers now, before fetch threads exist, so they are
+        # never forked while another thread holds a lock
+        self._executor.submit(parse_google_html, "", backend).result()
+
+    def submit(self, html: str) -> Future:
+        """
+        Queue a page for parsing, blocking while the pool is full.
+
+        Args:
+            html: Raw results page HTML
+
+        Returns:
+            Future resolving to a list of (title, url, rank) tuples
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(parse_google_html, html, self.backend)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def parse(self, html: str) -> List[RawResult]:
+        """Parse a page in the pool and wait for its results."""
+        return self.submit(html).result()
+
+    async def parse_async(self, html: str) -> List[RawResult]:
+        """Parse a page in the pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        # Waiting for a free slot may block, so do it off the loop
+        future = await loop.run_in_executor(None, self.submit, html)
+        return await asyncio.wrap_future(future)
+
+    def close(self):
+        """Shut down the worker processes."""
+        self._executor.shutdown(wait=True)
@@ -7,25 +7,29 @@ from pathlib import Path
 from typing import List, Union
 import typer
 
+from utils.text import normalize_keyword
+
 
 def validate_keywords(keywords: List[str]) -> List[str]:
     """
-    Validate and clean keyword list.
+    Validate, clean and deduplicate keyword list.
     
     Args:
         keywords: List of raw keyword strings
         
     Returns:
-        List of cleaned, validated keywords
+        List of cleaned, validated keywords (first occurrence order)
         
     Raises:
         ValueError: If no valid keywords found
     """
     cleaned_keywords = []
+    seen = set()
+    duplicates = 0
     
     for keyword in keywords:
-        # Strip whitespace and convert to lowercase
-        clean_keyword = keyword.strip().lower()
+        # Collapse whitespace and convert to lowercase
+        clean_keyword = normalize_keyword(keyword)
         
         # Skip empty keywords
         if not clean_keyword:
@@ -34,9 +38,18 @@ def validate_keywords(keywords: List[str]) -> List[str]:
         # Skip keywords that are too short or too long
         if len(clean_keyword) < 2 or len(clean_keyword) > 100:
             continue
+        
+        # Skip repeats so each query is fetched once
+        if clean_keyword in seen:
+            duplicates += 1
+            continue
             
+        seen.add(clean_keyword)
         cleaned_keywords.append(clean_keyword)
     
+    if duplicates:
+        typer.echo(f"Removed {duplicates} duplicate keyword(s).")
+    
     if not cleaned_keywords:
         raise ValueError("No valid keywords found. Keywords must be 2-100 characters long.")
     
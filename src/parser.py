@@ -1,17 +1,131 @@
 """
 Domain extraction and competitor ranking logic.
 """
-from typing import List, Dict, Tuple
-from collections import Counter, defaultdict
-from urllib.parse import urlparse
+import os
+import heapq
+import shutil
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+from collections import defaultdict
+from functools import lru_cache
+from urllib.parse import urlsplit
+import numpy as np
 import tldextract
-import re
-from .serp import SerpResult
+from .serp import SerpResultBatch, SerpResults
+from .exclusions import ExclusionRules
+from .rank_matrix import RankMatrix
+from .scoring import LinearModel, ScoringModel
+
+SCORING_BACKENDS = ("python", "numpy")
+
+# Use tldextract's packaged public suffix list snapshot instead of a pinned file
+BUNDLED_SUFFIX_LIST = "bundled"
+DEFAULT_SUFFIX_LIST_PATH = "./data/public_suffix_list.dat"
+
+
+def _build_offline_extractor(suffix_list: str) -> tldextract.TLDExtract:
+    """
+    Build a network-free extractor.
+    
+    Args:
+        suffix_list: "bundled" for tldextract's packaged snapshot, or the
+            path of a pinned public_suffix_list.dat
+        
+    Returns:
+        TLDExtract instance with its suffix list already loaded
+        
+    Raises:
+        FileNotFoundError: If the pinned suffix list does not exist
+    """
+    if suffix_list == BUNDLED_SUFFIX_LIST:
+        extractor = tldextract.TLDExtract(
+            cache_dir=None, suffix_list_urls=(), fallback_to_snapshot=True
+        )
+    else:
+        path = Path(suffix_list).resolve()
+        if not path.is_file():
+            raise FileNotFoundError(f"Public suffix list not found: {path}")
+        
+        # A local file:// read; never falls back to a different list
+        extractor = tldextract.TLDExtract(
+            cache_dir=None, suffix_list_urls=(path.as_uri(),), fallback_to_snapshot=False
+        )
+    
+    # Parse the list now rather than on the first URL
+    extractor("example.com")
+    return extractor
+
+
+@lru_cache(maxsize=None)
+def get_offline_extractor(suffix_list: str = BUNDLED_SUFFIX_LIST) -> tldextract.TLDExtract:
+    """
+    Get the process-wide offline extractor for a suffix list.
+    
+    Args:
+        suffix_list: "bundled" or the path of a pinned public_suffix_list.dat
+        
+    Returns:
+        Shared TLDExtract instance, built on first use
+    """
+    return _build_offline_extractor(suffix_list)
+
+
+def refresh_suffix_list_snapshot(source: str, destination: str = None) -> int:
+    """
+    Replace the pinned public suffix list with a local copy.
+    
+    Args:
+        source: Path to a downloaded public_suffix_list.dat
+        destination: Pinned snapshot path (defaults to SUFFIX_LIST_PATH)
+        
+    Returns:
+        Number of suffix rules in the new snapshot
+        
+    Raises:
+        ValueError: If the source does not look like a public suffix list
+    """
+    source_path = Path(source)
+    if not source_path.is_file():
+        raise FileNotFoundError(f"Public suffix list not found: {source_path}")
+    
+    with open(source_path, 'r', encoding='utf-8') as f:
+        rules = [
+            line.strip() for line in f
+            if line.strip() and not line.lstrip().startswith('//')
+        ]
+    
+    # Validate with a fresh extractor before touching the pinned copy
+    if _build_offline_extractor(str(source_path))("example.com").suffix != "com":
+        raise ValueError(f"Not a usable public suffix list: {source_path}")
+    
+    destination_path = Path(destination or os.getenv('SUFFIX_LIST_PATH', DEFAULT_SUFFIX_LIST_PATH))
+    destination_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    temp_path = destination_path.with_suffix(destination_path.suffix + '.tmp')
+    shutil.copyfile(source_path, temp_path)
+    os.replace(temp_path, destination_path)
+    
+    get_offline_extractor.cache_clear()
+    return len(rules)
+
+
+def _url_rank_pairs(results: SerpResults):
+    """Iterate (url, rank) without materializing objects for columnar batches."""
+    if isinstance(results, SerpResultBatch):
+        return zip(results.urls, results.ranks)
+    return ((result.url, result.rank) for result in results)
+
+
+def _ranking_key(competitor) -> Tuple[float, int]:
+    """Ranking order: weighted score, then appearances (both descending)."""
+    return competitor.weighted_score, competitor.count
 
 
 class CompetitorResult:
     """Container for competitor analysis results."""
     
+    __slots__ = ('domain', 'count', 'weighted_score', 'keyword_appearances')
+    
     def __init__(self, domain: str, count: int, weighted_score: float):
         self.domain = domain
         self.count = count
@@ -26,8 +140,23 @@ class CompetitorResult:
 class DomainParser:
     """Main class for parsing domains and calculating competitor rankings."""
     
-    def __init__(self):
-        """Initialize domain parser with filtering rules."""
+    def __init__(
+        self,
+        domain_cache_size: int = 4096,
+        suffix_list: Optional[str] = None,
+        exclusions_file: Optional[str] = None,
+        scoring_model: Optional[ScoringModel] = None
+    ):
+        """
+        Initialize domain parser with filtering rules.
+        
+        Args:
+            domain_cache_size: Hosts whose root domain is memoized (LRU, 0 disables)
+            suffix_list: Offline public suffix list, "bundled" or a pinned file path
+                (None = tldextract defaults, which may fetch the list over the network)
+            exclusions_file: Extra exclusion rules, one domain or "regex:<pattern>" per line
+            scoring_model: Rank weighting model (None = linear)
+        """
         # Domains to exclude from competitor analysis
         self.excluded_domains = {
             'google.com', 'youtube.com', 'facebook.com', 'twitter.com',
@@ -43,6 +172,19 @@ class DomainParser:
             r'.*\.facebook\..*',
             r'.*\.amazon\..*'
         ]
+        
+        # Compiled once; lookups cost the same however many rules are loaded
+        self.exclusions = ExclusionRules(self.excluded_domains, self.excluded_patterns)
+        if exclusions_file:
+            self.exclusions.load(exclusions_file)
+        
+        self._extract = get_offline_extractor(suffix_list) if suffix_list else tldextract.extract
+        
+        # Hosts repeat across keywords, so memoize the public-suffix lookup per host
+        self._root_domain = lru_cache(maxsize=domain_cache_size)(self._lookup_root_domain)
+        
+        self.scoring_model = scoring_model or LinearModel()
+        self._weight_tables: Dict[int, List[float]] = {}
     
     def extract_domain(self, url: str) -> str:
         """
@@ -62,17 +204,44 @@ class DomainParser:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
             
-            # Use tldextract for accurate domain parsing
-            extracted = tldextract.extract(url)
+            # Lowercased host without credentials or port
+            host = urlsplit(url).hostname
+            if not host:
+                return ""
             
-            if extracted.domain and extracted.suffix:
-                return f"{extracted.domain}.{extracted.suffix}".lower()
-            
-            return ""
+            return self._root_domain(host)
             
         except Exception:
             return ""
     
+    def _lookup_root_domain(self, host: str) -> str:
+        """Resolve a host to its registrable domain via the public suffix list."""
+        # Use tldextract for accurate domain parsing
+        extracted = self._extract(host)
+        
+        if extracted.domain and extracted.suffix:
+            return f"{extracted.domain}.{extracted.suffix}".lower()
+        
+        return ""
+    
+    def domain_cache_stats(self) -> Dict:
+        """
+        Get hit/miss counters of the host -> domain memoization.
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate, size and maxsize
+        """
+        info = self._root_domain.cache_info()
+        lookups = info.hits + info.misses
+        
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+            'size': info.currsize,
+            'maxsize': info.maxsize
+        }
+    
     def is_valid_competitor(self, domain: str) -> bool:
         """
         Check if domain should be considered as a valid competitor.
@@ -86,15 +255,10 @@ class DomainParser:
         if not domain:
             return False
         
-        # Check excluded domains
-        if domain in self.excluded_domains:
+        # Check excluded domains and patterns
+        if self.exclusions.is_excluded(domain):
             return False
         
-        # Check excluded patterns
-        for pattern in self.excluded_patterns:
-            if re.match(pattern, domain):
-                return False
-        
         # Additional validation
         if len(domain) < 4:  # Too short
             return False
@@ -104,6 +268,21 @@ class DomainParser:
         
         return True
     
+    def weight_table(self, max_rank: int = 20) -> List[float]:
+        """
+        Rank -> weight lookup for the scoring model, built once per max_rank.
+        
+        Args:
+            max_rank: Maximum rank to consider
+            
+        Returns:
+            List indexed by rank, length max_rank + 1
+        """
+        table = self._weight_tables.get(max_rank)
+        if table is None:
+            table = self._weight_tables[max_rank] = self.scoring_model.weight_table(max_rank)
+        return table
+    
     def calculate_weighted_score(self, rank: int, max_rank: int = 20) -> float:
         """
         Calculate weighted score based on SERP rank.
@@ -114,46 +293,80 @@ class DomainParser:
             max_rank: Maximum rank to consider
             
         Returns:
-            Weighted score
+            Weighted score from the scoring model
         """
         if rank < 1 or rank > max_rank:
             return 0.0
         
-        return float(max_rank + 1 - rank)
+        return self.weight_table(max_rank)[rank]
     
     def parse_serp_results(
         self, 
-        serp_data: Dict[str, List[SerpResult]],
-        max_rank: int = 20
-    ) -> List[CompetitorResult]:
+        serp_data: Dict[str, SerpResults],
+        max_rank: int = 20,
+        backend: str = "python",
+        return_matrix: bool = False,
+        top_k: Optional[int] = None,
+        min_appearances: int = 1,
+        min_weighted_score: float = 0.0
+    ):
         """
         Parse SERP results and calculate competitor rankings.
         
+        With top_k set, the leaders are picked with a heap instead of sorting
+        every domain, and only they are built into CompetitorResult objects.
+        
         Args:
-            serp_data: Dictionary mapping keywords to SERP results
+            serp_data: Dictionary mapping keywords to SERP results (lists or SerpResultBatch)
             max_rank: Maximum rank to consider for weighting
+            backend: "python" or "numpy" (vectorized, identical results)
+            return_matrix: Also return the keyword x domain RankMatrix
+            top_k: Keep only this many competitors (None = all)
+            min_appearances: Minimum number of keyword appearances
+            min_weighted_score: Minimum weighted score
             
         Returns:
-            List of CompetitorResult objects sorted by weighted score
+            List of CompetitorResult objects sorted by weighted score, or a
+            (competitors, RankMatrix) tuple if return_matrix is set
         """
+        if backend == "numpy":
+            return self._parse_serp_results_numpy(
+                serp_data, max_rank, return_matrix, top_k, min_appearances, min_weighted_score
+            )
+        if backend != "python":
+            raise ValueError(f"Unknown scoring backend: {backend}")
+        
         domain_stats = defaultdict(lambda: {'count': 0, 'weighted_score': 0.0, 'keywords': {}})
+        weights = self.weight_table(max_rank)
         
         # Process each keyword's results
         for keyword, results in serp_data.items():
-            for result in results:
-                domain = self.extract_domain(result.url)
+            for url, rank in _url_rank_pairs(results):
+                domain = self.extract_domain(url)
                 
                 if not self.is_valid_competitor(domain):
                     continue
                 
                 # Update domain statistics
                 domain_stats[domain]['count'] += 1
-                domain_stats[domain]['weighted_score'] += self.calculate_weighted_score(result.rank, max_rank)
-                domain_stats[domain]['keywords'][keyword] = result.rank
+                domain_stats[domain]['weighted_score'] += weights[rank] if 0 < rank <= max_rank else 0.0
+                domain_stats[domain]['keywords'][keyword] = rank
+        
+        eligible = (
+            (domain, stats) for domain, stats in domain_stats.items()
+            if stats['count'] >= min_appearances and stats['weighted_score'] >= min_weighted_score
+        )
+        
+        # Sort by weighted score (descending), then by count
+        ranking_key = lambda item: (item[1]['weighted_score'], item[1]['count'])
+        if top_k is None:
+            ranked = sorted(eligible, key=ranking_key, reverse=True)
+        else:
+            ranked = heapq.nlargest(top_k, eligible, key=ranking_key)
         
         # Convert to CompetitorResult objects
         competitors = []
-        for domain, stats in domain_stats.items():
+        for domain, stats in ranked:
             competitor = CompetitorResult(
                 domain=domain,
                 count=stats['count'],
@@ -166,11 +379,144 @@ class DomainParser:
             
             competitors.append(competitor)
         
-        # Sort by weighted score (descending), then by count
-        competitors.sort(key=lambda x: (-x.weighted_score, -x.count))
+        if return_matrix:
+            return competitors, RankMatrix.from_competitors(competitors, list(serp_data))
+        return competitors
+    
+    def _parse_serp_results_numpy(
+        self,
+        serp_data: Dict[str, SerpResults],
+        max_rank: int,
+        return_matrix: bool = False,
+        top_k: Optional[int] = None,
+        min_appearances: int = 1,
+        min_weighted_score: float = 0.0
+    ):
+        """
+        Vectorized parse_serp_results producing identical CompetitorResult lists.
+        
+        Domains and keywords are encoded as integer codes in first-seen order,
+        so per-domain sums accumulate in the same order as the Python loop and
+        keyword codes ascend in first-appearance order.
+        """
+        domain_codes = {}
+        domain_column = []
+        keyword_column = []
+        rank_column = []
+        
+        for keyword_code, results in enumerate(serp_data.values()):
+            for url, rank in _url_rank_pairs(results):
+                domain = self.extract_domain(url)
+                domain_column.append(domain_codes.setdefault(domain, len(domain_codes)))
+                keyword_column.append(keyword_code)
+                rank_column.append(rank)
+        
+        domains = list(domain_codes)
+        
+        # Validate each distinct domain once, then drop rows of excluded ones
+        valid = np.array([self.is_valid_competitor(domain) for domain in domains], dtype=bool)
+        domain_ids = np.array(domain_column, dtype=np.int64)
+        row_mask = valid[domain_ids] if len(domains) else np.zeros(0, dtype=bool)
+        
+        domain_ids = domain_ids[row_mask]
+        if not len(domain_ids):
+            if return_matrix:
+                return [], RankMatrix.from_competitors([], list(serp_data))
+            return []
+        
+        keyword_ids = np.array(keyword_column, dtype=np.int64)[row_mask]
+        ranks = np.array(rank_column, dtype=np.int64)[row_mask]
+        
+        # Ranks outside 1..max_rank map to the table's unused 0.0 slot
+        weight_table = np.asarray(self.weight_table(max_rank), dtype=np.float64)
+        in_range = (ranks >= 1) & (ranks <= max_rank)
+        row_weights = weight_table[np.where(in_range, ranks, 0)]
+        
+        counts = np.bincount(domain_ids, minlength=len(domains))
+        scores = np.bincount(domain_ids, weights=row_weights, minlength=len(domains))
+        
+        # Last rank per (domain, keyword) wins; sorted pair keys group by domain,
+        # keywords in first-appearance order
+        pair_keys = domain_ids * len(serp_data) + keyword_ids
+        reversed_keys, reversed_first = np.unique(pair_keys[::-1], return_index=True)
+        last_ranks = ranks[::-1][reversed_first]
+        pair_domains = reversed_keys // len(serp_data)
+        pair_keywords = reversed_keys % len(serp_data)
+        
+        keywords = list(serp_data)
+        pair_keyword_names = [keywords[code] for code in pair_keywords.tolist()]
+        pair_ranks = last_ranks.tolist()
+        
+        present = np.flatnonzero(counts)
+        bounds = np.searchsorted(pair_domains, present).tolist() + [len(pair_domains)]
+        
+        order = self._rank_order(
+            counts[present], scores[present], top_k, min_appearances, min_weighted_score
+        ).tolist()
+        present_codes = present.tolist()
+        count_values = counts[present].tolist()
+        score_values = scores[present].tolist()
+        
+        competitors = []
+        for i in order:
+            competitor = CompetitorResult(
+                domain=domains[present_codes[i]],
+                count=count_values[i],
+                weighted_score=score_values[i]
+            )
+            competitor.keyword_appearances = dict(zip(
+                pair_keyword_names[bounds[i]:bounds[i + 1]],
+                pair_ranks[bounds[i]:bounds[i + 1]]
+            ))
+            competitors.append(competitor)
+        
+        if return_matrix:
+            # Reorder the domain-grouped pairs into competitor rows
+            bounds_array = np.array(bounds, dtype=np.int64)
+            row_starts = bounds_array[:-1][order]
+            row_lengths = np.diff(bounds_array)[order]
+            indptr = np.concatenate(([0], np.cumsum(row_lengths))).astype(np.int64)
+            pair_order = np.arange(indptr[-1]) + np.repeat(row_starts - indptr[:-1], row_lengths)
+            
+            matrix = RankMatrix(
+                [competitor.domain for competitor in competitors],
+                keywords,
+                indptr,
+                pair_keywords[pair_order].astype(np.int32),
+                last_ranks[pair_order].astype(np.int32)
+            )
+            return competitors, matrix
         
         return competitors
     
+    @staticmethod
+    def _rank_order(
+        counts: np.ndarray,
+        scores: np.ndarray,
+        top_k: Optional[int],
+        min_appearances: int,
+        min_weighted_score: float
+    ) -> np.ndarray:
+        """
+        Indices of the eligible domains in ranking order, at most top_k.
+        
+        For top_k, np.partition finds the k-th best score and only domains
+        scoring at least that much (ties included) are sorted.
+        """
+        candidates = np.flatnonzero((counts >= min_appearances) & (scores >= min_weighted_score))
+        
+        if top_k is not None:
+            if top_k <= 0:
+                return candidates[:0]
+            if top_k < len(candidates):
+                candidate_scores = scores[candidates]
+                threshold = np.partition(candidate_scores, len(candidates) - top_k)[len(candidates) - top_k]
+                candidates = candidates[candidate_scores >= threshold]
+        
+        # Stable sort by weighted score (descending), then by count
+        order = candidates[np.lexsort((-counts[candidates], -scores[candidates]))]
+        return order if top_k is None else order[:top_k]
+    
     def get_domain_summary(self, competitors: List[CompetitorResult]) -> Dict:
         """
         Generate summary statistics for competitor analysis.
@@ -205,7 +551,7 @@ class DomainParser:
         competitors: List[CompetitorResult],
         min_appearances: int = 1,
         min_weighted_score: float = 0.0,
-        max_results: int = 50
+        max_results: Optional[int] = 50
     ) -> List[CompetitorResult]:
         """
         Filter competitor results based on criteria.
@@ -214,24 +560,43 @@ class DomainParser:
             competitors: List of CompetitorResult objects
             min_appearances: Minimum number of keyword appearances
             min_weighted_score: Minimum weighted score
-            max_results: Maximum number of results to return
+            max_results: Maximum number of results to return (None = all)
             
         Returns:
-            Filtered list of competitors
+            Filtered list of competitors, best first
         """
-        filtered = [
+        eligible = (
             c for c in competitors
             if c.count >= min_appearances and c.weighted_score >= min_weighted_score
-        ]
+        )
         
-        return filtered[:max_results]
+        if max_results is None:
+            return sorted(eligible, key=_ranking_key, reverse=True)
+        
+        # Heap selection of the leaders, same order as a full sort
+        return heapq.nlargest(max_results, eligible, key=_ranking_key)
 
 
-def create_domain_parser() -> DomainParser:
+def create_domain_parser(
+    exclusions_file: Optional[str] = None,
+    scoring_model: Optional[ScoringModel] = None
+) -> DomainParser:
     """
-    Create DomainParser instance.
+    Create DomainParser with an offline public suffix list.
+    
+    Uses the pinned snapshot at SUFFIX_LIST_PATH when present, otherwise
+    the snapshot bundled with tldextract.
     
+    Args:
+        exclusions_file: Optional file of extra excluded domains and patterns
+        scoring_model: Rank weighting model (None = linear)
+        
     Returns:
         Configured DomainParser instance
     """
-    return DomainParser()
\ No newline at end of file
+    suffix_list = os.getenv('SUFFIX_LIST_PATH', DEFAULT_SUFFIX_LIST_PATH)
+    
+    if not Path(suffix_list).is_file():
+        suffix_list = BUNDLED_SUFFIX_LIST
+    
+    return DomainParser(suffix_list=suffix_list, exclusions_file=exclusions_file, scoring_model=scoring_model)
\ No newline at end of file
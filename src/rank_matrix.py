@@ -0,0 +1,167 @@
+"""
+Sparse keyword x domain rank matrix.
+"""
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+
+class RankMatrix:
+    """
+    CSR-style sparse matrix of SERP ranks, one row per competitor domain.
+
+    Row ``i`` holds the appearances of ``domains[i]``: ``indices`` are
+    positions in the interned ``keywords`` table and ``data`` the matching
+    ranks, in the keyword's first-appearance order. Memory is proportional
+    to the number of appearances, not domains x keywords.
+    """
+
+    def __init__(
+        self,
+        domains: List[str],
+        keywords: List[str],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray
+    ):
+        """
+        Initialize rank matrix from CSR arrays.
+
+        Args:
+            domains: Row index table (domain of each row)
+            keywords: Column index table (keyword of each column)
+            indptr: Row offsets into indices/data, length len(domains) + 1
+            indices: Keyword index of each appearance
+            data: SERP rank of each appearance
+        """
+        self.domains = domains
+        self.keywords = keywords
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.domain_index: Dict[str, int] = {domain: i for i, domain in enumerate(domains)}
+
+    @classmethod
+    def from_competitors(cls, competitors: Iterable, keywords: Sequence[str] = ()) -> "RankMatrix":
+        """
+        Build a matrix from CompetitorResult keyword appearances.
+
+        Args:
+            competitors: CompetitorResult objects, one row each
+            keywords: Keyword table order; unseen keywords are appended
+
+        Returns:
+            RankMatrix with rows in competitor order
+        """
+        keyword_index = {}
+        for keyword in keywords:
+            keyword_index.setdefault(keyword, len(keyword_index))
+
+        domains = []
+        indptr = [0]
+        indices = []
+        data = []
+
+        for competitor in competitors:
+            domains.append(competitor.domain)
+            for keyword, rank in competitor.keyword_appearances.items():
+                indices.append(keyword_index.setdefault(keyword, len(keyword_index)))
+                data.append(rank)
+            indptr.append(len(indices))
+
+        return cls(
+            domains,
+            list(keyword_index),
+            np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int32),
+            np.array(data, dtype=np.int32)
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.domains), len(self.keywords)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored appearances."""
+        return len(self.data)
+
+    def row_items(self, domain: str) -> Iterator[Tuple[str, int]]:
+        """
+        Iterate a domain's (keyword, rank) appearances.
+
+        Args:
+            domain: Row domain
+
+        Yields:
+            (keyword, rank) tuples in first-appearance order
+        """
+        row = self.domain_index[domain]
+        start, end = self.indptr[row], self.indptr[row + 1]
+        keywords = self.keywords
+
+        for keyword_idx, rank in zip(self.indices[start:end].tolist(), self.data[start:end].tolist()):
+            yield keywords[keyword_idx], rank
+
+    def column_mapper(self, keywords: Sequence[str]) -> "DenseRowBuilder":
+        """
+        Prepare dense rows aligned to an output keyword column order.
+
+        Args:
+            keywords: Output columns (keywords missing from the matrix stay empty)
+
+        Returns:
+            DenseRowBuilder for this matrix and column order
+        """
+        return DenseRowBuilder(self, keywords)
+
+
+class DenseRowBuilder:
+    """Expands matrix rows into per-keyword column lists for exporters."""
+
+    def __init__(self, matrix: RankMatrix, keywords: Sequence[str]):
+        self.matrix = matrix
+        self.width = len(keywords)
+
+        column_of = {}
+        # Repeated output keywords copy the first column's value
+        self._repeats = []
+        for column, keyword in enumerate(keywords):
+            first = column_of.setdefault(keyword, column)
+            if first != column:
+                self._repeats.append((first, column))
+
+        # Matrix keyword index -> output column, or -1 when not exported
+        self._columns = np.array(
+            [column_of.get(keyword, -1) for keyword in matrix.keywords], dtype=np.int64
+        )
+
+    def row(self, domain: str, fill="") -> list:
+        """
+        Dense keyword columns for one domain.
+
+        Args:
+            domain: Row domain
+            fill: Value for keywords the domain does not rank for
+
+        Returns:
+            List with one entry per output keyword; ranks below 1 are left as fill
+        """
+        values = [fill] * self.width
+        matrix = self.matrix
+
+        row = matrix.domain_index.get(domain)
+        if row is None:
+            return values
+
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        columns = self._columns[matrix.indices[start:end]].tolist()
+
+        for column, rank in zip(columns, matrix.data[start:end].tolist()):
+            if column >= 0 and rank > 0:
+                values[column] = rank
+
+        for first, column in self._repeats:
+            values[column] = values[first]
+
+        return values
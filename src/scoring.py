@@ -0,0 +1,219 @@
+"""
+Rank weighting models for competitor scoring.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+SCORING_MODELS = ("linear", "ctr", "decay")
+
+# Approximate organic click-through rate (%) by position, desktop, no SERP features
+ENGINE_CTR_CURVES: Dict[str, Sequence[float]] = {
+    "google": (
+        39.8, 18.7, 10.2, 7.2, 5.1, 4.4, 3.0, 2.1, 1.9, 1.6,
+        1.0, 0.9, 0.8, 0.7, 0.6, 0.55, 0.5, 0.45, 0.4, 0.35,
+    ),
+    "bing": (
+        33.0, 15.5, 9.9, 6.9, 5.0, 3.9, 3.1, 2.5, 2.1, 1.8,
+        1.1, 1.0, 0.9, 0.8, 0.7, 0.6, 0.55, 0.5, 0.45, 0.4,
+    ),
+}
+
+# Multipliers on organic CTR by position when a SERP feature is present
+SERP_FEATURE_ADJUSTMENTS: Dict[str, Dict[int, float]] = {
+    "ads": {1: 0.75, 2: 0.8, 3: 0.85, 4: 0.9},
+    "featured_snippet": {1: 0.7, 2: 0.85},
+    "people_also_ask": {2: 0.9, 3: 0.9, 4: 0.9, 5: 0.9},
+    "local_pack": {1: 0.8, 2: 0.8, 3: 0.8},
+    "shopping": {1: 0.8, 2: 0.85, 3: 0.9},
+}
+
+
+class ScoringModel:
+    """
+    Maps a SERP rank to the weight it adds to a competitor's score.
+
+    Subclasses implement ``weight``; callers use ``weight_table`` once per
+    run so scoring in the hot loop is a list lookup.
+    """
+
+    name = "base"
+
+    def __init__(self, serp_features: Iterable[str] = ()):
+        """
+        Initialize scoring model.
+
+        Args:
+            serp_features: SERP features assumed present on every keyword
+                (keys of SERP_FEATURE_ADJUSTMENTS)
+
+        Raises:
+            ValueError: If a feature is unknown
+        """
+        self.serp_features = tuple(serp_features)
+
+        for feature in self.serp_features:
+            if feature not in SERP_FEATURE_ADJUSTMENTS:
+                raise ValueError(
+                    f"Unknown SERP feature: {feature} (choose from {', '.join(SERP_FEATURE_ADJUSTMENTS)})"
+                )
+
+    def weight(self, rank: int, max_rank: int) -> float:
+        """Unadjusted weight of one rank between 1 and max_rank."""
+        raise NotImplementedError
+
+    def weight_table(self, max_rank: int) -> List[float]:
+        """
+        Precompute weights for every rank.
+
+        Args:
+            max_rank: Maximum rank to consider
+
+        Returns:
+            List indexed by rank (index 0 unused, 0.0), length max_rank + 1
+        """
+        table = [0.0] * (max_rank + 1)
+
+        for rank in range(1, max_rank + 1):
+            weight = self.weight(rank, max_rank)
+            for feature in self.serp_features:
+                weight *= SERP_FEATURE_ADJUSTMENTS[feature].get(rank, 1.0)
+            table[rank] = weight
+
+        return table
+
+    def describe(self) -> str:
+        """Short label for console output."""
+        if self.serp_features:
+            return f"{self.name} ({', '.join(self.serp_features)})"
+        return self.name
+
+
+class LinearModel(ScoringModel):
+    """Rank 1 scores max_rank, each position below scores one less."""
+
+    name = "linear"
+
+    def weight(self, rank: int, max_rank: int) -> float:
+        return float(max_rank + 1 - rank)
+
+
+class CtrCurveModel(ScoringModel):
+    """Expected clicks per 100 searches from a position CTR curve."""
+
+    name = "ctr"
+
+    def __init__(
+        self,
+        curve: Sequence[float] = ENGINE_CTR_CURVES["google"],
+        tail_decay: float = 0.9,
+        serp_features: Iterable[str] = ()
+    ):
+        """
+        Initialize CTR curve model.
+
+        Args:
+            curve: CTR (%) of positions 1..len(curve)
+            tail_decay: Factor applied per position past the end of the curve
+            serp_features: SERP features assumed present on every keyword
+        """
+        super().__init__(serp_features)
+        self.curve = tuple(curve)
+        self.tail_decay = tail_decay
+
+    def weight(self, rank: int, max_rank: int) -> float:
+        if rank <= len(self.curve):
+            return self.curve[rank - 1]
+        return self.curve[-1] * self.tail_decay ** (rank - len(self.curve))
+
+
+class ExponentialDecayModel(ScoringModel):
+    """Position-decay curve: top_weight * decay ** (rank - 1)."""
+
+    name = "decay"
+
+    def __init__(self, decay: float = 0.7, top_weight: float = 100.0, serp_features: Iterable[str] = ()):
+        """
+        Initialize exponential decay model.
+
+        Args:
+            decay: Weight ratio between consecutive positions (0 < decay <= 1)
+            top_weight: Weight of rank 1
+            serp_features: SERP features assumed present on every keyword
+        """
+        super().__init__(serp_features)
+
+        if not 0 < decay <= 1:
+            raise ValueError(f"decay must be in (0, 1], got {decay}")
+
+        self.decay = decay
+        self.top_weight = top_weight
+
+    def weight(self, rank: int, max_rank: int) -> float:
+        return self.top_weight * self.decay ** (rank - 1)
+
+
+def rescore_stored_competitors(
+    competitors: List[Dict],
+    model: ScoringModel,
+    max_rank: int
+) -> List[Dict]:
+    """
+    Re-rank stored competitor rows under another scoring model.
+
+    Uses the saved keyword appearances (one rank per keyword), so no SERP
+    needs fetching again.
+
+    Args:
+        competitors: Rows from CompetitorDatabase.get_competitors_by_run
+        model: Scoring model to apply
+        max_rank: Maximum rank the run was fetched with
+
+    Returns:
+        New competitor dicts sorted by the new weighted score, with
+        rank_position renumbered
+    """
+    weights = model.weight_table(max_rank)
+
+    rescored = []
+    for competitor in competitors:
+        score = sum(
+            weights[rank] for rank in competitor['keyword_appearances'].values() if 0 < rank <= max_rank
+        )
+        rescored.append(dict(competitor, weighted_score=score))
+
+    rescored.sort(key=lambda c: (-c['weighted_score'], -c['count']))
+    for position, competitor in enumerate(rescored, 1):
+        competitor['rank_position'] = position
+
+    return rescored
+
+
+def create_scoring_model(
+    name: str = "linear",
+    engine: str = "google",
+    serp_features: Optional[Iterable[str]] = None
+) -> ScoringModel:
+    """
+    Create a scoring model by name.
+
+    Args:
+        name: One of SCORING_MODELS
+        engine: Search engine, picks the CTR curve for the "ctr" model
+        serp_features: SERP features assumed present on every keyword
+
+    Returns:
+        Configured ScoringModel instance
+
+    Raises:
+        ValueError: If the model name or a feature is unknown
+    """
+    serp_features = tuple(serp_features or ())
+
+    if name == "linear":
+        return LinearModel(serp_features)
+    if name == "ctr":
+        curve = ENGINE_CTR_CURVES.get(engine.lower(), ENGINE_CTR_CURVES["google"])
+        return CtrCurveModel(curve, serp_features=serp_features)
+    if name == "decay":
+        return ExponentialDecayModel(serp_features=serp_features)
+
+    raise ValueError(f"Unknown scoring model: {name} (choose from {', '.join(SCORING_MODELS)})")
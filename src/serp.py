@@ -3,42 +3,158 @@ SERP (Search Engine Results Page) fetching module with SerpApi and fallback scra
 """
 import os
 import time
+import queue
 import random
-from typing import List, Dict, Optional
+import asyncio
+import threading
+from array import array
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from serpapi import GoogleSearch
 import typer
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 # Import shared utilities to eliminate duplication
-from utils.retry import retry_function
+from utils.retry import retry_function, retry_async
+from utils.rate_limit import RateLimiter, ThrottleStats, get_shared_bucket
+from utils.singleflight import SingleFlight, AsyncSingleFlight
+from utils.text import normalize_keyword
+from .cache import SerpCache
+from .fixtures import FixtureArchive
+from .html_parsers import HtmlParsePool, parse_google_html, resolve_backend
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Identical queries in flight anywhere in the process share one upstream call
+_inflight_requests = SingleFlight()
+_inflight_async_requests = AsyncSingleFlight()
 
 
 class SerpResult:
     """Container for a single search result."""
     
+    __slots__ = ('title', 'url', 'rank')
+    
     def __init__(self, title: str, url: str, rank: int):
         self.title = title
         self.url = url
         self.rank = rank
 
 
+class SerpResultBatch:
+    """
+    Columnar results for one keyword: parallel title/url/rank arrays.
+    
+    Holds no per-result objects; iterating or indexing materializes
+    SerpResult instances on demand for code that expects them.
+    """
+    
+    __slots__ = ('titles', 'urls', 'ranks')
+    
+    def __init__(self, titles: List[str] = None, urls: List[str] = None, ranks: Iterable[int] = ()):
+        self.titles = titles if titles is not None else []
+        self.urls = urls if urls is not None else []
+        self.ranks = array('i', ranks)
+    
+    @classmethod
+    def from_results(cls, results: Iterable[SerpResult]) -> "SerpResultBatch":
+        """Pack SerpResult objects into a batch."""
+        batch = cls()
+        for result in results:
+            batch.append(result.title, result.url, result.rank)
+        return batch
+    
+    def append(self, title: str, url: str, rank: int):
+        """Add one result."""
+        self.titles.append(title)
+        self.urls.append(url)
+        self.ranks.append(rank)
+    
+    def __len__(self) -> int:
+        return len(self.ranks)
+    
+    def __getitem__(self, index: int) -> SerpResult:
+        return SerpResult(self.titles[index], self.urls[index], self.ranks[index])
+    
+    def __iter__(self) -> Iterator[SerpResult]:
+        for title, url, rank in zip(self.titles, self.urls, self.ranks):
+            yield SerpResult(title, url, rank)
+
+
+SerpResults = Union[List[SerpResult], SerpResultBatch]
+
+
 class SerpFetcher:
     """Main class for fetching search engine results."""
     
-    def __init__(self, api_key: str = None, engine: str = "google"):
+    GOOGLE_SEARCH_URL = "https://www.google.com/search"
+    
+    def __init__(
+        self,
+        api_key: str = None,
+        engine: str = "google",
+        requests_per_second: float = 1.0,
+        burst: int = 1,
+        api_key_requests_per_second: float = None,
+        cache: Optional[SerpCache] = None,
+        locale: str = "en-US",
+        fixtures: Optional[FixtureArchive] = None,
+        html_parser: str = None,
+        parse_workers: int = 0,
+        columnar_results: bool = False
+    ):
         """
         Initialize SERP fetcher.
         
         Args:
             api_key: SerpApi API key (optional, falls back to scraping)
             engine: Search engine to use ("google" or "bing")
+            requests_per_second: Per-engine request budget shared process-wide
+            burst: Requests allowed back-to-back before throttling starts
+            api_key_requests_per_second: Per-API-key budget (defaults to requests_per_second)
+            cache: Optional persistent SERP response cache
+            locale: Result locale, sent as Accept-Language and part of the cache key
+            fixtures: Optional archive to record raw responses into or replay from
+            html_parser: HTML parser backend for scraped pages (None/"auto" = fastest installed)
+            parse_workers: Processes parsing scraped HTML off the fetch workers (0 = parse inline)
+            columnar_results: Return SerpResultBatch per keyword from fetch_multiple_keywords
         """
         self.api_key = api_key
         self.engine = engine.lower()
+        self.google_search_url = self.GOOGLE_SEARCH_URL
+        self.cache = cache
+        self.locale = locale
+        self.fixtures = fixtures
+        self.html_parser = resolve_backend(html_parser)
+        self.parse_workers = parse_workers
+        self.columnar_results = columnar_results
+        self._parse_pool: Optional[HtmlParsePool] = None
+        self._parse_pool_lock = threading.Lock()
         self.session = requests.Session()
         
+        # Token buckets are shared by every fetcher in the process
+        if api_key_requests_per_second is None:
+            api_key_requests_per_second = requests_per_second
+        
+        api_buckets = [get_shared_bucket("engine", f"serpapi:{self.engine}", requests_per_second, burst)]
+        if api_key:
+            api_buckets.append(get_shared_bucket("api_key", api_key, api_key_requests_per_second, burst))
+        
+        self.api_limiter = RateLimiter(api_buckets)
+        self.scrape_limiter = RateLimiter([
+            get_shared_bucket("engine", f"scrape:{self.engine}", requests_per_second, burst)
+        ])
+        self.throttle_stats = ThrottleStats()
+        self.saved_requests = 0
+        self._saved_lock = threading.Lock()
+        
         # Set user agent for web scraping fallback
         user_agents = [
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -48,7 +164,7 @@ class SerpFetcher:
         self.session.headers.update({
             'User-Agent': random.choice(user_agents),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Language': f"{locale},{locale.split('-')[0]};q=0.5",
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
@@ -71,6 +187,98 @@ class SerpFetcher:
         Returns:
             List of SerpResult objects
         """
+        results, shared = _inflight_requests.do(
+            self._request_key(keyword, num_results),
+            self._fetch_and_cache, keyword, num_results, max_retries
+        )
+        if shared:
+            self._record_saved_requests(1)
+        if isinstance(results, Future):
+            # Joined a run whose page is still in its parse pool
+            results = results.result()
+        
+        return list(results)
+    
+    def _request_key(self, keyword: str, num_results: int):
+        """Identity of a query for coalescing identical in-flight requests."""
+        return (self.engine, normalize_keyword(keyword), min(num_results, 20), self.locale)
+    
+    def _record_saved_requests(self, count: int):
+        """Count upstream requests avoided by deduplication or coalescing."""
+        with self._saved_lock:
+            self.saved_requests += count
+    
+    def _fetch_and_cache(
+        self,
+        keyword: str,
+        num_results: int,
+        max_retries: int,
+        parse_html: Callable = None
+    ) -> Union[List[SerpResult], Future]:
+        """Serve from the cache, otherwise fetch upstream and cache the result."""
+        cache_key, cached = self._cache_lookup(keyword, num_results)
+        if cached is not None:
+            return cached
+        
+        results = self._fetch_uncached(keyword, num_results, max_retries, parse_html)
+        if isinstance(results, Future):
+            return self._finish_parse(cache_key, results)
+        
+        self._cache_store(cache_key, results)
+        return results
+    
+    def _fetch_deferring_parse(
+        self,
+        keyword: str,
+        num_results: int,
+        max_retries: int = 3
+    ) -> Union[List[SerpResult], Future]:
+        """
+        Fetch a keyword without waiting for its page to be parsed.
+        
+        Identical in-flight requests are coalesced as in fetch_serp_results.
+        Scraped HTML is handed to the parse pool and a future of the results
+        is returned at once, so the fetch worker moves on to its next request;
+        it only blocks while every pool slot is taken. Cached and SerpApi
+        results come back as lists.
+        """
+        results, shared = _inflight_requests.do(
+            self._request_key(keyword, num_results),
+            self._fetch_and_cache, keyword, num_results, max_retries, self._get_parse_pool().submit
+        )
+        if shared:
+            self._record_saved_requests(1)
+        
+        return results
+    
+    def _finish_parse(self, cache_key: Optional[str], parsing: Future) -> Future:
+        """Future of the results of a page parsed in the pool, cached once built."""
+        results = Future()
+        
+        def _build(done: Future):
+            try:
+                built = [SerpResult(title, url, rank) for title, url, rank in done.result()]
+                self._cache_store(cache_key, built)
+                results.set_result(built)
+            except BaseException as e:
+                results.set_exception(e)
+        
+        parsing.add_done_callback(_build)
+        return results
+    
+    def _fetch_uncached(
+        self,
+        keyword: str,
+        num_results: int,
+        max_retries: int,
+        parse_html: Callable = None
+    ) -> List[SerpResult]:
+        """Fetch results from the API, falling back to scraping."""
+        if self.fixtures is not None and self.fixtures.replaying:
+            if self.fixtures.latency > 0:
+                time.sleep(self.fixtures.latency)
+            return self._replay_fixture(keyword, num_results, parse_html)
+        
         # Try API first if available
         if self.api_key:
             try:
@@ -80,7 +288,125 @@ class SerpFetcher:
                 typer.echo("Falling back to web scraping...")
         
         # Fallback to web scraping
-        return self._fetch_with_scraping(keyword, num_results, max_retries)
+        return self._fetch_with_scraping(keyword, num_results, max_retries, parse_html)
+    
+    def _lookup_fixture(self, keyword: str, num_results: int):
+        """Return (kind, payload) of the recorded response, preferring SerpApi JSON."""
+        key = self._request_key(keyword, num_results)
+        
+        for kind in ("api", "html"):
+            payload = self.fixtures.lookup(kind, key)
+            if payload is not None:
+                return kind, payload
+        
+        typer.echo(f"No recorded fixture for '{keyword}'")
+        return None, None
+    
+    def _replay_fixture(self, keyword: str, num_results: int, parse_html: Callable = None) -> List[SerpResult]:
+        """Parse a recorded SerpApi or HTML response instead of fetching."""
+        kind, payload = self._lookup_fixture(keyword, num_results)
+        
+        if kind == "api":
+            return self._parse_api_results(payload)
+        if kind == "html":
+            return (parse_html or self._parse_google_html)(payload)
+        return []
+    
+    def _record_fixture(self, kind: str, keyword: str, num_results: int, payload):
+        """Append a raw upstream response to the fixture archive when recording."""
+        if self.fixtures is not None and self.fixtures.recording:
+            self.fixtures.record(kind, self._request_key(keyword, num_results), payload)
+    
+    def _cache_lookup(self, keyword: str, num_results: int):
+        """Return (cache key, cached results or None) for a request."""
+        if self.cache is None:
+            return None, None
+        
+        cache_key = self.cache.make_key(*self._request_key(keyword, num_results))
+        cached = self.cache.get(cache_key)
+        
+        if cached is None:
+            return cache_key, None
+        return cache_key, [SerpResult(title, url, rank) for title, url, rank in cached]
+    
+    def _cache_store(self, cache_key: Optional[str], results: List[SerpResult]):
+        """Store non-empty results; empty lists usually mean a failed fetch."""
+        if self.cache is None or not results:
+            return
+        
+        self.cache.set(cache_key, [(r.title, r.url, r.rank) for r in results])
+    
+    def _unique_queries(self, keywords: List[str]) -> Dict[str, str]:
+        """
+        Map each keyword to the first keyword with the same normalized query.
+        
+        Only the mapped-to keywords need fetching; the rest reuse their results.
+        """
+        first_by_query = {}
+        leaders = {}
+        
+        for keyword in keywords:
+            query = self._request_key(keyword, 0)
+            leaders[keyword] = first_by_query.setdefault(query, keyword)
+        
+        return leaders
+    
+    def _start_run(self, keywords: List[str]) -> Dict[str, str]:
+        """Reset per-run counters and return the keyword -> leader mapping."""
+        self.throttle_stats.reset()
+        leaders = self._unique_queries(keywords)
+        
+        with self._saved_lock:
+            self.saved_requests = len(keywords) - len(set(leaders.values()))
+        
+        return leaders
+    
+    def _report_run_stats(self):
+        """Echo rate-limit, coalescing and cache counters for the finished run."""
+        typer.echo(f"Rate limiting: {self.throttle_stats.summary()}")
+        
+        if self.saved_requests:
+            typer.echo(f"Deduplication: {self.saved_requests} duplicate requests saved")
+        
+        if self.cache is not None:
+            stats = self.cache.stats()
+            typer.echo(
+                f"Cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%} hit rate)"
+            )
+    
+    def _throttled(self, limiter: RateLimiter, request, *args):
+        """Run one upstream request after acquiring its rate-limit tokens."""
+        throttled = limiter.acquire()
+        start = time.monotonic()
+        try:
+            return request(*args)
+        finally:
+            self.throttle_stats.record(throttled, time.monotonic() - start)
+    
+    def _get_api_response(self, keyword: str, num_results: int) -> Dict:
+        """Request raw SerpApi JSON for a keyword."""
+        search_params = {
+            "engine": self.engine,
+            "q": keyword,
+            "api_key": self.api_key,
+            "num": min(num_results, 20)
+        }
+        
+        if self.engine == "google":
+            search_params["pws"] = "0"  # Disable personalization
+        
+        search = GoogleSearch(search_params)
+        return search.get_dict()
+    
+    def _get_html_response(self, keyword: str, num_results: int) -> str:
+        """Request raw Google results HTML for a keyword."""
+        url = f"{self.google_search_url}?q={requests.utils.quote(keyword)}&num={min(num_results, 20)}&pws=0"
+        
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        
+        return response.text
     
     def _fetch_with_api(
         self, 
@@ -90,19 +416,8 @@ class SerpFetcher:
     ) -> List[SerpResult]:
         """Fetch results using SerpApi with shared retry logic."""
         def _api_call():
-            search_params = {
-                "engine": self.engine,
-                "q": keyword,
-                "api_key": self.api_key,
-                "num": min(num_results, 20)
-            }
-            
-            if self.engine == "google":
-                search_params["pws"] = "0"  # Disable personalization
-            
-            search = GoogleSearch(search_params)
-            results = search.get_dict()
-            
+            results = self._throttled(self.api_limiter, self._get_api_response, keyword, num_results)
+            self._record_fixture("api", keyword, num_results, results)
             return self._parse_api_results(results)
         
         try:
@@ -114,20 +429,19 @@ class SerpFetcher:
         self, 
         keyword: str, 
         num_results: int,
-        max_retries: int
+        max_retries: int,
+        parse_html: Callable = None
     ) -> List[SerpResult]:
         """Fetch results using web scraping with shared retry logic."""
         if self.engine != "google":
             raise NotImplementedError("Web scraping only supports Google currently")
         
+        parse_html = parse_html or self._parse_google_html
+        
         def _scrape_call():
-            # Google search URL
-            url = f"https://www.google.com/search?q={requests.utils.quote(keyword)}&num={min(num_results, 20)}&pws=0"
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            return self._parse_google_html(response.text)
+            html = self._throttled(self.scrape_limiter, self._get_html_response, keyword, num_results)
+            self._record_fixture("html", keyword, num_results, html)
+            return parse_html(html)
         
         try:
             return retry_function(_scrape_call, max_retries=max_retries, base_delay=2.0)
@@ -151,52 +465,118 @@ class SerpFetcher:
         return serp_results
     
     def _parse_google_html(self, html: str) -> List[SerpResult]:
-        """Parse Google search results HTML."""
-        soup = BeautifulSoup(html, 'html.parser')
-        serp_results = []
-        
-        # Find search result containers
-        result_containers = soup.find_all('div', class_='g')
-        
-        for i, container in enumerate(result_containers, 1):
-            # Find title and link
-            title_elem = container.find('h3')
-            link_elem = container.find('a')
-            
-            if title_elem and link_elem:
-                title = title_elem.get_text(strip=True)
-                link = link_elem.get('href', '')
-                
-                # Clean up Google redirect URLs
-                if link.startswith('/url?q='):
-                    link = link.split('/url?q=')[1].split('&')[0]
-                
-                if title and link and not link.startswith('#'):
-                    serp_results.append(SerpResult(title, link, i))
+        """Parse Google search results HTML with the configured backend."""
+        if self.parse_workers > 0:
+            parsed = self._get_parse_pool().parse(html)
+        else:
+            parsed = parse_google_html(html, self.html_parser)
         
-        return serp_results
+        return [SerpResult(title, url, rank) for title, url, rank in parsed]
+    
+    def _get_parse_pool(self) -> HtmlParsePool:
+        """Start the HTML parse process pool on first use."""
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                self._parse_pool = HtmlParsePool(self.parse_workers, self.html_parser)
+            return self._parse_pool
+    
+    def close(self):
+        """Shut down the HTML parse process pool, if one was started."""
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.close()
+                self._parse_pool = None
+    
+    def _collect(self, results: List[SerpResult]) -> SerpResults:
+        """Keep a keyword's results as fetched, or pack them into a columnar batch."""
+        if self.columnar_results:
+            return SerpResultBatch.from_results(results)
+        return results
+    
+    def _results_for(self, results: SerpResults) -> SerpResults:
+        """Per-keyword copy of shared results; batches are shared as-is."""
+        if isinstance(results, SerpResultBatch):
+            return results
+        return list(results)
     
     def fetch_multiple_keywords(
         self, 
         keywords: List[str], 
-        num_results: int = 20
-    ) -> Dict[str, List[SerpResult]]:
+        num_results: int = 20,
+        concurrency: int = 1
+    ) -> Dict[str, SerpResults]:
         """
         Fetch SERP results for multiple keywords.
         
         Args:
             keywords: List of keywords to search
             num_results: Number of results per keyword
+            concurrency: Number of keywords fetched in parallel (1 = sequential)
             
         Returns:
-            Dictionary mapping keywords to their SERP results
+            Dictionary mapping keywords to their SERP results (SerpResultBatch
+            values when columnar_results is set)
+        """
+        fetched = dict(self.iter_keyword_results(keywords, num_results, concurrency))
+        return {keyword: fetched[keyword] for keyword in keywords}
+    
+    def iter_keyword_results(
+        self,
+        keywords: List[str],
+        num_results: int = 20,
+        concurrency: int = 1,
+        show_progress: bool = True
+    ) -> Iterator[Tuple[str, SerpResults]]:
+        """
+        Stream SERP results keyword by keyword as fetches complete.
+        
+        Duplicate queries are fetched once and yielded for every keyword
+        that maps to them. Nothing is retained after a keyword is yielded.
+        
+        Args:
+            keywords: List of keywords to search
+            num_results: Number of results per keyword
+            concurrency: Number of keywords fetched in parallel (1 = sequential)
+            show_progress: Show the transient progress spinner
+            
+        Yields:
+            (keyword, results) tuples in completion order
         """
-        results = {}
+        leaders = self._start_run(keywords)
+        followers = defaultdict(list)
+        for keyword, leader in leaders.items():
+            followers[leader].append(keyword)
+        
+        if self.parse_workers > 0:
+            # Fork parser processes before any fetch thread starts
+            self._get_parse_pool()
         
+        try:
+            if concurrency > 1:
+                stream = self._fetch_concurrently(list(followers), num_results, concurrency, show_progress)
+            else:
+                stream = self._fetch_sequentially(list(followers), num_results, show_progress)
+            
+            for leader, results in stream:
+                for keyword in followers[leader]:
+                    yield keyword, self._results_for(results)
+        finally:
+            self.close()
+        
+        self._report_run_stats()
+    
+    def _fetch_sequentially(
+        self,
+        keywords: List[str],
+        num_results: int,
+        show_progress: bool = True
+    ) -> Iterator[Tuple[str, SerpResults]]:
+        """Fetch keywords one after another, paced by the token buckets."""
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             transient=True,
+            disable=not show_progress,
         ) as progress:
             
             task = progress.add_task("Fetching SERP results...", total=len(keywords))
@@ -205,32 +585,472 @@ class SerpFetcher:
                 progress.update(task, description=f"Fetching: {keyword}")
                 
                 try:
-                    keyword_results = self.fetch_serp_results(keyword, num_results)
-                    results[keyword] = keyword_results
-                    
+                    keyword_results = self._collect(self.fetch_serp_results(keyword, num_results))
                     typer.echo(f"✓ {keyword}: {len(keyword_results)} results")
                     
-                    # Rate limiting - small delay between requests
-                    if len(keywords) > 1:
-                        time.sleep(random.uniform(0.5, 1.5))
+                except Exception as e:
+                    typer.echo(f"✗ {keyword}: Failed - {str(e)}")
+                    keyword_results = self._collect([])
+                
+                yield keyword, keyword_results
+                progress.advance(task)
+    
+    def _fetch_concurrently(
+        self,
+        keywords: List[str],
+        num_results: int,
+        concurrency: int,
+        show_progress: bool = True
+    ) -> Iterator[Tuple[str, SerpResults]]:
+        """
+        Fetch keywords on a worker pool paced by the shared token buckets.
+        
+        With parse workers, a worker hands its page to the parse pool and
+        takes the next keyword; fetches and parses are both collected from
+        one completion queue, in the order they finish.
+        """
+        # Let every worker hold its own keep-alive connection
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+            disable=not show_progress,
+        ) as progress, ThreadPoolExecutor(max_workers=concurrency) as executor:
+            
+            task = progress.add_task(
+                f"Fetching SERP results ({concurrency} workers)...", total=len(keywords)
+            )
+            
+            fetch = self._fetch_deferring_parse if self.parse_workers > 0 else self.fetch_serp_results
+            completed = queue.SimpleQueue()
+            futures = {}
+            parsing = {}
+            
+            for keyword in keywords:
+                future = executor.submit(fetch, keyword, num_results)
+                futures[future] = keyword
+                future.add_done_callback(completed.put)
+            
+            while futures or parsing:
+                future = completed.get()
+                
+                try:
+                    if future in parsing:
+                        keyword = parsing.pop(future)
+                        keyword_results = self._collect(future.result())
+                    else:
+                        # Drop the future so its results are freed once consumed
+                        keyword = futures.pop(future)
+                        fetched = future.result()
                         
+                        if isinstance(fetched, Future):
+                            # Still parsing; collect it when the pool finishes
+                            parsing[fetched] = keyword
+                            fetched.add_done_callback(completed.put)
+                            continue
+                        keyword_results = self._collect(fetched)
+                    
+                    typer.echo(f"✓ {keyword}: {len(keyword_results)} results")
                 except Exception as e:
                     typer.echo(f"✗ {keyword}: Failed - {str(e)}")
-                    results[keyword] = []
+                    keyword_results = self._collect([])
                 
+                yield keyword, keyword_results
                 progress.advance(task)
+
+
+class AsyncSerpFetcher(SerpFetcher):
+    """
+    asyncio-native SERP fetcher multiplexing many requests on one event loop.
+    
+    Parsing is inherited from SerpFetcher so results are identical to the
+    blocking fetcher; only the transport differs. The coroutine entry points
+    carry an _async suffix, leaving the inherited blocking methods intact.
+    """
+    
+    SERPAPI_SEARCH_URL = "https://serpapi.com/search"
+    
+    def __init__(
+        self,
+        api_key: str = None,
+        engine: str = "google",
+        requests_per_second: float = 1.0,
+        burst: int = 1,
+        api_key_requests_per_second: float = None,
+        cache: Optional[SerpCache] = None,
+        locale: str = "en-US",
+        fixtures: Optional[FixtureArchive] = None,
+        html_parser: str = None,
+        parse_workers: int = 0,
+        columnar_results: bool = False,
+        max_in_flight: int = 100
+    ):
+        """
+        Initialize async SERP fetcher.
         
+        Args:
+            api_key: SerpApi API key (optional, falls back to scraping)
+            engine: Search engine to use ("google" or "bing")
+            requests_per_second: Per-engine request budget shared process-wide
+            burst: Requests allowed back-to-back before throttling starts
+            api_key_requests_per_second: Per-API-key budget (defaults to requests_per_second)
+            cache: Optional persistent SERP response cache
+            locale: Result locale, sent as Accept-Language and part of the cache key
+            fixtures: Optional archive to record raw responses into or replay from
+            html_parser: HTML parser backend for scraped pages (None/"auto" = fastest installed)
+            parse_workers: Processes parsing scraped HTML off the event loop (0 = parse inline)
+            columnar_results: Return SerpResultBatch per keyword from fetch_multiple_keywords_async
+            max_in_flight: Maximum concurrent requests per engine
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("Async fetching not available. Install aiohttp.")
+        
+        super().__init__(
+            api_key=api_key,
+            engine=engine,
+            requests_per_second=requests_per_second,
+            burst=burst,
+            api_key_requests_per_second=api_key_requests_per_second,
+            cache=cache,
+            locale=locale,
+            fixtures=fixtures,
+            html_parser=html_parser,
+            parse_workers=parse_workers,
+            columnar_results=columnar_results
+        )
+        self.serpapi_search_url = self.SERPAPI_SEARCH_URL
+        self.max_in_flight = max_in_flight
+        self._semaphores: Dict[str, asyncio.BoundedSemaphore] = {}
+        self._client: Optional["aiohttp.ClientSession"] = None
+    
+    async def __aenter__(self) -> "AsyncSerpFetcher":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the underlying HTTP client session and the parse pool."""
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+        # Semaphores are bound to the loop that first used them
+        self._semaphores = {}
+        self.close()
+    
+    def _get_client(self) -> "aiohttp.ClientSession":
+        """Create the shared client session lazily inside the running loop."""
+        if self._client is None or self._client.closed:
+            self._client = aiohttp.ClientSession(
+                headers=dict(self.session.headers),
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._client
+    
+    def _get_semaphore(self, engine: str) -> asyncio.BoundedSemaphore:
+        """Get the bounded semaphore limiting in-flight requests per engine."""
+        if engine not in self._semaphores:
+            self._semaphores[engine] = asyncio.BoundedSemaphore(self.max_in_flight)
+        return self._semaphores[engine]
+    
+    async def _throttled_async(self, limiter: RateLimiter, request, *args):
+        """Await one upstream request after acquiring its rate-limit tokens."""
+        throttled = await limiter.acquire_async()
+        start = time.monotonic()
+        try:
+            async with self._get_semaphore(self.engine):
+                return await request(*args)
+        finally:
+            self.throttle_stats.record(throttled, time.monotonic() - start)
+    
+    async def _get_json_async(self, url: str, params: Dict) -> Dict:
+        """GET a URL and decode its JSON body."""
+        async with self._get_client().get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    
+    async def _get_text_async(self, url: str, params: Dict) -> str:
+        """GET a URL and return its text body."""
+        async with self._get_client().get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.text()
+    
+    async def _parse_google_html_async(self, html: str) -> List[SerpResult]:
+        """Parse Google HTML in the process pool, or inline without one."""
+        if self.parse_workers <= 0:
+            return self._parse_google_html(html)
+        
+        parsed = await self._get_parse_pool().parse_async(html)
+        return [SerpResult(title, url, rank) for title, url, rank in parsed]
+    
+    async def fetch_serp_results_async(
+        self,
+        keyword: str,
+        num_results: int = 20,
+        max_retries: int = 3
+    ) -> List[SerpResult]:
+        """
+        Fetch SERP results for a keyword without blocking the event loop.
+        
+        Args:
+            keyword: Search keyword
+            num_results: Number of results to fetch (max 20)
+            max_retries: Maximum retry attempts
+            
+        Returns:
+            List of SerpResult objects
+        """
+        results, shared = await _inflight_async_requests.do(
+            self._request_key(keyword, num_results),
+            self._fetch_and_cache_async, keyword, num_results, max_retries
+        )
+        if shared:
+            self._record_saved_requests(1)
+        
+        return list(results)
+    
+    async def _fetch_and_cache_async(
+        self,
+        keyword: str,
+        num_results: int,
+        max_retries: int
+    ) -> List[SerpResult]:
+        """Serve from the cache, otherwise fetch upstream and cache the result."""
+        cache_key, cached = self._cache_lookup(keyword, num_results)
+        if cached is not None:
+            return cached
+        
+        results = await self._fetch_uncached_async(keyword, num_results, max_retries)
+        self._cache_store(cache_key, results)
         return results
+    
+    async def _fetch_uncached_async(
+        self,
+        keyword: str,
+        num_results: int,
+        max_retries: int
+    ) -> List[SerpResult]:
+        """Fetch results from the API, falling back to scraping."""
+        if self.fixtures is not None and self.fixtures.replaying:
+            if self.fixtures.latency > 0:
+                await asyncio.sleep(self.fixtures.latency)
+            
+            kind, payload = self._lookup_fixture(keyword, num_results)
+            if kind == "api":
+                return self._parse_api_results(payload)
+            if kind == "html":
+                return await self._parse_google_html_async(payload)
+            return []
+        
+        # Try API first if available
+        if self.api_key:
+            try:
+                return await self._fetch_with_api_async(keyword, num_results, max_retries)
+            except Exception as e:
+                typer.echo(f"API fetch failed for '{keyword}': {e}")
+                typer.echo("Falling back to web scraping...")
+        
+        # Fallback to web scraping
+        return await self._fetch_with_scraping_async(keyword, num_results, max_retries)
+    
+    async def _fetch_with_api_async(
+        self,
+        keyword: str,
+        num_results: int,
+        max_retries: int
+    ) -> List[SerpResult]:
+        """Fetch results from the SerpApi JSON endpoint."""
+        params = {
+            "engine": self.engine,
+            "q": keyword,
+            "api_key": self.api_key,
+            "num": str(min(num_results, 20)),
+            "output": "json"
+        }
+        
+        if self.engine == "google":
+            params["pws"] = "0"  # Disable personalization
+        
+        async def _api_call():
+            results = await self._throttled_async(
+                self.api_limiter, self._get_json_async, self.serpapi_search_url, params
+            )
+            self._record_fixture("api", keyword, num_results, results)
+            return self._parse_api_results(results)
+        
+        try:
+            return await retry_async(_api_call, max_retries=max_retries)
+        except Exception:
+            return []
+    
+    async def _fetch_with_scraping_async(
+        self,
+        keyword: str,
+        num_results: int,
+        max_retries: int
+    ) -> List[SerpResult]:
+        """Fetch results by scraping the Google results page."""
+        if self.engine != "google":
+            raise NotImplementedError("Web scraping only supports Google currently")
+        
+        params = {"q": keyword, "num": str(min(num_results, 20)), "pws": "0"}
+        
+        async def _scrape_call():
+            html = await self._throttled_async(
+                self.scrape_limiter, self._get_text_async, self.google_search_url, params
+            )
+            self._record_fixture("html", keyword, num_results, html)
+            return await self._parse_google_html_async(html)
+        
+        try:
+            return await retry_async(_scrape_call, max_retries=max_retries, base_delay=2.0)
+        except Exception:
+            return []
+    
+    async def fetch_multiple_keywords_async(
+        self,
+        keywords: List[str],
+        num_results: int = 20
+    ) -> Dict[str, SerpResults]:
+        """
+        Fetch SERP results for multiple keywords concurrently.
+        
+        Args:
+            keywords: List of keywords to search
+            num_results: Number of results per keyword
+            
+        Returns:
+            Dictionary mapping keywords to their SERP results (SerpResultBatch
+            values when columnar_results is set)
+        """
+        fetched = {}
+        async for keyword, results in self.iter_keyword_results_async(keywords, num_results):
+            fetched[keyword] = results
+        return {keyword: fetched[keyword] for keyword in keywords}
+    
+    async def iter_keyword_results_async(
+        self,
+        keywords: List[str],
+        num_results: int = 20
+    ) -> AsyncIterator[Tuple[str, SerpResults]]:
+        """
+        Stream SERP results keyword by keyword as fetches complete.
+        
+        Args:
+            keywords: List of keywords to search
+            num_results: Number of results per keyword
+            
+        Yields:
+            (keyword, results) tuples in completion order
+        """
+        leaders = self._start_run(keywords)
+        followers = defaultdict(list)
+        for keyword, leader in leaders.items():
+            followers[leader].append(keyword)
+        
+        if self.parse_workers > 0:
+            self._get_parse_pool()
+        
+        async def _fetch_one(keyword: str):
+            try:
+                results = self._collect(await self.fetch_serp_results_async(keyword, num_results))
+                typer.echo(f"✓ {keyword}: {len(results)} results")
+            except Exception as e:
+                typer.echo(f"✗ {keyword}: Failed - {str(e)}")
+                results = self._collect([])
+            return keyword, results
+        
+        tasks = [asyncio.ensure_future(_fetch_one(keyword)) for keyword in followers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                leader, results = await next_done
+                for keyword in followers[leader]:
+                    yield keyword, self._results_for(results)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.aclose()
+        
+        self._report_run_stats()
 
 
-def create_serp_fetcher() -> SerpFetcher:
+def create_serp_fetcher(
+    requests_per_second: float = 1.0,
+    burst: int = 1,
+    cache: Optional[SerpCache] = None,
+    fixtures: Optional[FixtureArchive] = None,
+    parse_workers: int = 0,
+    columnar_results: bool = False
+) -> SerpFetcher:
     """
     Create SerpFetcher with API key from environment.
     
+    Args:
+        requests_per_second: Per-engine request budget
+        burst: Requests allowed back-to-back before throttling starts
+        cache: Optional persistent SERP response cache
+        fixtures: Optional archive to record raw responses into or replay from
+        parse_workers: Processes parsing scraped HTML (0 = parse inline)
+        columnar_results: Return SerpResultBatch per keyword from fetch_multiple_keywords
+        
     Returns:
         Configured SerpFetcher instance
     """
     api_key = os.getenv('SERPAPI_KEY')
     engine = os.getenv('SEARCH_ENGINE', 'google')
     
-    return SerpFetcher(api_key=api_key, engine=engine)
\ No newline at end of file
+    return SerpFetcher(
+        api_key=api_key,
+        engine=engine,
+        requests_per_second=requests_per_second,
+        burst=burst,
+        cache=cache,
+        fixtures=fixtures,
+        parse_workers=parse_workers,
+        columnar_results=columnar_results
+    )
+
+
+def create_async_serp_fetcher(
+    requests_per_second: float = 1.0,
+    burst: int = 1,
+    cache: Optional[SerpCache] = None,
+    fixtures: Optional[FixtureArchive] = None,
+    parse_workers: int = 0,
+    columnar_results: bool = False,
+    max_in_flight: int = 100
+) -> AsyncSerpFetcher:
+    """
+    Create AsyncSerpFetcher with API key from environment.
+    
+    Args:
+        requests_per_second: Per-engine request budget
+        burst: Requests allowed back-to-back before throttling starts
+        cache: Optional persistent SERP response cache
+        fixtures: Optional archive to record raw responses into or replay from
+        parse_workers: Processes parsing scraped HTML (0 = parse inline)
+        columnar_results: Return SerpResultBatch per keyword from fetch_multiple_keywords_async
+        max_in_flight: Maximum concurrent requests per engine
+        
+    Returns:
+        Configured AsyncSerpFetcher instance
+    """
+    api_key = os.getenv('SERPAPI_KEY')
+    engine = os.getenv('SEARCH_ENGINE', 'google')
+    
+    return AsyncSerpFetcher(
+        api_key=api_key,
+        engine=engine,
+        requests_per_second=requests_per_second,
+        burst=burst,
+        cache=cache,
+        fixtures=fixtures,
+        parse_workers=parse_workers,
+        columnar_results=columnar_results,
+        max_in_flight=max_in_flight
+    )
\ No newline at end of file
@@ -9,11 +9,13 @@ from .retry import retry_with_backoff
 from .text import truncate_string
 from .error_handling import handle_error_and_exit
 from .console import print_success, print_error
+from .rate_limit import RateLimiter
 
 __all__ = [
     'retry_with_backoff',
     'truncate_string', 
     'handle_error_and_exit',
     'print_success',
-    'print_error'
+    'print_error',
+    'RateLimiter'
 ]
\ No newline at end of file
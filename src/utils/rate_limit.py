@@ -0,0 +1,162 @@
+"""
+Shared rate limiting utilities
+=============================
+
+Token-bucket request budgets shared by SERP fetch workers, threads and tasks.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Dict, List, Tuple
+
+
+class TokenBucket:
+    """
+    Thread-safe and asyncio-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Callers
+    reserve a token up front (the balance may go negative) and then wait out
+    the deficit, so concurrent callers are served in arrival order without
+    holding the lock while sleeping.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Sustained requests per second (<= 0 disables limiting)
+            burst: Maximum number of requests allowed back-to-back
+        """
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate: float, burst: int = 1):
+        """Update the budget, starting from a full bucket."""
+        with self._lock:
+            self.rate = rate
+            self.burst = max(burst, 1)
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        with self._lock:
+            # Read under the lock so a concurrent configure() is seen whole
+            if self.rate <= 0:
+                return 0.0
+
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Acquire one token from each of several buckets before a request.
+
+    The wait is the longest of the individual bucket waits, so an engine
+    budget and an API-key budget are enforced together.
+    """
+
+    def __init__(self, buckets: List[TokenBucket]):
+        self.buckets = buckets
+
+    def _reserve(self) -> float:
+        return max((bucket._reserve() for bucket in self.buckets), default=0.0)
+
+    def acquire(self) -> float:
+        """
+        Block until the caller may issue its next request.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait_time = self._reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+        return wait_time
+
+    async def acquire_async(self) -> float:
+        """
+        Wait on the event loop until the caller may issue its next request.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait_time = self._reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+        return wait_time
+
+
+class ThrottleStats:
+    """Thread-safe accumulator for time spent throttled versus fetching."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self.requests = 0
+            self.throttled_seconds = 0.0
+            self.fetch_seconds = 0.0
+
+    def record(self, throttled: float, fetching: float):
+        """Record one request's throttle wait and network time."""
+        with self._lock:
+            self.requests += 1
+            self.throttled_seconds += throttled
+            self.fetch_seconds += fetching
+
+    def summary(self) -> str:
+        """Human-readable one-line report."""
+        return (
+            f"{self.requests} requests: {self.throttled_seconds:.1f}s throttled, "
+            f"{self.fetch_seconds:.1f}s fetching"
+        )
+
+
+_shared_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_shared_buckets_lock = threading.Lock()
+
+
+def get_shared_bucket(scope: str, name: str, rate: float, burst: int = 1) -> TokenBucket:
+    """
+    Get the process-wide bucket for a scope (e.g. "engine", "api_key").
+
+    All fetchers in the process share one bucket per (scope, name). The most
+    recent rate/burst wins if callers configure the same bucket differently.
+
+    Args:
+        scope: Budget category
+        name: Budget identifier within the scope
+        rate: Sustained requests per second (<= 0 disables limiting)
+        burst: Maximum number of requests allowed back-to-back
+
+    Returns:
+        Shared TokenBucket instance
+    """
+    if scope == "api_key":
+        # Never keep raw API keys around as dictionary keys
+        name = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16]
+
+    with _shared_buckets_lock:
+        bucket = _shared_buckets.get((scope, name))
+        if bucket is None:
+            bucket = _shared_buckets[(scope, name)] = TokenBucket(rate, burst)
+        elif bucket.rate != rate or bucket.burst != max(burst, 1):
+            bucket.configure(rate, burst)
+
+    return bucket
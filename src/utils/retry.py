@@ -5,6 +5,7 @@ Shared retry utilities
 Common retry logic extracted from multiple modules to eliminate duplication.
 """
 
+import asyncio
 import time
 import random
 from typing import Callable, Any, Optional
@@ -76,4 +77,30 @@ def retry_function(func: Callable, max_retries: int = 3,
                 time.sleep(wait_time)
                 continue
             raise e
-    return None
\ No newline at end of file
+    return None
+
+
+async def retry_async(func: Callable, max_retries: int = 3,
+                      base_delay: float = 1.0, *args, **kwargs) -> Any:
+    """
+    Retry a coroutine function without blocking the event loop.
+    
+    Args:
+        func: Coroutine function to retry
+        max_retries: Maximum number of retry attempts
+        base_delay: Base delay between retries
+        *args, **kwargs: Arguments to pass to function
+        
+    Returns:
+        Awaited function result or raises last exception
+    """
+    for attempt in range(max_retries):
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            if attempt < max_retries - 1:
+                wait_time = base_delay * (2 ** attempt) + random.uniform(0, 1)
+                await asyncio.sleep(wait_time)
+                continue
+            raise e
+    return None
@@ -0,0 +1,96 @@
+"""
+Shared request coalescing utilities
+==================================
+
+Single-flight groups let concurrent callers asking for the same key share
+one in-flight call and its result instead of each issuing their own.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Thread-safe single-flight group for blocking calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run ``func`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identity of the call
+            func: Function to run if this caller leads
+            *args, **kwargs: Arguments to pass to function
+
+        Returns:
+            Tuple of (result, shared) where shared is True if another
+            caller's in-flight result was reused
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func(*args, **kwargs)
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """Single-flight group for coroutines, scoped per running event loop."""
+
+    def __init__(self):
+        self._calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Await ``func`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identity of the call
+            func: Coroutine function to run if this caller leads
+            *args, **kwargs: Arguments to pass to function
+
+        Returns:
+            Tuple of (result, shared) where shared is True if another
+            task's in-flight result was reused
+        """
+        loop = asyncio.get_running_loop()
+        scoped_key = (id(loop), key)
+
+        future = self._calls.get(scoped_key)
+        if future is not None:
+            return await asyncio.shield(future), True
+
+        future = self._calls[scoped_key] = loop.create_future()
+        try:
+            result = await func(*args, **kwargs)
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            del self._calls[scoped_key]
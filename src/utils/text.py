@@ -24,4 +24,17 @@ def truncate_string(text: str, max_length: int, suffix: str = "...") -> str:
     if len(text) <= max_length:
         return text
     
-    return text[:max_length] + suffix
\ No newline at end of file
+    return text[:max_length] + suffix
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    Normalize a search keyword for comparison and deduplication.
+    
+    Args:
+        keyword: Raw keyword string
+        
+    Returns:
+        Lowercased keyword with surrounding and repeated whitespace removed
+    """
+    return ' '.join(keyword.split()).lower()
@@ -2,15 +2,20 @@
 """
 Test database functionality with mock data.
 """
+import sqlite3
 import sys
+import tempfile
+import threading
+from itertools import islice
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.serp import SerpResult
+from src.serp import SerpResult, SerpResultBatch
 from src.parser import create_domain_parser, CompetitorResult
-from src.db import create_database
+from src.db import create_database, keyword_set_fingerprint, CompetitorDatabase, SCHEMA_VERSION
+from src.aggregator import CompetitorAggregator
 
 def create_mock_competitors():
     """Create mock competitor data for testing."""
@@ -74,7 +79,7 @@ def test_database():
     print("\n📋 Recent analysis runs:")
     runs = db.get_analysis_runs(limit=5)
     for run in runs:
-        print(f"  - Run #{run['id']}: {run['keywords'][:50]}... ({run['total_competitors']} competitors)")
+        print(f"  - Run #{run['id']}: {', '.join(run['keywords'])[:50]}... ({run['total_competitors']} competitors)")
     
     # Get competitors for the run
     print(f"\n🏆 Competitors from run #{run_id}:")
@@ -91,5 +96,433 @@ def test_database():
     
     print("\n✅ Database test completed successfully!")
 
+def test_raw_serp_rows_round_trip_and_rescore_offline():
+    """Stored raw SERP rows stream back per keyword and re-score like the live run."""
+    serp_data = {
+        "nike shoes": [SerpResult("Nike", "https://www.nike.com/shoes", 1),
+                       SerpResult("Adidas", "https://adidas.com/nike", 2),
+                       SerpResult("Amazon", "https://amazon.com/nike", 3)],
+        "no results": [],
+        "running shoes": SerpResultBatch.from_results([SerpResult("Adidas", "https://www.adidas.com/run", 1),
+                                                       SerpResult("Brooks", "https://brooksrunning.com/", 2)]),
+    }
+
+    parser = create_domain_parser()
+    competitors = parser.parse_serp_results(serp_data)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(str(Path(tmp) / "raw.db"))
+        run_id = db.save_analysis_run(list(serp_data), competitors, serp_rows=serp_data.items())
+        other_id = db.save_analysis_run(list(serp_data), competitors, scoring_model="ctr",
+                                        serp_features=["ads", "featured_snippet"])
+
+        stored = list(db.iter_raw_serp_results(run_id, fetch_size=2))
+        assert [keyword for keyword, _ in stored] == ["nike shoes", "running shoes"]
+        assert [(r.title, r.url, r.rank) for r in stored[0][1]] == \
+               [(r.title, r.url, r.rank) for r in serp_data["nike shoes"]]
+        assert list(db.iter_raw_serp_results(other_id)) == []
+        assert db.get_database_stats()['raw_serp_rows'] == 5
+
+        aggregator = CompetitorAggregator(parser)
+        for keyword, results in db.iter_raw_serp_results(run_id):
+            aggregator.add(keyword, results)
+        assert [(c.domain, c.count, c.weighted_score, c.keyword_appearances) for c in aggregator.results()] == \
+               [(c.domain, c.count, c.weighted_score, c.keyword_appearances) for c in competitors]
+
+        assert db.get_analysis_run(run_id)['num_results'] == 20
+        assert [(run['scoring_model'], run['serp_features']) for run in db.get_analysis_runs()] == \
+               [("ctr", ["ads", "featured_snippet"]), ("linear", [])]
+        assert db.delete_analysis_run(run_id)
+        assert db.get_analysis_run(run_id) is None
+        assert db.get_database_stats()['raw_serp_rows'] == 0
+
+
+def test_staged_and_copied_serp_rows_keep_keyword_positions():
+    """Raw rows are stored under their keyword's position, however they arrive."""
+    keywords = ["nike shoes", "failed keyword", "running shoes"]
+    nike = [SerpResult("Nike", "https://www.nike.com/", 1), SerpResult("Adidas", "https://adidas.com/", 2)]
+    running = SerpResultBatch.from_results([SerpResult("Brooks", "https://brooksrunning.com/", 1)])
+
+    def stored_positions(db, run_id):
+        with db._connection() as conn:
+            return conn.execute('''
+                SELECT keyword_index, position, serp_rank FROM serp_results WHERE run_id = ?
+                ORDER BY keyword_index, position
+            ''', (run_id,)).fetchall()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(str(Path(tmp) / "staged.db"))
+
+        # Fetched out of order, one keyword missing: staged as each arrives
+        db.stage_serp_rows("running shoes", running)
+        db.stage_serp_rows("nike shoes", nike)
+        staged_id = db.save_analysis_run(keywords, create_mock_competitors(), staged_serp_rows=True)
+        expected = [(0, 0, 1), (0, 1, 2), (2, 0, 1)]
+        assert stored_positions(db, staged_id) == expected
+
+        # Staged rows are moved, not shared with the next run
+        assert db.save_analysis_run(keywords, create_mock_competitors(), staged_serp_rows=True)
+        assert db.get_database_stats()['raw_serp_rows'] == 3
+
+        rows = iter([("running shoes", running), ("nike shoes", nike)])
+        lazy_id = db.save_analysis_run(keywords, create_mock_competitors(), serp_rows=rows)
+        assert stored_positions(db, lazy_id) == expected
+
+        copied_id = db.save_analysis_run(keywords, create_mock_competitors(), serp_rows_from_run=staged_id)
+        assert stored_positions(db, copied_id) == expected
+
+        try:
+            db.save_analysis_run(keywords, create_mock_competitors(), serp_rows=[("other keyword", nike)])
+            assert False, "rows for a keyword outside the run should be rejected"
+        except ValueError:
+            pass
+        assert db.get_database_stats()['total_runs'] == 4
+        db.close()
+
+
+def test_connections_are_tuned_migrated_once_and_readers_do_not_block_writers():
+    """Long-lived WAL connections: pragmas applied, schema init once, concurrent reads."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "wal.db")
+        db = create_database(db_path)
+        conn = db._connection()
+
+        assert conn is db._connection()
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+        assert conn.execute('PRAGMA foreign_keys').fetchone()[0] == 1
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+
+        # A current schema is not re-created
+        statements = []
+        conn.set_trace_callback(statements.append)
+        db._init_database()
+        conn.set_trace_callback(None)
+        assert not [sql for sql in statements if 'CREATE' in sql]
+
+        run_id = db.save_analysis_run(["nike shoes"], create_mock_competitors(), serp_rows=[
+            ("nike shoes", [SerpResult("Nike", "https://nike.com", 1)])
+        ])
+
+        # Hold a write transaction open while another connection reads
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute("INSERT INTO analysis_runs (engine, num_results) VALUES ('google', 20)")
+
+        reader = create_database(db_path)
+        seen = {}
+        thread = threading.Thread(target=lambda: seen.update(reader.get_database_stats()))
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive() and seen['total_runs'] == 1
+
+        conn.commit()
+        assert reader.get_database_stats()['total_runs'] == 2
+
+        # Foreign keys are enforced, so deleting a run cascades to its rows
+        assert db.delete_analysis_run(run_id)
+        assert reader.get_competitors_by_run(run_id) == []
+        assert conn.execute('SELECT COUNT(*) FROM keyword_appearances').fetchone()[0] == 0
+        assert reader.get_database_stats()['raw_serp_rows'] == 0
+
+        reader.close()
+        db.close()
+
+
+def test_bulk_save_preassigns_ids_without_reusing_deleted_ones():
+    """Bulk-inserted appearances attach to the right competitors across saves and deletes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(str(Path(tmp) / "bulk.db"))
+        keywords = ["nike shoes", "running shoes", "athletic footwear"]
+
+        first = db.save_analysis_run(keywords, create_mock_competitors())
+        conn = db._connection()
+        first_ids = [row[0] for row in conn.execute('SELECT id FROM competitor_results ORDER BY id')]
+        assert db.delete_analysis_run(first)
+
+        second = db.save_analysis_run(keywords, create_mock_competitors())
+        stored = db.get_competitors_by_run(second)
+
+        assert min(c['id'] for c in stored) > max(first_ids)
+        assert [(c['domain'], c['rank_position'], c['keyword_appearances']) for c in stored] == \
+               [(c.domain, rank, c.keyword_appearances) for rank, c in enumerate(create_mock_competitors(), 1)]
+
+        # Autoincrement inserts after a bulk save continue past the pre-assigned ids
+        conn.execute("INSERT INTO competitor_results (run_id, domain_id, count, weighted_score, rank_position) "
+                     "SELECT ?, id, 1, 1.0, 99 FROM domains WHERE name = 'nike.com'", (second,))
+        assert conn.execute('SELECT MAX(id) FROM competitor_results').fetchone()[0] == max(c['id'] for c in stored) + 1
+        conn.rollback()
+        db.close()
+
+
+def test_migration_drops_rows_orphaned_by_unversioned_database():
+    """An unversioned database with rows left by deletes under foreign keys off upgrades cleanly."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "legacy.db")
+
+        # Original schema, written and pruned the way the original release did
+        # it: a plain connection, so foreign keys stay off and nothing cascades
+        legacy = sqlite3.connect(db_path)
+        cursor = legacy.cursor()
+        CompetitorDatabase._migrate_to_v1(cursor)
+        for run_id, keywords in ((1, "nike shoes,running shoes"), (2, "nike shoes"), (3, "deleted run")):
+            cursor.execute("INSERT INTO analysis_runs (id, keywords, engine, num_results, created_at) "
+                           "VALUES (?, ?, 'google', 20, ?)", (run_id, keywords, f"2026-01-0{run_id} 08:00:00"))
+        cursor.executemany("INSERT INTO competitor_results (id, run_id, domain, count, weighted_score, rank_position) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", [
+                               (1, 1, "nike.com", 2, 39.0, 1), (2, 1, "adidas.com", 1, 19.0, 2),
+                               (3, 2, "nike.com", 1, 20.0, 1), (4, 3, "gone.com", 1, 1.0, 1),
+                           ])
+        cursor.executemany("INSERT INTO keyword_appearances (competitor_id, keyword, serp_rank) VALUES (?, ?, ?)", [
+            (1, "nike shoes", 1), (1, "running shoes", 2), (2, "running shoes", 1), (3, "nike shoes", 1),
+            (4, "deleted run", 1),
+        ])
+        cursor.execute("DELETE FROM analysis_runs WHERE id = 3")
+        legacy.commit()
+        assert cursor.execute("SELECT COUNT(*) FROM competitor_results WHERE run_id = 3").fetchone()[0] == 1
+        assert cursor.execute("PRAGMA user_version").fetchone()[0] == 0
+        legacy.close()
+
+        db = create_database(db_path)
+        conn = db._connection()
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute('PRAGMA foreign_keys').fetchone()[0] == 1
+        assert conn.execute('PRAGMA foreign_key_check').fetchall() == []
+        assert 'keywords' not in [row[1] for row in conn.execute('PRAGMA table_info(analysis_runs)')]
+
+        # The deleted run's competitor and appearance rows are gone
+        assert conn.execute('SELECT id FROM competitor_results ORDER BY id').fetchall() == [(1,), (2,), (3,)]
+        assert conn.execute('SELECT DISTINCT competitor_id FROM keyword_appearances ORDER BY 1').fetchall() == [
+            (1,), (2,), (3,)
+        ]
+        assert db.get_analysis_run(3) is None
+
+        assert db.get_analysis_run(1)['keywords'] == ["nike shoes", "running shoes"]
+        assert db.get_analysis_run(1)['scoring_model'] == "linear"
+        assert [(c['domain'], c['keyword_appearances']) for c in db.get_competitors_by_run(1)] == [
+            ("nike.com", {"nike shoes": 1, "running shoes": 2}), ("adidas.com", {"running shoes": 1}),
+        ]
+        assert [(r['weighted_score'], r['keywords']) for r in db.get_domain_history("nike.com")] == [
+            (20.0, ["nike shoes"]), (39.0, ["nike shoes", "running shoes"])
+        ]
+        assert db.get_domain_history("gone.com") == []
+        assert conn.execute('SELECT COUNT(*) FROM domains').fetchone()[0] == 2
+
+        # Ids of rows deleted before the migration are still not reused
+        run_id = db.save_analysis_run(["nike shoes"], create_mock_competitors())
+        assert run_id == 4
+        assert min(c['id'] for c in db.get_competitors_by_run(run_id)) == 5
+        assert db.get_database_stats()['unique_domains'] == 5
+        db.close()
+
+
+# Index walks that stop early (newest runs first, cut off by LIMIT) and the
+# fixed handful of trigger-maintained counters
+ALLOWED_SCANS = {'SCAN analysis_runs USING INDEX idx_analysis_runs_created_at', 'SCAN db_stats'}
+
+
+def _full_scans(conn, statements):
+    """Plan lines of SELECT statements that read a whole table or index."""
+    scans = []
+    for sql in statements:
+        if not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        for row in conn.execute('EXPLAIN QUERY PLAN ' + sql):
+            detail = row[3]
+            if detail.startswith('SCAN ') and detail not in ALLOWED_SCANS:
+                scans.append((' '.join(sql.split()), detail))
+    return scans
+
+
+def test_public_queries_use_indexes():
+    """EXPLAIN QUERY PLAN regression: no public read degrades to a full scan."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(str(Path(tmp) / "plans.db"))
+        keywords = ["nike shoes", "running shoes", "athletic footwear"]
+        serp_rows = [("nike shoes", [SerpResult("Nike", "https://www.nike.com/", 1)])]
+        run_id = db.save_analysis_run(keywords, create_mock_competitors(), serp_rows=serp_rows)
+        db.save_analysis_run(keywords, create_mock_competitors())
+        conn = db._connection()
+
+        queries = {
+            'get_analysis_runs': lambda: db.get_analysis_runs(limit=5),
+            'get_analysis_run': lambda: db.get_analysis_run(run_id),
+            'get_competitors_by_run': lambda: db.get_competitors_by_run(run_id),
+            'iter_competitors_by_run': lambda: list(islice(db.iter_competitors_by_run(run_id), 2)),
+            'get_domain_history': lambda: db.get_domain_history("nike.com", limit=5),
+            'iter_raw_serp_results': lambda: list(db.iter_raw_serp_results(run_id)),
+            'get_database_stats': db.get_database_stats,
+            'get_domain_trend': lambda: [db.get_domain_trend("nike.com", period) for period in ('day', 'week', 'month')],
+        }
+
+        for name, query in queries.items():
+            statements = []
+            conn.set_trace_callback(statements.append)
+            query()
+            conn.set_trace_callback(None)
+
+            assert statements, name
+            assert _full_scans(conn, statements) == [], name
+
+        # History is answered from the covering index, already in run order
+        statements = []
+        conn.set_trace_callback(statements.append)
+        db.get_domain_history("nike.com", limit=5)
+        conn.set_trace_callback(None)
+        plan = [row[3] for sql in statements if 'competitor_results' in sql
+                for row in conn.execute('EXPLAIN QUERY PLAN ' + sql)]
+        assert any('COVERING INDEX idx_competitor_results_domain_run' in detail for detail in plan)
+        assert not any('TEMP B-TREE' in detail for detail in plan)
+
+        # Every cascading foreign key is indexed, so delete_analysis_run never scans a child table
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            indexed = [
+                [column[2] for column in conn.execute(f"PRAGMA index_info('{index[1]}')")]
+                for index in conn.execute(f"PRAGMA index_list('{table}')")
+            ]
+            for foreign_key in conn.execute(f"PRAGMA foreign_key_list('{table}')"):
+                if foreign_key[6] == 'CASCADE':
+                    assert any(columns[:1] == [foreign_key[3]] for columns in indexed), (table, foreign_key[3])
+
+        db.close()
+
+
+def test_keyword_appearances_round_trip_any_characters():
+    """Keywords with commas and colons come back intact, streamed in rank order."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(str(Path(tmp) / "keywords.db"))
+        keywords = ["shoes, running", "nike: air max", "a:1,b:2"]
+
+        competitors = create_mock_competitors()
+        competitors[0].keyword_appearances.clear()
+        for rank, keyword in enumerate(keywords, 1):
+            competitors[0].add_keyword_appearance(keyword, rank)
+        competitors.append(CompetitorResult("quiet.com", 0, 0.0))
+
+        run_id = db.save_analysis_run(keywords, competitors)
+        stored = db.get_competitors_by_run(run_id)
+
+        assert db.get_analysis_run(run_id)['keywords'] == keywords
+        assert stored[0]['keyword_appearances'] == {"shoes, running": 1, "nike: air max": 2, "a:1,b:2": 3}
+        assert [c['domain'] for c in stored] == [c.domain for c in competitors]
+        assert [c['rank_position'] for c in stored] == list(range(1, len(competitors) + 1))
+        assert stored[-1]['keyword_appearances'] == {}
+
+        # Streaming in small fetches groups the same way and can stop early
+        assert list(db.iter_competitors_by_run(run_id, fetch_size=1)) == stored
+        assert list(islice(db.iter_competitors_by_run(run_id), 2)) == stored[:2]
+        db.close()
+
+
+def test_stats_are_maintained_by_triggers():
+    """Stored counters track saves, cascading deletes and raw inserts; recompute repairs drift."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(str(Path(tmp) / "stats.db"))
+        keywords = ["nike shoes", "running shoes", "athletic footwear"]
+        serp_rows = [("nike shoes", [SerpResult("Nike", "https://www.nike.com/", 1),
+                                     SerpResult("Adidas", "https://www.adidas.com/", 2)])]
+
+        first = db.save_analysis_run(keywords, create_mock_competitors(), serp_rows=serp_rows)
+        second = db.save_analysis_run(keywords, create_mock_competitors()[:2])
+        stats = db.get_database_stats()
+        assert (stats['total_runs'], stats['total_competitors'], stats['unique_domains'], stats['raw_serp_rows']) == \
+               (2, 7, 5, 2)
+
+        # Deleting the first run cascades; only nike.com and adidas.com remain referenced
+        assert db.delete_analysis_run(first)
+        stats = db.get_database_stats()
+        assert (stats['total_runs'], stats['total_competitors'], stats['unique_domains'], stats['raw_serp_rows']) == \
+               (1, 2, 2, 0)
+        assert db.recompute_database_stats() == {}
+
+        # Raw SQL with triggers in place stays counted; a stale counter is reported and fixed
+        conn = db._connection()
+        with conn:
+            conn.execute("INSERT INTO domains (name) VALUES ('raw.com')")
+            conn.execute("INSERT INTO competitor_results (run_id, domain_id, count, weighted_score, rank_position) "
+                         "SELECT ?, id, 1, 1.0, 3 FROM domains WHERE name = 'raw.com'", (second,))
+            conn.execute("UPDATE db_stats SET value = 99 WHERE name = 'total_runs'")
+        assert db.get_database_stats()['unique_domains'] == 3
+        assert db.recompute_database_stats() == {'total_runs': (99, 1)}
+        assert db.get_database_stats()['total_runs'] == 1
+        db.close()
+
+
+def test_domain_daily_rollup_and_trend():
+    """Saves fold into per-day rows, periods downsample them, deletes recompute the day."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(str(Path(tmp) / "trend.db"))
+        keywords = ["nike shoes", "running shoes", "athletic footwear"]
+        conn = db._connection()
+
+        def save_on(day, competitors, run_keywords=keywords):
+            run_id = db.save_analysis_run(run_keywords, competitors)
+            with conn:
+                conn.execute("UPDATE analysis_runs SET created_at = ? WHERE id = ?", (f"{day} 09:00:00", run_id))
+            return run_id
+
+        weaker = create_mock_competitors()
+        weaker[0].weighted_score, weaker[0].count = 40.0, 2
+        weaker.append(weaker.pop(0))  # nike.com ranked last
+
+        save_on("2026-03-02", create_mock_competitors())
+        save_on("2026-03-04", weaker)
+        save_on("2026-03-09", create_mock_competitors())
+        save_on("2026-03-09", create_mock_competitors()[:1], ["nike shoes"])
+        assert db.recompute_database_stats() == {}  # rebuilds the rollup under the new dates
+
+        fingerprint = keyword_set_fingerprint(reversed(keywords))
+        daily = db.get_domain_trend("nike.com", keyword_set=fingerprint)
+        assert [(p['period'], p['runs'], p['avg_score'], p['best_rank'], p['appearances']) for p in daily] == [
+            ("2026-03-02", 1, 60.0, 1, 3), ("2026-03-04", 1, 40.0, 5, 2), ("2026-03-09", 1, 60.0, 1, 3),
+        ]
+        assert daily[0]['keyword_count'] == 3
+
+        weekly = db.get_domain_trend("nike.com", period="week", keyword_set=fingerprint)
+        assert [(p['period'], p['runs'], p['avg_score'], p['best_rank']) for p in weekly] == [
+            ("2026-03-02", 2, 50.0, 1), ("2026-03-09", 1, 60.0, 1),
+        ]
+        monthly = db.get_domain_trend("nike.com", period="month")
+        assert [(p['period'], p['runs'], p['keyword_count']) for p in monthly] == [("2026-03", 1, 1), ("2026-03", 3, 3)]
+        assert conn.execute("SELECT runs, avg_score FROM domain_weekly WHERE period = '2026-03-02' AND "
+                            "domain_id = (SELECT id FROM domains WHERE name = 'nike.com')").fetchone() == (2, 50.0)
+        assert len(db.get_domain_trend("nike.com", limit=2)) == 2
+
+        # Saving upserts into an existing day; deleting recomputes it from the remaining runs
+        second = db.save_analysis_run(keywords, weaker)
+        today = conn.execute("SELECT date(created_at) FROM analysis_runs WHERE id = ?", (second,)).fetchone()[0]
+        db.save_analysis_run(keywords, create_mock_competitors()[:1])
+        point = db.get_domain_trend("nike.com", keyword_set=fingerprint)[-1]
+        assert (point['period'], point['runs'], point['avg_score'], point['best_rank']) == (today, 2, 50.0, 1)
+        assert db.delete_analysis_run(second)
+        point = db.get_domain_trend("nike.com", keyword_set=fingerprint)[-1]
+        assert (point['runs'], point['avg_score'], point['best_rank']) == (1, 60.0, 1)
+        assert db.get_domain_trend("adidas.com", keyword_set=fingerprint)[-1]['period'] == "2026-03-09"
+
+        # Runs ranked with another scoring model get their own series
+        ctr_run = db.save_analysis_run(keywords, weaker, scoring_model="ctr", serp_features=["ads"])
+        today_points = [p for p in db.get_domain_trend("nike.com", keyword_set=fingerprint) if p['period'] == today]
+        assert [(p['scoring_model'], p['serp_features'], p['runs'], p['avg_score']) for p in today_points] == [
+            ("linear", [], 1, 60.0), ("ctr", ["ads"], 1, 40.0),
+        ]
+        linear = db.get_domain_trend("nike.com", period="week", keyword_set=fingerprint, scoring_model="linear")
+        assert (linear[-1]['runs'], linear[-1]['avg_score']) == (1, 60.0)
+        assert db.get_domain_trend("nike.com", scoring_model="ctr", serp_features=[]) == []
+        assert conn.execute("SELECT COUNT(DISTINCT scoring_model) FROM domain_monthly").fetchone()[0] == 2
+        assert db.delete_analysis_run(ctr_run)
+        assert db.get_domain_trend("nike.com", scoring_model="ctr") == []
+        assert db.recompute_database_stats() == {}
+        db.close()
+
+
 if __name__ == "__main__":
-    test_database()
\ No newline at end of file
+    test_database()
+    test_raw_serp_rows_round_trip_and_rescore_offline()
+    test_staged_and_copied_serp_rows_keep_keyword_positions()
+    test_connections_are_tuned_migrated_once_and_readers_do_not_block_writers()
+    test_bulk_save_preassigns_ids_without_reusing_deleted_ones()
+    test_migration_drops_rows_orphaned_by_unversioned_database()
+    test_public_queries_use_indexes()
+    test_keyword_appearances_round_trip_any_characters()
+    test_stats_are_maintained_by_triggers()
+    test_domain_daily_rollup_and_trend()
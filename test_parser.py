@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Tests for domain extraction and competitor ranking.
+"""
+import csv
+import re
+import sys
+import random
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.parser import DomainParser, get_offline_extractor, refresh_suffix_list_snapshot
+from src.exclusions import ExclusionRules
+from src.serp import SerpResult, SerpResultBatch
+from src.export import ExportManager
+from src.aggregator import CompetitorAggregator
+from src.scoring import CtrCurveModel, ENGINE_CTR_CURVES, create_scoring_model, rescore_stored_competitors
+
+URLS = [
+    "https://www.Nike.com/running-shoes",
+    "http://user:pw@shop.nike.co.uk:8080/a?b=c",
+    "nike.com/no-scheme",
+    "https://foo.blogspot.com/post",
+    "https://192.168.0.1/admin",
+    "https://localhost/",
+    "https://nike.com.",
+    "https:///path-only",
+    "",
+]
+
+
+def test_extract_domain_memoizes_hosts_and_matches_tldextract():
+    """Cached host lookups give the same domains as extracting each full URL."""
+    parser = DomainParser(suffix_list="bundled", domain_cache_size=16)
+    extract = get_offline_extractor("bundled")
+
+    for url in URLS:
+        full_url = url if url.startswith(('http://', 'https://')) else 'https://' + url
+        extracted = extract(full_url)
+        expected = f"{extracted.domain}.{extracted.suffix}".lower() \
+            if url and extracted.domain and extracted.suffix else ""
+        assert parser.extract_domain(url) == expected, url
+
+    assert parser.extract_domain("https://www.nike.com/other") == "nike.com"
+    assert parser.extract_domain("https://www.nike.com/again") == "nike.com"
+
+    stats = parser.domain_cache_stats()
+    assert stats['hits'] == 2
+    assert stats['size'] == stats['misses']
+    assert 0 < stats['hit_rate'] < 1
+
+
+def test_offline_suffix_lists_are_pinned_and_shared():
+    """Offline extractors never fetch, are built once, and honor a pinned list."""
+    bundled = DomainParser(suffix_list="bundled")
+    assert bundled.extract_domain("https://shop.nike.co.uk/") == "nike.co.uk"
+    assert get_offline_extractor("bundled") is get_offline_extractor("bundled")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "downloaded.dat"
+        source.write_text("// test list\ncom\nco.uk\nshop.example\n")
+        pinned = Path(tmp) / "data" / "public_suffix_list.dat"
+
+        assert refresh_suffix_list_snapshot(str(source), str(pinned)) == 3
+
+        parser = DomainParser(suffix_list=str(pinned))
+        assert parser.extract_domain("https://www.acme.shop.example/") == "acme.shop.example"
+        assert parser.extract_domain("https://www.nike.de/") == ""  # .de is not in the pinned list
+
+        source.write_text("not a suffix list\n")
+        try:
+            refresh_suffix_list_snapshot(str(source), str(pinned))
+            assert False, "invalid list should be rejected"
+        except ValueError:
+            pass
+        assert "shop.example" in pinned.read_text()
+
+
+def test_exclusion_rules_match_legacy_checks_and_load_from_file():
+    """Compiled rules exclude what the exact set and re.match loop excluded."""
+    parser = DomainParser(suffix_list="bundled")
+    for domain in ["google.com", "maps.google.co.uk", "amazon.com", "www.amazon.de", "wikipedia.org"]:
+        assert not parser.is_valid_competitor(domain), domain
+    for domain in ["nike.com", "googleish.com", "adidas.de"]:
+        assert parser.is_valid_competitor(domain), domain
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_file = Path(tmp) / "exclusions.txt"
+        rules_file.write_text("# marketplaces\nZalando.de\n\ngov\nregex:^shop\\d+\\.\n")
+
+        rules = ExclusionRules.from_file(rules_file)
+        assert len(rules) == 3
+        assert rules.is_excluded("zalando.de") and rules.is_excluded("outlet.zalando.de")
+        assert rules.is_excluded("usa.gov") and rules.is_excluded("shop42.net")
+        assert not rules.is_excluded("zalando.com") and not rules.is_excluded("myshop1.net")
+
+        parser = DomainParser(suffix_list="bundled", exclusions_file=str(rules_file))
+        assert not parser.is_valid_competitor("zalando.de")
+        assert not parser.is_valid_competitor("google.com")
+        assert parser.is_valid_competitor("nike.com")
+
+        rules_file.write_text("regex:(unclosed\n")
+        try:
+            ExclusionRules.from_file(rules_file)
+            assert False, "invalid pattern should be rejected"
+        except ValueError:
+            pass
+
+
+def test_exclusion_patterns_indexed_by_label_match_like_re_match():
+    """Label-indexed and leftover patterns exclude exactly what re.match would."""
+    patterns = [r'.*\.aggregator\..*', r'^ads\.', r'.*\.blogspot\.com', r'^shop\d+\.', r'(?i)^CDN\.',
+                r'deals|coupons', r'^m\.example\.org$']
+    rules = ExclusionRules(patterns=patterns)
+    assert sorted(rules._label_regex) == ["ads", "aggregator", "blogspot", "example"]
+
+    domains = ["www.aggregator.net", "aggregator.net", "notaggregator.net", "ads.nike.com", "myads.nike.com",
+               "foo.blogspot.com", "foo.blogspot.co", "shop7.net", "cdn.site.io", "deals.com", "hotdeals.com",
+               "m.example.org", "m.example.org.uk", "example.org", "nike.com"]
+    for domain in domains:
+        expected = any(re.match(pattern, domain) for pattern in patterns)
+        assert rules.is_excluded(domain) == expected, domain
+
+
+def competitor_rows(competitors):
+    return [(c.domain, c.count, c.weighted_score, list(c.keyword_appearances.items())) for c in competitors]
+
+
+def test_numpy_backend_matches_python_backend():
+    """The vectorized engine yields identical competitors, order and appearances."""
+    rng = random.Random(7)
+    hosts = [f"www.site{i}.com" for i in range(40)] + ["www.google.com", "shop.amazon.com", "localhost"]
+    serp_data = {
+        f"keyword {k}": [
+            # Repeated hosts per keyword exercise last-rank-wins; ranks past max_rank score 0
+            SerpResult("t", f"https://{rng.choice(hosts)}/{k}", rng.randint(1, 25))
+            for _ in range(rng.randint(0, 30))
+        ]
+        for k in range(60)
+    }
+
+    parser = DomainParser(suffix_list="bundled")
+    expected = parser.parse_serp_results(serp_data, max_rank=20)
+    actual = parser.parse_serp_results(serp_data, max_rank=20, backend="numpy")
+
+    assert expected and competitor_rows(actual) == competitor_rows(expected)
+    assert parser.parse_serp_results({}, backend="numpy") == []
+    assert parser.parse_serp_results({"kw": [SerpResult("t", "https://google.com", 1)]}, backend="numpy") == []
+
+
+def test_rank_matrix_matches_appearances_and_exports_identically():
+    """Both engines' RankMatrix rows equal keyword_appearances; CSV output is unchanged."""
+    serp_data = {
+        "running shoes": [SerpResult("t", "https://nike.com/a", 1), SerpResult("t", "https://adidas.com", 2)],
+        "trail shoes": [SerpResult("t", "https://salomon.com", 1), SerpResult("t", "https://nike.com/b", 3)],
+        "nike outlet": [SerpResult("t", "https://nike.com/c", 2), SerpResult("t", "https://nike.com/d", 5)],
+    }
+    keywords = list(serp_data)
+    parser = DomainParser(suffix_list="bundled")
+
+    for backend in ("python", "numpy"):
+        competitors, matrix = parser.parse_serp_results(serp_data, backend=backend, return_matrix=True)
+        assert matrix.shape == (len(competitors), len(keywords))
+        assert matrix.nnz == sum(len(c.keyword_appearances) for c in competitors)
+        for competitor in competitors:
+            assert list(matrix.row_items(competitor.domain)) == list(competitor.keyword_appearances.items())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        exporter = ExportManager()
+        # Exported columns in a different order than the matrix keyword table
+        columns = keywords[::-1]
+        plain = exporter.export_to_csv(competitors, columns, f"{tmp}/plain.csv")
+        streamed = exporter.export_to_csv(competitors, columns, f"{tmp}/matrix.csv", rank_matrix=matrix)
+
+        with open(plain) as a, open(streamed) as b:
+            assert list(csv.reader(a)) == list(csv.reader(b))
+
+
+def test_columnar_batches_score_like_result_lists():
+    """SerpResultBatch input gives the same competitors as SerpResult lists."""
+    rng = random.Random(3)
+    serp_data = {
+        f"keyword {k}": [
+            SerpResult(f"title {i}", f"https://www.site{rng.randrange(15)}.com/{k}", i)
+            for i in range(1, 21)
+        ]
+        for k in range(25)
+    }
+    batches = {keyword: SerpResultBatch.from_results(results) for keyword, results in serp_data.items()}
+
+    batch = batches["keyword 0"]
+    assert len(batch) == 20 and batch[3].rank == 4
+    assert [(r.title, r.url, r.rank) for r in batch] == [(r.title, r.url, r.rank) for r in serp_data["keyword 0"]]
+    assert not hasattr(batch[0], "__dict__")
+
+    parser = DomainParser(suffix_list="bundled")
+    for backend in ("python", "numpy"):
+        expected = parser.parse_serp_results(serp_data, backend=backend)
+        assert competitor_rows(parser.parse_serp_results(batches, backend=backend)) == competitor_rows(expected)
+
+
+def test_streaming_aggregator_matches_batch_parsing_in_any_order():
+    """Folding keywords in completion order ranks exactly like parse_serp_results."""
+    rng = random.Random(11)
+    hosts = [f"www.site{i}.com" for i in range(30)] + ["www.google.com", "localhost"]
+    serp_data = {
+        f"keyword {k}": [
+            SerpResult("t", f"https://{rng.choice(hosts)}/{k}", rng.randint(1, 25))
+            for _ in range(rng.randint(0, 25))
+        ]
+        for k in range(40)
+    }
+
+    parser = DomainParser(suffix_list="bundled")
+    expected, expected_matrix = parser.parse_serp_results(serp_data, return_matrix=True)
+
+    arrival = list(serp_data)
+    rng.shuffle(arrival)
+    aggregator = CompetitorAggregator(parser, keywords=list(serp_data))
+    for keyword in arrival:
+        aggregator.add(keyword, SerpResultBatch.from_results(serp_data[keyword]))
+
+    assert aggregator.keywords_seen == 40
+    assert aggregator.results_seen == sum(len(results) for results in serp_data.values())
+    assert len(aggregator) == len(expected)
+    assert competitor_rows(aggregator.snapshot(5)) == competitor_rows(expected[:5])
+
+    competitors, matrix = aggregator.results(return_matrix=True)
+    assert competitor_rows(competitors) == competitor_rows(expected)
+    assert matrix.keywords == expected_matrix.keywords
+    assert matrix.indices.tolist() == expected_matrix.indices.tolist()
+
+
+def test_top_k_selection_matches_full_sort_then_filter():
+    """Heap-selected leaders equal sorting everything, filtering and slicing."""
+    rng = random.Random(5)
+    serp_data = {
+        # Few distinct ranks over many domains produce plenty of score ties
+        f"keyword {k}": [
+            SerpResult("t", f"https://site{rng.randrange(300)}.com/{k}", rng.choice([1, 5, 10]))
+            for _ in range(10)
+        ]
+        for k in range(80)
+    }
+
+    parser = DomainParser(suffix_list="bundled")
+    ranked = parser.parse_serp_results(serp_data)
+    aggregator = CompetitorAggregator(parser, keywords=list(serp_data))
+    for keyword, results in serp_data.items():
+        aggregator.add(keyword, results)
+
+    selections = [(25, 1, 0.0), (10, 3, 0.0), (40, 1, 20.0), (0, 1, 0.0), (10000, 2, 0.0), (None, 2, 0.0)]
+    for top_k, min_appearances, min_score in selections:
+        expected = [c for c in ranked if c.count >= min_appearances and c.weighted_score >= min_score][:top_k]
+        selection = dict(top_k=top_k, min_appearances=min_appearances, min_weighted_score=min_score)
+
+        for backend in ("python", "numpy"):
+            actual = parser.parse_serp_results(serp_data, backend=backend, **selection)
+            assert competitor_rows(actual) == competitor_rows(expected), backend
+        assert competitor_rows(aggregator.results(**selection)) == competitor_rows(expected)
+        assert competitor_rows(parser.filter_competitors(
+            ranked, min_appearances=min_appearances, min_weighted_score=min_score, max_results=top_k
+        )) == competitor_rows(expected)
+
+
+def test_scoring_models_precompute_tables_and_rescore_stored_appearances():
+    """Every model scores through its weight table, identically in each engine."""
+    linear = create_scoring_model("linear")
+    assert linear.weight_table(5) == [0.0, 5.0, 4.0, 3.0, 2.0, 1.0]
+
+    ctr = create_scoring_model("ctr", engine="bing", serp_features=["ads"])
+    assert ctr.curve == tuple(ENGINE_CTR_CURVES["bing"])
+    assert ctr.weight_table(3)[1] == ENGINE_CTR_CURVES["bing"][0] * 0.75
+    assert CtrCurveModel(curve=(10.0, 5.0), tail_decay=0.5).weight_table(4) == [0.0, 10.0, 5.0, 2.5, 1.25]
+
+    decay = create_scoring_model("decay").weight_table(20)
+    assert all(decay[rank] > decay[rank + 1] for rank in range(1, 20))
+
+    for bad in (lambda: create_scoring_model("bogus"), lambda: create_scoring_model("ctr", serp_features=["popups"])):
+        try:
+            bad()
+            assert False, "unknown model or feature should be rejected"
+        except ValueError:
+            pass
+
+    rng = random.Random(17)
+    serp_data = {
+        f"keyword {k}": [
+            SerpResult("t", f"https://site{i}.com/{k}", rank)
+            for rank, i in enumerate(rng.sample(range(60), 20), 1)
+        ]
+        for k in range(30)
+    }
+
+    linear_parser = DomainParser(suffix_list="bundled")
+    assert linear_parser.calculate_weighted_score(1, 20) == 20.0
+    assert linear_parser.calculate_weighted_score(21, 20) == 0.0
+
+    ctr_parser = DomainParser(suffix_list="bundled", scoring_model=create_scoring_model("ctr"))
+    expected = ctr_parser.parse_serp_results(serp_data)
+    assert competitor_rows(ctr_parser.parse_serp_results(serp_data, backend="numpy")) == competitor_rows(expected)
+
+    aggregator = CompetitorAggregator(ctr_parser, keywords=list(serp_data))
+    for keyword, results in serp_data.items():
+        aggregator.add(keyword, results)
+    assert competitor_rows(aggregator.results()) == competitor_rows(expected)
+
+    # A linear run's stored appearances re-rank exactly like a fresh CTR run
+    stored = [
+        {'domain': c.domain, 'count': c.count, 'weighted_score': c.weighted_score,
+         'rank_position': position, 'keyword_appearances': dict(c.keyword_appearances)}
+        for position, c in enumerate(linear_parser.parse_serp_results(serp_data), 1)
+    ]
+    rescored = rescore_stored_competitors(stored, create_scoring_model("ctr"), 20)
+
+    assert [(c['domain'], c['weighted_score']) for c in rescored] == \
+           [(c.domain, c.weighted_score) for c in expected]
+    assert [c['rank_position'] for c in rescored] == list(range(1, len(expected) + 1))
+    assert stored[0]['weighted_score'] != rescored[0]['weighted_score']
+
+
+if __name__ == "__main__":
+    test_extract_domain_memoizes_hosts_and_matches_tldextract()
+    test_offline_suffix_lists_are_pinned_and_shared()
+    test_exclusion_rules_match_legacy_checks_and_load_from_file()
+    test_exclusion_patterns_indexed_by_label_match_like_re_match()
+    test_numpy_backend_matches_python_backend()
+    test_rank_matrix_matches_appearances_and_exports_identically()
+    test_columnar_batches_score_like_result_lists()
+    test_streaming_aggregator_matches_batch_parsing_in_any_order()
+    test_top_k_selection_matches_full_sort_then_filter()
+    test_scoring_models_precompute_tables_and_rescore_stored_appearances()
+    print("✅ Parser tests passed")
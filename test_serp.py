@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Test SERP fetching behaviour without network access.
+"""
+import sys
+import time
+import asyncio
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+# Add src and benchmark helpers to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent / "benchmarks"))
+
+from src.serp import SerpFetcher, SerpResult, SerpResultBatch, AsyncSerpFetcher, AIOHTTP_AVAILABLE
+from src.cache import SerpCache
+from src.input import validate_keywords
+from src.fixtures import FixtureArchive, RECORD_MODE, REPLAY_MODE
+from src.html_parsers import HtmlParsePool, available_backends, parse_google_html
+from stub_serp_server import start_stub_server
+
+
+class StubFetcher(SerpFetcher):
+    """SerpFetcher that fabricates results instead of calling the network."""
+
+    def __init__(self, fail_on=(), delay=0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_on = set(fail_on)
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def fetch_serp_results(self, keyword, num_results=20, max_retries=3):
+        with self._lock:
+            self.calls.append(keyword)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if keyword in self.fail_on:
+                raise RuntimeError("simulated upstream error")
+            return [SerpResult(f"{keyword} result", f"https://{keyword.replace(' ', '')}.com", 1)]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_concurrent_fetch_preserves_keywords_and_isolates_failures():
+    """Concurrent fetching returns every keyword in input order, failures as []."""
+    keywords = [f"keyword {i}" for i in range(12)]
+    fetcher = StubFetcher(fail_on={"keyword 3"}, requests_per_second=0)
+
+    results = fetcher.fetch_multiple_keywords(keywords, 20, concurrency=4)
+
+    assert list(results.keys()) == keywords
+    assert results["keyword 3"] == []
+    assert all(len(results[k]) == 1 for k in keywords if k != "keyword 3")
+    assert 1 < fetcher.max_active <= 4
+
+
+class StubHtmlFetcher(SerpFetcher):
+    """SerpFetcher whose raw HTML request is served locally."""
+
+    def _get_html_response(self, keyword, num_results):
+        return f'<div class="g"><a href="https://{keyword.replace(" ", "")}.com"><h3>{keyword}</h3></a></div>'
+
+
+def test_concurrent_fetch_honors_rate_limit():
+    """The shared token bucket caps throughput regardless of worker count."""
+    keywords = [f"keyword {i}" for i in range(6)]
+    fetcher = StubHtmlFetcher(requests_per_second=20, burst=2)
+
+    start = time.monotonic()
+    results = fetcher.fetch_multiple_keywords(keywords, 20, concurrency=6)
+    elapsed = time.monotonic() - start
+
+    # 2 burst tokens, then 4 more requests at 20/s need at least 200ms
+    assert elapsed >= 0.19
+    assert all(len(results[k]) == 1 for k in keywords)
+    assert fetcher.throttle_stats.requests == 6
+    assert fetcher.throttle_stats.throttled_seconds > 0
+
+
+def test_rate_limit_budget_is_shared_between_fetchers():
+    """Two fetchers for the same engine draw from one token bucket."""
+    first = StubHtmlFetcher(requests_per_second=10, burst=1)
+    second = StubHtmlFetcher(requests_per_second=10, burst=1)
+
+    start = time.monotonic()
+    first.fetch_serp_results("keyword a")
+    second.fetch_serp_results("keyword b")
+    first.fetch_serp_results("keyword c")
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.19
+
+
+class CountingHtmlFetcher(StubHtmlFetcher):
+    """StubHtmlFetcher that counts upstream requests."""
+
+    def __init__(self, **kwargs):
+        super().__init__(requests_per_second=0, **kwargs)
+        self.upstream_calls = 0
+
+    def _get_html_response(self, keyword, num_results):
+        self.upstream_calls += 1
+        return super()._get_html_response(keyword, num_results)
+
+
+class SlowHtmlFetcher(CountingHtmlFetcher):
+    """CountingHtmlFetcher with simulated upstream latency."""
+
+    def _get_html_response(self, keyword, num_results):
+        time.sleep(0.2)
+        return super()._get_html_response(keyword, num_results)
+
+
+def test_cache_serves_repeat_requests_without_refetching():
+    """A second fetcher sharing the cache file does not hit upstream."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "serp_cache.db"
+
+        first = CountingHtmlFetcher(cache=SerpCache(cache_path))
+        expected = first.fetch_serp_results("trail shoes")
+
+        second_cache = SerpCache(cache_path)
+        second = CountingHtmlFetcher(cache=second_cache)
+        cached = second.fetch_serp_results("trail shoes")
+        other_depth = second.fetch_serp_results("trail shoes", num_results=10)
+
+        assert first.upstream_calls == 1
+        assert second.upstream_calls == 1  # different num is a different key
+        assert [(r.title, r.url, r.rank) for r in cached] == \
+               [(r.title, r.url, r.rank) for r in expected]
+        assert second_cache.stats()["hits"] == 1
+        assert second_cache.stats()["misses"] == 1
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    """Entries past the TTL miss, and LRU entries go first when over budget."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SerpCache(Path(tmp) / "ttl.db", ttl_seconds=0.05)
+        key = cache.make_key("google", "trail shoes", 20, "en-US")
+        cache.set(key, [("Trail", "https://trail.com", 1)])
+        assert cache.get(key) == [("Trail", "https://trail.com", 1)]
+        time.sleep(0.1)
+        assert cache.get(key) is None
+
+        cache = SerpCache(Path(tmp) / "hot.db")
+        cache.set(key, [("Trail", "https://trail.com", 1)])
+        writes = cache._conn.total_changes
+        for _ in range(10):
+            assert cache.get(key) is not None
+        assert cache._conn.total_changes == writes  # fresh hits do not rewrite the row
+        assert cache._conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+        cache = SerpCache(Path(tmp) / "lru.db", max_size_mb=0.001)
+        cache.EVICTION_CHECK_INTERVAL = 1
+        cache.ACCESS_TOUCH_INTERVAL = 0
+        keys = [cache.make_key("google", f"keyword {i}", 20, "en-US") for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.set(key, [("x" * 300, f"https://site{i}.com", 1)])
+            time.sleep(0.01)
+            cache.get(keys[0])  # keep the first entry hot
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.stats()["evictions"] >= 1
+
+
+def test_duplicate_keywords_share_one_upstream_request():
+    """Normalized duplicates are fetched once, within a run and across threads."""
+    assert validate_keywords(["Nike  Shoes", "nike shoes", " running shoes "]) == \
+           ["nike shoes", "running shoes"]
+
+    fetcher = CountingHtmlFetcher()
+    results = fetcher.fetch_multiple_keywords(["Trail Shoes", "trail  shoes", "hiking boots"], 20)
+
+    assert list(results.keys()) == ["Trail Shoes", "trail  shoes", "hiking boots"]
+    assert [r.url for r in results["trail  shoes"]] == [r.url for r in results["Trail Shoes"]]
+    assert fetcher.upstream_calls == 2
+    assert fetcher.saved_requests == 1
+
+    # Columnar runs pack each query's results once and share the batch
+    columnar = CountingHtmlFetcher(columnar_results=True)
+    batches = columnar.fetch_multiple_keywords(["trail shoes", "Trail Shoes"], 20, concurrency=2)
+    assert isinstance(batches["trail shoes"], SerpResultBatch)
+    assert batches["Trail Shoes"] is batches["trail shoes"]
+    assert list(batches["trail shoes"].urls) == ["https://trailshoes.com"]
+
+    # Streaming yields every keyword once its shared query completes
+    streamed = list(columnar.iter_keyword_results(["hiking boots", "Hiking Boots"], 20, show_progress=False))
+    assert [keyword for keyword, _ in streamed] == ["hiking boots", "Hiking Boots"]
+    assert streamed[0][1] is streamed[1][1]
+
+    # Concurrent callers for the same query join the in-flight request
+    slow = SlowHtmlFetcher()
+    threads = [threading.Thread(target=slow.fetch_serp_results, args=("marathon shoes",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert slow.upstream_calls == 1
+    assert slow.saved_requests == 3
+
+
+def test_recorded_fixtures_replay_identically_offline():
+    """Responses recorded in one run are replayed without touching upstream."""
+    keywords = ["trail shoes", "hiking boots"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = Path(tmp) / "fixtures.jsonl.gz"
+
+        recorder = CountingHtmlFetcher(fixtures=FixtureArchive(archive_path, RECORD_MODE))
+        recorded = recorder.fetch_multiple_keywords(keywords, 20)
+        recorder.fixtures.close()
+
+        archive = FixtureArchive(archive_path, REPLAY_MODE)
+        replayer = CountingHtmlFetcher(fixtures=archive)
+        replayed = replayer.fetch_multiple_keywords(keywords + ["never recorded"], 20)
+
+    assert len(archive) == 2
+    assert replayer.upstream_calls == 0
+    assert replayed["never recorded"] == []
+    for keyword in keywords:
+        assert [(r.title, r.url, r.rank) for r in replayed[keyword]] == \
+               [(r.title, r.url, r.rank) for r in recorded[keyword]]
+
+
+EDGE_CASE_PAGES = [
+    "",
+    "<html><body>no results here</body></html>",
+    '<div class="g"><a href="/url?q=https://www.nike.com/run&amp;sa=U"><h3>Nike <b>Run</b></h3></a></div>'
+    '<div class="g x"><h3> Adidas <!-- ad --> Shop </h3><a href="https://adidas.com">a</a></div>'
+    '<div class="gg"><a href="https://skip.com"><h3>Wrong class</h3></a></div>'
+    '<div class="G"><a href="https://case.com"><h3>Uppercase class</h3></a></div>'
+    '<div class="g"><a href="#top"><h3>Anchor</h3></a></div>'
+    '<div class="g"><a href="https://notitle.com">No title</a></div>'
+    '<DIV CLASS="g"><A HREF="https://upper.com"><H3>Upper tags</H3></A></DIV>'
+    '<div class="g"><div class="g"><a href="https://nested.com"><h3>Nested</h3></a></div></div>',
+]
+
+
+def test_html_parser_backends_match_reference_parser():
+    """Every installed backend extracts exactly what html.parser extracts."""
+    for page in EDGE_CASE_PAGES:
+        expected = parse_google_html(page, "html.parser")
+        for backend in available_backends():
+            assert parse_google_html(page, backend) == expected, backend
+
+    assert [title for title, _, _ in parse_google_html(EDGE_CASE_PAGES[2])][:2] == ["NikeRun", "AdidasShop"]
+
+
+def test_async_fetcher_matches_blocking_fetcher():
+    """AsyncSerpFetcher parses the same pages into the same results."""
+    if not AIOHTTP_AVAILABLE:
+        print("aiohttp not installed, skipping async test")
+        return
+
+    server = start_stub_server(latency=0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/search"
+    keywords = ["trail shoes", "marathon shoes", "hiking boots"]
+
+    try:
+        sync_fetcher = SerpFetcher(requests_per_second=0)
+        sync_fetcher.google_search_url = base_url
+        expected = sync_fetcher.fetch_multiple_keywords(keywords, 10, concurrency=2)
+
+        async_fetcher = AsyncSerpFetcher(requests_per_second=0, max_in_flight=3)
+        async_fetcher.google_search_url = base_url
+        actual = asyncio.run(async_fetcher.fetch_multiple_keywords_async(keywords, 10))
+    finally:
+        server.shutdown()
+
+    assert list(actual.keys()) == keywords
+    for keyword in keywords:
+        assert expected[keyword]
+        assert [(r.title, r.url, r.rank) for r in actual[keyword]] == \
+               [(r.title, r.url, r.rank) for r in expected[keyword]]
+
+
+def test_parse_pool_matches_inline_parsing_and_bounds_pending_pages():
+    """Parsing in worker processes gives the same results, with backpressure."""
+    keywords = [f"keyword {i}" for i in range(8)]
+    inline = StubHtmlFetcher(requests_per_second=0).fetch_multiple_keywords(keywords, 20, concurrency=4)
+
+    fetcher = StubHtmlFetcher(requests_per_second=0, parse_workers=2)
+    pooled = fetcher.fetch_multiple_keywords(keywords, 20, concurrency=4)
+    assert fetcher._parse_pool is None  # shut down after the run
+
+    for keyword in keywords:
+        assert [(r.title, r.url, r.rank) for r in pooled[keyword]] == \
+               [(r.title, r.url, r.rank) for r in inline[keyword]]
+
+    pool = HtmlParsePool(workers=1, max_pending=2)
+    try:
+        page = EDGE_CASE_PAGES[2]
+        futures = [pool.submit(page) for _ in range(6)]
+        assert all(future.result() == parse_google_html(page) for future in futures)
+
+        # With every slot taken, handing over another page blocks the fetcher
+        pool._slots.acquire()
+        pool._slots.acquire()
+        blocked = threading.Thread(target=pool.submit, args=(page,))
+        blocked.start()
+        blocked.join(timeout=0.1)
+        assert blocked.is_alive()
+
+        pool._slots.release()
+        blocked.join(timeout=5)
+        assert not blocked.is_alive()
+    finally:
+        pool.close()
+
+
+class ManualParsePool:
+    """Parse pool stand-in whose pages stay unparsed until released."""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, html):
+        future = Future()
+        self.pending.append((html, future))
+        return future
+
+    def close(self):
+        pass
+
+
+def test_fetch_workers_hand_pages_to_parse_pool_without_waiting():
+    """Every page is fetched while none is parsed yet, then all are collected."""
+    keywords = [f"keyword {i}" for i in range(6)]
+    pool = ManualParsePool()
+    fetcher = StubHtmlFetcher(requests_per_second=0, parse_workers=1)
+    fetcher._parse_pool = pool
+    fetched_before_parsing = []
+
+    def release_pages():
+        deadline = time.time() + 5
+        while len(pool.pending) < len(keywords) and time.time() < deadline:
+            time.sleep(0.01)
+        fetched_before_parsing.append(len(pool.pending))
+        for html, future in pool.pending:
+            future.set_result(parse_google_html(html))
+
+    releaser = threading.Thread(target=release_pages)
+    releaser.start()
+    results = dict(fetcher.iter_keyword_results(keywords, 20, concurrency=2, show_progress=False))
+    releaser.join()
+
+    assert fetched_before_parsing == [len(keywords)]  # two workers fetched all six pages
+    assert sorted(results) == sorted(keywords)
+    assert all([r.title for r in results[keyword]] == [keyword] for keyword in keywords)
+
+    # Callers joining an in-flight fetch share its page and the pending parse
+    slow = SlowHtmlFetcher(parse_workers=1)
+    slow._parse_pool = pool = ManualParsePool()
+    deferred = []
+    threads = [threading.Thread(target=lambda: deferred.append(slow._fetch_deferring_parse("marathon shoes", 20)))
+               for _ in range(2)]
+    blocking = []
+    threads.append(threading.Thread(target=lambda: blocking.append(slow.fetch_serp_results("marathon shoes"))))
+    for thread in threads:
+        thread.start()
+    threads[0].join()
+    threads[1].join()
+
+    assert len(pool.pending) == 1 and deferred[0] is deferred[1]
+    html, future = pool.pending[0]
+    future.set_result(parse_google_html(html))
+    threads[2].join()
+
+    assert [r.title for r in deferred[0].result()] == [r.title for r in blocking[0]] == ["marathon shoes"]
+    assert slow.upstream_calls == 1
+    assert slow.saved_requests == 2
+
+if __name__ == "__main__":
+    test_concurrent_fetch_preserves_keywords_and_isolates_failures()
+    test_concurrent_fetch_honors_rate_limit()
+    test_rate_limit_budget_is_shared_between_fetchers()
+    test_cache_serves_repeat_requests_without_refetching()
+    test_cache_expires_and_evicts_least_recently_used()
+    test_duplicate_keywords_share_one_upstream_request()
+    test_recorded_fixtures_replay_identically_offline()
+    test_html_parser_backends_match_reference_parser()
+    test_async_fetcher_matches_blocking_fetcher()
+    test_parse_pool_matches_inline_parsing_and_bounds_pending_pages()
+    test_fetch_workers_hand_pages_to_parse_pool_without_waiting()
+    print("✅ SERP fetch tests passed")